@@ -0,0 +1,91 @@
+"""Latency regression gate for the pricing benchmarks.
+
+Every benchmark's median is compared with the value recorded in baseline.json and
+the test fails when it is slower by more than the threshold. Baselines are machine
+specific: record them on the machine that runs the gate with --update-baseline.
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.30
+
+_RECORDED_KEY = pytest.StashKey[dict]()
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark regression gate")
+    group.addoption("--baseline", default=str(BASELINE_PATH),
+                    help="JSON file of baseline medians in seconds (default: benchmarks/baseline.json)")
+    group.addoption("--regression-threshold", type=float,
+                    default=float(os.environ.get("BENCHMARK_REGRESSION_THRESHOLD", DEFAULT_THRESHOLD)),
+                    help="allowed median slowdown over the baseline as a fraction "
+                         f"(default: $BENCHMARK_REGRESSION_THRESHOLD or {DEFAULT_THRESHOLD})")
+    group.addoption("--update-baseline", action="store_true",
+                    help="record this run's medians as the new baseline instead of comparing")
+
+def _load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+@pytest.fixture(scope="session")
+def baseline_medians(request):
+    return _load_baseline(Path(request.config.getoption("--baseline")))
+
+class RegressionBenchmark:
+    """Wraps pytest-benchmark's fixture and checks the median against the baseline."""
+    
+    def __init__(self, benchmark, name, baseline, threshold, recorded):
+        self._benchmark = benchmark
+        self._name = name
+        self._baseline = baseline
+        self._threshold = threshold
+        self._recorded = recorded
+        self.extra_info = benchmark.extra_info
+    
+    def __call__(self, function, *args, **kwargs):
+        result = self._benchmark(function, *args, **kwargs)
+        self._check()
+        return result
+    
+    def pedantic(self, function, **kwargs):
+        result = self._benchmark.pedantic(function, **kwargs)
+        self._check()
+        return result
+    
+    @property
+    def median(self) -> float:
+        return self._benchmark.stats.stats.median
+    
+    def _check(self):
+        if self._benchmark.stats is None:  # --benchmark-disable
+            return
+        median = self.median
+        self._recorded[self._name] = median
+        expected = self._baseline.get(self._name)
+        if expected is not None and median > expected * (1 + self._threshold):
+            pytest.fail(f"{self._name}: median {median * 1e3:.3f} ms is more than "
+                        f"{self._threshold:.0%} slower than the baseline {expected * 1e3:.3f} ms")
+
+@pytest.fixture
+def regression_benchmark(benchmark, request, baseline_medians):
+    config = request.config
+    recorded = config.stash.setdefault(_RECORDED_KEY, {})
+    baseline = {} if config.getoption("--update-baseline") else baseline_medians
+    return RegressionBenchmark(benchmark, request.node.name, baseline,
+                               config.getoption("--regression-threshold"), recorded)
+
+def pytest_sessionfinish(session):
+    config = session.config
+    recorded = config.stash.get(_RECORDED_KEY, None)
+    if not config.getoption("--update-baseline") or not recorded:
+        return
+    path = Path(config.getoption("--baseline"))
+    medians = {**_load_baseline(path), **recorded}
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(dict(sorted(medians.items())), handle, indent=2)
+        handle.write("\n")
@@ -0,0 +1,86 @@
+"""Latency and throughput benchmarks for the pricing hot paths.
+
+Run with ``python -m pytest benchmarks``; see conftest.py for the baseline gate.
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pricing import (
+    PRICE_BOOK,
+    QuoteTable,
+    calculate_price,
+    calculate_prices,
+    find_appropriate_tier,
+    find_optimal_recommendation,
+    find_optimal_recommendations,
+)
+
+APP_PATH = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+BATCH_ROWS = 1_000_000
+
+@pytest.fixture(scope="module")
+def batch():
+    rng = np.random.default_rng(2025)
+    return rng.integers(1, 2001, BATCH_ROWS), rng.random(BATCH_ROWS) < 0.3
+
+def test_find_appropriate_tier(regression_benchmark):
+    regression_benchmark(find_appropriate_tier, 250)
+
+@pytest.mark.parametrize("risk", [False, True], ids=["base", "risk"])
+def test_calculate_price(regression_benchmark, risk):
+    tier = find_appropriate_tier(250)
+    regression_benchmark(calculate_price, 250, tier, risk)
+
+def test_find_optimal_recommendation(regression_benchmark):
+    regression_benchmark(find_optimal_recommendation, 643, True)
+
+def test_quote_table_lookup(regression_benchmark):
+    table = QuoteTable.build(2000, True)
+    regression_benchmark(table.lookup, 643)
+
+def test_quote_table_build(regression_benchmark):
+    regression_benchmark(QuoteTable.build, 2000, True)
+
+def test_calculate_prices_batch(regression_benchmark, batch):
+    regression_benchmark.pedantic(calculate_prices, args=batch, rounds=10, warmup_rounds=1)
+    regression_benchmark.extra_info['rows_per_second'] = BATCH_ROWS / regression_benchmark.median
+
+def test_find_optimal_recommendations_batch(regression_benchmark, batch):
+    regression_benchmark.pedantic(find_optimal_recommendations, args=batch, rounds=10, warmup_rounds=1)
+    regression_benchmark.extra_info['rows_per_second'] = BATCH_ROWS / regression_benchmark.median
+
+def test_chart_build_uncached(regression_benchmark):
+    charts = pytest.importorskip("ui.charts")
+    if not charts.PLOTLY_AVAILABLE:
+        pytest.skip("plotly is not installed")
+    regression_benchmark.pedantic(charts._build_base_chart, args=(PRICE_BOOK, True), rounds=10, warmup_rounds=1)
+
+def test_chart_with_cached_base(regression_benchmark):
+    charts = pytest.importorskip("ui.charts")
+    if not charts.PLOTLY_AVAILABLE:
+        pytest.skip("plotly is not installed")
+    regression_benchmark(charts.create_pricing_chart, 250, True)
+
+def test_quote_cards_uncached(regression_benchmark):
+    templates = pytest.importorskip("ui.templates")
+    regression_benchmark(templates.render_quote_cards.__wrapped__, 643, True, PRICE_BOOK)
+
+def test_quote_cards_cached(regression_benchmark):
+    templates = pytest.importorskip("ui.templates")
+    regression_benchmark(templates.render_quote_cards, 643, True, PRICE_BOOK)
+
+def test_main_rerun(regression_benchmark):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    app = testing.AppTest.from_file(str(APP_PATH), default_timeout=60)
+    app.session_state["password_correct"] = True
+    app.run()
+    counts = iter(range(1, 10**9))
+    
+    def rerun():
+        app.number_input[0].set_value(next(counts) % 2000 + 1)
+        app.run()
+    
+    regression_benchmark.pedantic(rerun, rounds=20, warmup_rounds=2)
+    assert not app.exception
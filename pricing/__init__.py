@@ -0,0 +1,81 @@
+"""Headless pricing core for the Modulos AI GRC pricing calculator.
+
+Importing the package is cheap: submodules, and NumPy with them, are only
+loaded when one of the names below is first accessed. Nothing here depends
+on Streamlit, pandas or Plotly, so batch jobs and tests can use it directly.
+"""
+import importlib
+
+_EXPORTS = {
+    "RISK_PREMIUM_RATE": "formulas",
+    "PRICE_COLUMNS": "formulas",
+    "price_components": "formulas",
+    "solve_inflection_points": "formulas",
+    "Tier": "model",
+    "TierIndex": "model",
+    "TierEnvelope": "model",
+    "PriceBook": "model",
+    "format_money": "model",
+    "PRICING_TIERS": "tiers",
+    "PRICE_BOOK": "tiers",
+    "locate_tier": "quotes",
+    "find_appropriate_tier": "quotes",
+    "calculate_price": "quotes",
+    "calculate_prices": "quotes",
+    "find_optimal_recommendation": "quotes",
+    "find_optimal_recommendations": "quotes",
+    "tier_capacities": "capacity",
+    "max_apps_for_budget": "capacity",
+    "max_apps_for_budgets": "capacity",
+    "GraduatedBands": "contracts",
+    "AddOn": "contracts",
+    "ContractTerm": "contracts",
+    "RISK_QUANTIFICATION": "contracts",
+    "compile_rules": "contracts",
+    "rules_from_dict": "contracts",
+    "PortfolioQuote": "portfolio",
+    "quote_portfolio": "portfolio",
+    "QuoteRow": "table",
+    "QuoteTable": "table",
+    "calculate_prices_cents": "money",
+    "find_optimal_recommendations_cents": "money",
+    "cross_check": "money",
+    "format_cents": "money",
+    "FxRates": "currency",
+    "load_fx_rates": "currency",
+    "default_fx_rates": "currency",
+    "convert_price_book": "currency",
+    "calculate_prices_by_currency": "currency",
+    "DEFAULT_BOOK": "books",
+    "PriceBookError": "books",
+    "PriceBookRegistry": "books",
+    "default_registry": "books",
+    "load_price_book": "books",
+    "validate_tiers": "books",
+    "AuditLog": "audit",
+    "ReplayResult": "audit",
+    "default_audit_log": "audit",
+    "read_audit_log": "audit",
+    "replay": "audit",
+    "Population": "simulation",
+    "SimulationResult": "simulation",
+    "load_population": "simulation",
+    "scale_prices": "simulation",
+    "simulate": "simulation",
+    "quote_file": "batch",
+    "run_sweep": "sweep",
+    "QuoteService": "service",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
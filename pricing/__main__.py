@@ -0,0 +1,265 @@
+"""Command-line entry point: ``python -m pricing <command> ...``."""
+import argparse
+import sys
+from typing import List, Optional
+
+def _report(stats, final: bool = False):
+    label = "Done" if final else "Progress"
+    print(f"{label}: {stats.rows:,} rows in {stats.chunks} chunks of up to {stats.chunk_size:,} "
+          f"({stats.seconds:.2f}s, {stats.rows_per_second:,.0f} rows/sec)", file=sys.stderr)
+
+def _price_book(args):
+    from .books import load_price_book
+    from .tiers import PRICE_BOOK
+    
+    return PRICE_BOOK if args.price_book is None else load_price_book(args.price_book)
+
+def _run_quote(args) -> int:
+    from .batch import quote_file
+    
+    stats = quote_file(args.input, args.output, chunk_size=args.chunk_size, price_book=_price_book(args),
+                       progress=_report if args.verbose else None,
+                       exact_money=args.exact_cents, rounding=args.rounding)
+    _report(stats, final=True)
+    return 0
+
+def _run_sweep(args) -> int:
+    import json
+    import time
+    
+    import numpy as np
+    
+    from .batch import as_risk_flags, iter_chunks
+    from .sweep import run_sweep
+    
+    num_apps, risk = [], []
+    for frame in iter_chunks(args.customers):
+        num_apps.append(frame['num_apps'].to_numpy(dtype=np.float64))
+        risk.append(as_risk_flags(frame['risk_quantification'].to_numpy()))
+    with open(args.grid, encoding='utf-8') as handle:
+        grid = json.load(handle)
+    
+    start = time.perf_counter()
+    result = run_sweep(np.concatenate(num_apps), np.concatenate(risk), grid, workers=args.workers)
+    seconds = time.perf_counter() - start
+    result.to_frame().to_csv(args.output, index=False)
+    print(f"Done: {len(result.parameters):,} variants x {result.customers:,} customers "
+          f"in {seconds:.2f}s", file=sys.stderr)
+    return 0
+
+def _run_cross_check(args) -> int:
+    import numpy as np
+    
+    from .batch import as_risk_flags, iter_chunks
+    from .money import cross_check
+    
+    num_apps, risk = [], []
+    for frame in iter_chunks(args.customers):
+        num_apps.append(frame['num_apps'].to_numpy(dtype=np.float64))
+        risk.append(as_risk_flags(frame['risk_quantification'].to_numpy()))
+    result = cross_check(np.concatenate(num_apps), np.concatenate(risk), _price_book(args), rounding=args.rounding)
+    print(result.summary())
+    return 0 if result.ok else 1
+
+def _run_serve(args) -> int:
+    from .service import serve
+    
+    serve(args.host, args.port, _price_book(args), max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+    return 0
+
+def _run_capacity(args) -> int:
+    from .capacity import max_apps_for_budget
+    
+    price_book = _price_book(args)
+    for budget in args.budgets:
+        result = max_apps_for_budget(budget, args.risk, price_book)
+        if result is None:
+            print(f"{price_book.format_price(budget)}: below every tier's minimum price")
+        else:
+            print(f"{price_book.format_price(budget)}: {result['num_apps']:,} AI systems on "
+                  f"{result['tier'].name} for {price_book.format_price(result['total_price'])} "
+                  f"({price_book.format_price(result['remaining_budget'])} left)")
+    return 0
+
+def _run_validate(args) -> int:
+    from .books import PriceBookError, load_price_book
+    
+    failed = 0
+    for path in args.files:
+        try:
+            book = load_price_book(path)
+        except PriceBookError as error:
+            failed += 1
+            print(f"{error.source}: invalid", file=sys.stderr)
+            for problem in error.problems:
+                print(f"  - {problem}", file=sys.stderr)
+        else:
+            print(f"{path}: {len(book)} tiers in {book.currency}, fingerprint {book.fingerprint}")
+    return 1 if failed else 0
+
+def _run_simulate(args) -> int:
+    from .simulation import Population, load_population, scale_prices, simulate
+    
+    if args.customers_file is not None:
+        population = load_population(args.customers_file, args.risk_share)
+    else:
+        population = Population.lognormal(args.median, args.sigma, args.risk_share)
+    price_book = _price_book(args)
+    book = scale_prices(price_book, 1 + args.price_change / 100) if args.price_change else price_book
+    result = simulate(population, args.customers, book, seed=args.seed, elasticity=args.elasticity,
+                      reference_book=price_book)
+    print(result.summary())
+    print(result.to_frame().to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+    return 0
+
+def _run_replay(args) -> int:
+    from .audit import replay
+    
+    result = replay(args.log, _price_book(args))
+    print(result.summary())
+    if args.output is not None:
+        import pandas as pd
+        
+        pd.DataFrame({
+            'logged_tier_index': result.logged_tier_index,
+            'replayed_tier_index': result.replayed_tier_index,
+            'logged_total': result.logged_total,
+            'replayed_total': result.replayed_total
+        }).to_csv(args.output, index=False)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    from .batch import DEFAULT_CHUNK_SIZE
+    from .money import DEFAULT_ROUNDING, ROUNDING_MODES
+    from .service import DEFAULT_HOST, DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY, DEFAULT_PORT
+    from .simulation import DEFAULT_CUSTOMERS
+    
+    parser = argparse.ArgumentParser(prog="python -m pricing", description="Modulos AI GRC pricing tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    price_book_help = "JSON or YAML price-book file (default: the standard price book)"
+    
+    quote = commands.add_parser(
+        "quote",
+        help="Quote a CSV/Parquet file of customer records in streaming chunks",
+        description="Reads customer_id, num_apps, risk_quantification and writes tier, price "
+                    "breakdown and recommended tier for every row. The format follows the file "
+                    "extension (.parquet/.pq, otherwise CSV)."
+    )
+    quote.add_argument("input", help="input CSV or Parquet file")
+    quote.add_argument("output", help="output CSV or Parquet file")
+    quote.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f"rows per chunk (default: {DEFAULT_CHUNK_SIZE:,})")
+    quote.add_argument("-v", "--verbose", action="store_true", help="report throughput after every chunk")
+    quote.add_argument("--exact-cents", action="store_true",
+                       help="write amounts as exact integer cents (*_cents columns) instead of floats")
+    quote.add_argument("--rounding", choices=ROUNDING_MODES, default=DEFAULT_ROUNDING,
+                       help=f"rounding of the risk premium in exact mode (default: {DEFAULT_ROUNDING})")
+    quote.add_argument("--price-book", metavar="FILE", help=price_book_help)
+    quote.set_defaults(handler=_run_quote)
+    
+    sweep = commands.add_parser(
+        "sweep",
+        help="Evaluate a grid of price-book variants against a customer file in parallel",
+        description="The grid is a JSON object such as "
+                    '{"Mod 200": {"base_price": [200000, 220000], "price_per_app": [1000, 1100]}}; '
+                    "every combination is priced against all customers. Writes revenue, "
+                    "recommendation rate and tier mix per variant as CSV."
+    )
+    sweep.add_argument("customers", help="customer CSV or Parquet file")
+    sweep.add_argument("grid", help="JSON parameter grid")
+    sweep.add_argument("output", help="output CSV file")
+    sweep.add_argument("--workers", type=int, default=None,
+                       help="worker processes (default: CPU count, 0 runs in-process)")
+    sweep.set_defaults(handler=_run_sweep)
+    
+    check = commands.add_parser(
+        "crosscheck",
+        help="Compare float prices with exact integer cents for a customer file",
+        description="Prices every row on both paths and reports, per price column, the rows "
+                    "whose float amount does not round to the exact cents and the drift of the "
+                    "summed floats. Exits with status 1 if any row diverges."
+    )
+    check.add_argument("customers", help="customer CSV or Parquet file")
+    check.add_argument("--rounding", choices=ROUNDING_MODES, default=DEFAULT_ROUNDING,
+                       help=f"rounding of the exact risk premium (default: {DEFAULT_ROUNDING})")
+    check.add_argument("--price-book", metavar="FILE", help=price_book_help)
+    check.set_defaults(handler=_run_cross_check)
+    
+    service = commands.add_parser(
+        "serve",
+        help="Run the JSON/HTTP quoting service",
+        description="POST /quote accepts {\"num_apps\": 120, \"risk_quantification\": true} or "
+                    "{\"quotes\": [...]}; concurrent requests are priced together in micro-batches. "
+                    "GET /metrics reports p50/p99 latency. Binds to localhost by default."
+    )
+    service.add_argument("--host", default=DEFAULT_HOST, help=f"interface to bind (default: {DEFAULT_HOST})")
+    service.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    service.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                         help=f"quotes that trigger an immediate batch (default: {DEFAULT_MAX_BATCH:,})")
+    service.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY * 1000,
+                         help=f"longest wait to fill a batch (default: {DEFAULT_MAX_DELAY * 1000:g} ms)")
+    service.add_argument("--price-book", metavar="FILE", help=price_book_help)
+    service.set_defaults(handler=_run_serve)
+    
+    capacity = commands.add_parser(
+        "capacity",
+        help="Most AI systems a budget can license, and the tier to buy",
+        description="Solves the pricing formula backwards for each budget across all tiers."
+    )
+    capacity.add_argument("budgets", nargs="+", type=float, help="budgets in the price book's currency")
+    capacity.add_argument("--risk", action="store_true", help="include the risk quantification premium")
+    capacity.add_argument("--price-book", metavar="FILE", help=price_book_help)
+    capacity.set_defaults(handler=_run_capacity)
+    
+    validate = commands.add_parser(
+        "validate",
+        help="Check price-book files for gaps, overlaps and non-monotonic prices",
+        description="Loads each JSON or YAML price-book file and lists every problem found. "
+                    "Exits with status 1 if any file is invalid."
+    )
+    validate.add_argument("files", nargs="+", help="price-book JSON or YAML files")
+    validate.set_defaults(handler=_run_validate)
+    
+    simulation = commands.add_parser(
+        "simulate",
+        help="Monte Carlo expected revenue, tier mix and inflection-point crossings",
+        description="Samples customer portfolio sizes from a lognormal model or by resampling a "
+                    "customer file, prices them all and reports per-customer revenue, the share of "
+                    "customers per tier and past each tier's inflection point, with confidence intervals."
+    )
+    simulation.add_argument("--customers-file", metavar="FILE",
+                            help="customer CSV or Parquet file to resample instead of the lognormal model")
+    simulation.add_argument("--median", type=float, default=80, help="lognormal median AI systems (default: 80)")
+    simulation.add_argument("--sigma", type=float, default=0.8, help="lognormal sigma (default: 0.8)")
+    simulation.add_argument("--risk-share", type=float, default=0.0,
+                            help="share of customers with risk quantification when the file has no flags")
+    simulation.add_argument("--customers", type=int, default=DEFAULT_CUSTOMERS,
+                            help=f"customers to sample (default: {DEFAULT_CUSTOMERS:,})")
+    simulation.add_argument("--seed", type=int, default=None, help="random seed")
+    simulation.add_argument("--price-change", type=float, default=0.0, metavar="PCT",
+                            help="what-if change of every price, in percent")
+    simulation.add_argument("--elasticity", type=float, default=0.0,
+                            help="price elasticity of demand for the what-if change (default: 0)")
+    simulation.add_argument("--price-book", metavar="FILE", help=price_book_help)
+    simulation.set_defaults(handler=_run_simulate)
+    
+    replay = commands.add_parser(
+        "replay",
+        help="Re-price every quote in an audit log under another price book",
+        description="Reads a quote audit log (see PRICING_AUDIT_LOG) and prices every logged "
+                    "quote again, in its logged currency, in vectorized chunks. Prints the "
+                    "change in total revenue and how many quotes move to another tier."
+    )
+    replay.add_argument("log", help="quote audit log file")
+    replay.add_argument("--price-book", metavar="FILE", help=price_book_help)
+    replay.add_argument("--output", metavar="CSV", help="also write logged and replayed tier and total per quote")
+    replay.set_defaults(handler=_run_replay)
+    
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Quote audit log: fixed-width binary records in an append-only, memory-mapped file.
+
+Every record has the same layout (``RECORD_DTYPE``), so the file is a header
+followed by a packed NumPy structured array: it is written by slice assignment
+into a memory map and read back with ``np.memmap`` without parsing. The header
+holds the number of committed records. The writer first flushes the records and
+then bumps that count, so readers never see a torn record. The file grows in
+``GROW_RECORDS`` steps and is never rewritten.
+
+``AuditLog.record`` only puts a tuple on a queue; a background thread drains
+the queue in batches, so callers never wait for the disk. One process should
+write a given file at a time. ``replay`` re-prices a whole log under another
+price book in vectorized chunks.
+"""
+import atexit
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .currency import calculate_prices_by_currency
+from .model import PriceBook
+from .tiers import PRICE_BOOK
+
+MAGIC = b"PRCAUDIT"
+VERSION = 1
+# magic, version, record size, committed record count; padded to 32 bytes
+_HEADER = struct.Struct("<8sHHxxxxQ8x")
+HEADER_SIZE = _HEADER.size
+GROW_RECORDS = 65_536
+DEFAULT_BATCH = 1024
+DEFAULT_REPLAY_CHUNK = 1_000_000
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp_ns', '<i8'),
+    ('price_book', 'S16'),
+    ('currency', 'S3'),
+    ('user', 'S32'),
+    ('session', 'S36'),
+    ('num_apps', '<f8'),
+    ('risk_quantification', '?'),
+    ('tier_index', '<i2'),
+    ('subtotal', '<f8'),
+    ('risk_premium', '<f8'),
+    ('total_price', '<f8'),
+])
+
+LOGGER = logging.getLogger(__name__)
+
+def _encode(text: Optional[str], size: int) -> bytes:
+    # Cut on a character boundary so a multi-byte character is dropped, not split
+    return (text or "").encode("utf-8")[:size].decode("utf-8", "ignore").encode("utf-8")
+
+class AuditLog:
+    """Background writer appending quote records to one audit file."""
+    
+    def __init__(self, path, batch_size: int = DEFAULT_BATCH):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._closed = False
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="quote-audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._file = os.fdopen(fd, "r+b")
+        size = os.fstat(fd).st_size
+        if size == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, 0))
+            self._file.flush()
+            self.count = 0
+        else:
+            self.count = _read_header(self._file.read(HEADER_SIZE), self.path)
+        self._map_capacity(max(self.count, 1))
+    
+    def _map_capacity(self, needed: int):
+        capacity = -(-needed // GROW_RECORDS) * GROW_RECORDS
+        length = HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+        if os.fstat(self._file.fileno()).st_size < length:
+            os.ftruncate(self._file.fileno(), length)
+        self._mmap = mmap.mmap(self._file.fileno(), length)
+        self._records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=capacity, offset=HEADER_SIZE)
+        self.capacity = capacity
+    
+    def record(self, num_apps: float, risk_quantification: bool, tier_index: int, subtotal: float,
+               risk_premium: float, total_price: float, price_book: PriceBook = PRICE_BOOK,
+               user: str = "", session: str = ""):
+        """Queue one computed quote; returns immediately."""
+        if self._closed:
+            self.dropped += 1
+            return
+        self._queue.put((time.time_ns(), price_book.fingerprint.encode("ascii"),
+                         price_book.currency.encode("ascii"), _encode(user, 32), _encode(session, 36),
+                         num_apps, risk_quantification, tier_index, subtotal, risk_premium, total_price))
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            stop = batch[-1] is None
+            rows = [row for row in batch if row is not None]
+            if rows:
+                try:
+                    self._append(rows)
+                except Exception:
+                    self.dropped += len(rows)
+                    LOGGER.exception("Could not write %d audit records to %s", len(rows), self.path)
+            if stop:
+                return
+    
+    def _append(self, rows: List[tuple]):
+        new_count = self.count + len(rows)
+        if new_count > self.capacity:
+            self._records = None
+            self._mmap.flush()
+            self._mmap.close()
+            self._map_capacity(new_count)
+        self._records[self.count:new_count] = np.array(rows, dtype=RECORD_DTYPE)
+        self._mmap.flush()
+        # Commit only after the records themselves are on disk
+        self._mmap[:HEADER_SIZE] = _HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, new_count)
+        self._mmap.flush(0, mmap.PAGESIZE)
+        self.count = new_count
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every record queued so far is written; False on timeout."""
+        target = self.count + self._queue.qsize()
+        deadline = time.monotonic() + timeout
+        while self.count + self.dropped < target and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return self.count + self.dropped >= target
+    
+    def close(self):
+        """Write everything queued, stop the writer and unmap the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._records = None
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.close()
+        atexit.unregister(self.close)
+
+def _read_header(header: bytes, path) -> int:
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path}: truncated audit log header")
+    magic, version, record_size, count = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: not a version {VERSION} quote audit log")
+    return count
+
+def read_audit_log(path) -> np.ndarray:
+    """Committed records of an audit file as a read-only memory-mapped structured array."""
+    with open(path, "rb") as handle:
+        count = _read_header(handle.read(HEADER_SIZE), path)
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+@dataclass(frozen=True)
+class ReplayResult:
+    """Logged quotes re-priced under another price book; arrays align with the log."""
+    price_book: str
+    records: int
+    logged_total: np.ndarray
+    replayed_total: np.ndarray
+    logged_tier_index: np.ndarray
+    replayed_tier_index: np.ndarray
+    seconds: float
+    
+    @property
+    def tier_changes(self) -> int:
+        return int((self.logged_tier_index != self.replayed_tier_index).sum())
+    
+    def summary(self) -> str:
+        logged, replayed = float(self.logged_total.sum()), float(self.replayed_total.sum())
+        change = (replayed / logged - 1) * 100 if logged else 0.0
+        return (f"Replayed {self.records:,} quotes under price book {self.price_book} in {self.seconds:.2f}s: "
+                f"logged total {logged:,.0f}, replayed total {replayed:,.0f} ({change:+.2f}%), "
+                f"{self.tier_changes:,} quotes change tier")
+
+def replay(path, price_book: PriceBook = PRICE_BOOK, chunk_size: int = DEFAULT_REPLAY_CHUNK) -> ReplayResult:
+    """Re-price every logged quote under ``price_book``, each in its logged currency.
+    
+    Totals are summed across currencies as logged, so mixed-currency logs compare
+    amounts, not converted values.
+    """
+    start = time.perf_counter()
+    records = read_audit_log(path)
+    replayed_total = np.empty(len(records))
+    replayed_tier = np.empty(len(records), dtype=np.intp)
+    for offset in range(0, len(records), chunk_size):
+        chunk = records[offset:offset + chunk_size]
+        prices = calculate_prices_by_currency(chunk['num_apps'], chunk['risk_quantification'],
+                                              np.char.decode(chunk['currency'], 'ascii'), price_book)
+        replayed_total[offset:offset + len(chunk)] = prices['total_price']
+        replayed_tier[offset:offset + len(chunk)] = prices['tier_index']
+    return ReplayResult(
+        price_book=price_book.fingerprint,
+        records=len(records),
+        logged_total=np.asarray(records['total_price']),
+        replayed_total=replayed_total,
+        logged_tier_index=np.asarray(records['tier_index'], dtype=np.intp),
+        replayed_tier_index=replayed_tier,
+        seconds=time.perf_counter() - start
+    )
+
+_DEFAULT_LOG: Optional[AuditLog] = None
+_DEFAULT_LOG_LOCK = threading.Lock()
+
+def default_audit_log() -> Optional[AuditLog]:
+    """Process-wide audit log at PRICING_AUDIT_LOG; None (auditing off) unless it is set."""
+    global _DEFAULT_LOG
+    path = os.environ.get("PRICING_AUDIT_LOG")
+    if not path:
+        return None
+    if _DEFAULT_LOG is None:
+        with _DEFAULT_LOG_LOCK:
+            if _DEFAULT_LOG is None:
+                _DEFAULT_LOG = AuditLog(path)
+    return _DEFAULT_LOG
@@ -0,0 +1,233 @@
+"""Streaming bulk quoting of customer files (CSV or Parquet) in bounded memory."""
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from .currency import convert_price_book
+from .formulas import PRICE_COLUMNS
+from .model import PriceBook
+from .money import DEFAULT_ROUNDING, calculate_prices_cents, find_optimal_recommendations_cents
+from .quotes import calculate_prices, find_optimal_recommendations
+from .tiers import PRICE_BOOK
+
+INPUT_COLUMNS = ('customer_id', 'num_apps', 'risk_quantification')
+# Read when present; rows without a currency are quoted in the price book's currency
+OPTIONAL_INPUT_COLUMNS = ('currency',)
+OUTPUT_COLUMNS = INPUT_COLUMNS + (
+    'tier', 'total_price', 'base_cost', 'additional_cost', 'subtotal', 'risk_premium',
+    'recommended_tier', 'recommended_price', 'savings'
+)
+# Exact money mode writes every amount as int64 cents under a ``_cents`` column name
+EXACT_OUTPUT_COLUMNS = INPUT_COLUMNS + (
+    'tier', 'total_price_cents', 'base_cost_cents', 'additional_cost_cents', 'subtotal_cents',
+    'risk_premium_cents', 'recommended_tier', 'recommended_price_cents', 'savings_cents'
+)
+DEFAULT_CHUNK_SIZE = 100_000
+
+_PARQUET_SUFFIXES = ('.parquet', '.pq')
+_TRUE_STRINGS = ('true', 't', 'yes', 'y', '1')
+
+@dataclass(frozen=True)
+class BatchStats:
+    """Throughput summary of a quote_file run."""
+    rows: int
+    chunks: int
+    chunk_size: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float('inf')
+
+def _is_parquet(path) -> bool:
+    return Path(path).suffix.lower() in _PARQUET_SUFFIXES
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+def _require_pyarrow():
+    pyarrow = _import_pyarrow()
+    if pyarrow is None:
+        raise RuntimeError("Parquet input/output requires pyarrow: pip install pyarrow")
+    return pyarrow
+
+def as_risk_flags(values) -> np.ndarray:
+    """Normalize a risk_quantification column (bools, 0/1 or yes/true strings) to booleans."""
+    values = np.asarray(values)
+    if values.dtype == bool:
+        return values
+    if values.dtype.kind in 'iuf':
+        return np.nan_to_num(values.astype(np.float64)) != 0
+    return np.isin(np.char.lower(values.astype(str)), _TRUE_STRINGS)
+
+def quote_frame(frame, price_book: PriceBook = PRICE_BOOK, exact_money: bool = False,
+                rounding: str = DEFAULT_ROUNDING):
+    """Quote one chunk of customer records, returning a DataFrame in OUTPUT_COLUMNS order.
+
+    With ``exact_money`` the amounts come from the integer-cent path instead and the
+    frame follows EXACT_OUTPUT_COLUMNS. If the frame has a ``currency`` column, each
+    currency is quoted in one pass against its converted price book and a
+    ``currency`` column follows ``risk_quantification``.
+    """
+    import pandas as pd
+    
+    if 'currency' in frame.columns:
+        return _quote_frame_by_currency(frame, price_book, exact_money, rounding)
+
+    num_apps = pd.to_numeric(frame['num_apps'], errors='coerce').to_numpy(dtype=np.float64)
+    if np.isnan(num_apps).any():
+        bad_row = frame.index[np.isnan(num_apps)][0]
+        raise ValueError(f"Row {bad_row}: num_apps is missing or not a number")
+    # Whole counts only, so every chunk writes num_apps with the same int64 type
+    fractional = ~np.isfinite(num_apps) | (num_apps != np.floor(num_apps))
+    if fractional.any():
+        raise ValueError(f"Row {frame.index[fractional][0]}: num_apps must be a whole number of AI systems")
+    risk = as_risk_flags(frame['risk_quantification'].to_numpy())
+    if exact_money:
+        return _quote_frame_cents(frame, num_apps, risk, price_book, rounding)
+
+    prices = calculate_prices(num_apps, risk, price_book)
+    recommendations = find_optimal_recommendations(num_apps, risk, price_book)
+    tier_names = np.array([tier.name for tier in price_book], dtype=object)
+    recommended = recommendations['recommended']
+    
+    return pd.DataFrame({
+        'customer_id': frame['customer_id'].to_numpy(),
+        'num_apps': num_apps.astype(np.int64),
+        'risk_quantification': risk,
+        'tier': tier_names[prices['tier_index']],
+        'total_price': prices['total_price'],
+        'base_cost': prices['base_cost'],
+        'additional_cost': prices['additional_cost'],
+        'subtotal': prices['subtotal'],
+        'risk_premium': prices['risk_premium'],
+        'recommended_tier': np.where(recommended, tier_names[recommendations['recommended_index']], ''),
+        'recommended_price': np.where(recommended, recommendations['recommended_price'], np.nan),
+        'savings': recommendations['savings']
+    }, columns=list(OUTPUT_COLUMNS))
+
+def _quote_frame_by_currency(frame, price_book: PriceBook, exact_money: bool, rounding: str):
+    import pandas as pd
+    
+    currencies = frame['currency'].fillna(price_book.currency).astype(str).str.strip().str.upper().to_numpy()
+    frame = frame.drop(columns='currency')
+    parts = []
+    for code in np.unique(currencies).tolist():
+        rows = np.flatnonzero(currencies == code)
+        part = quote_frame(frame.iloc[rows], convert_price_book(price_book, code), exact_money, rounding)
+        part.insert(len(INPUT_COLUMNS), 'currency', code)
+        part.index = rows
+        parts.append(part)
+    return pd.concat(parts).sort_index().reset_index(drop=True)
+
+def _quote_frame_cents(frame, num_apps, risk, price_book: PriceBook, rounding: str):
+    import pandas as pd
+
+    prices = calculate_prices_cents(num_apps, risk, price_book, rounding)
+    recommendations = find_optimal_recommendations_cents(num_apps, risk, price_book, rounding)
+    tier_names = np.array([tier.name for tier in price_book], dtype=object)
+    recommended = recommendations['recommended']
+
+    return pd.DataFrame({
+        'customer_id': frame['customer_id'].to_numpy(),
+        'num_apps': num_apps.astype(np.int64),
+        'risk_quantification': risk,
+        'tier': tier_names[prices['tier_index']],
+        **{f"{column}_cents": prices[column] for column in PRICE_COLUMNS},
+        'recommended_tier': np.where(recommended, tier_names[recommendations['recommended_index']], ''),
+        'recommended_price_cents': pd.arrays.IntegerArray(recommendations['recommended_price'], ~recommended),
+        'savings_cents': recommendations['savings']
+    }, columns=list(EXACT_OUTPUT_COLUMNS))
+
+def iter_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+    """Yield the input columns of a CSV or Parquet file as DataFrames of at most chunk_size rows."""
+    if _is_parquet(path):
+        pyarrow = _require_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        present = set(parquet_file.schema_arrow.names)
+        columns = list(INPUT_COLUMNS) + [column for column in OPTIONAL_INPUT_COLUMNS if column in present]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        columns = INPUT_COLUMNS + OPTIONAL_INPUT_COLUMNS
+        yield from pd.read_csv(path, usecols=lambda column: column in columns,
+                               dtype={'customer_id': str, 'currency': str}, chunksize=chunk_size)
+
+class _ChunkWriter:
+    """Appends quoted chunks to a CSV or Parquet file as they are produced.
+    
+    CSV goes through pyarrow's streaming writer when it is installed, which is
+    several times faster than pandas' formatter on float columns.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._parquet = _is_parquet(path)
+        self._pyarrow = _require_pyarrow() if self._parquet else _import_pyarrow()
+        self._handle = None
+        self._writer = None
+        self._schema = None
+    
+    def write(self, frame):
+        if self._pyarrow is not None:
+            table = self._pyarrow.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                # Later chunks are cast to the first chunk's column types
+                self._schema = table.schema
+                if self._parquet:
+                    self._writer = self._pyarrow.parquet.ParquetWriter(self.path, self._schema)
+                else:
+                    self._writer = self._pyarrow.csv.CSVWriter(self.path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+        else:
+            header = self._handle is None
+            if header:
+                self._handle = open(self.path, 'w', newline='', encoding='utf-8')
+            frame.to_csv(self._handle, header=header, index=False)
+    
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._handle is not None:
+            self._handle.close()
+
+def quote_file(input_path, output_path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               price_book: PriceBook = PRICE_BOOK,
+               progress: Optional[Callable[[BatchStats], None]] = None,
+               exact_money: bool = False, rounding: str = DEFAULT_ROUNDING) -> BatchStats:
+    """Stream customer records from input_path and write their quotes to output_path.
+
+    Only one chunk is held in memory at a time. ``progress`` is called with the
+    running BatchStats after every chunk. ``exact_money`` writes integer cents
+    (see quote_frame).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    writer = _ChunkWriter(output_path)
+    rows = chunks = 0
+    start = time.perf_counter()
+    try:
+        for frame in iter_chunks(input_path, chunk_size):
+            writer.write(quote_frame(frame, price_book, exact_money, rounding))
+            rows += len(frame)
+            chunks += 1
+            if progress is not None:
+                progress(BatchStats(rows, chunks, chunk_size, time.perf_counter() - start))
+        if chunks == 0:
+            import pandas as pd
+            columns = EXACT_OUTPUT_COLUMNS if exact_money else OUTPUT_COLUMNS
+            writer.write(pd.DataFrame(columns=list(columns)))
+    finally:
+        writer.close()
+    return BatchStats(rows, chunks, chunk_size, time.perf_counter() - start)
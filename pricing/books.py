@@ -0,0 +1,251 @@
+"""Price books loaded from JSON/YAML files, validated, and hot-swapped when they change.
+
+A price-book file holds an optional ``currency`` and ``description`` plus a list of
+``tiers`` in PRICING_TIERS form; an open-ended top tier has ``"max_apps": null``.
+A bare list of tiers is accepted too. Files are validated and compiled into a
+PriceBook once per change, so lookups never touch the file.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .model import DEFAULT_CURRENCY, PriceBook
+
+BOOK_SUFFIXES = ('.json', '.yaml', '.yml')
+DEFAULT_BOOKS_DIR = Path(__file__).with_name("price_books")
+DEFAULT_BOOK = "standard"
+DEFAULT_CHECK_INTERVAL = 1.0
+
+_TIER_FIELDS = ('name', 'min_apps', 'max_apps', 'base_price', 'price_per_app')
+
+LOGGER = logging.getLogger(__name__)
+
+class PriceBookError(ValueError):
+    """A price-book file that cannot be read or fails validation; ``problems`` lists every issue."""
+    
+    def __init__(self, source: str, problems: List[str]):
+        super().__init__(f"{source}: " + "; ".join(problems))
+        self.source = source
+        self.problems = problems
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_count(value) -> bool:
+    return _is_number(value) and value >= 1 and (value == float('inf') or value == int(value))
+
+def validate_tiers(tiers: List[Dict]) -> List[str]:
+    """Return every problem with a list of tier dicts; an empty list means valid.
+    
+    Checks required fields and types, that the ``min_apps``-``max_apps`` ranges neither
+    overlap nor leave gaps, that only the last tier is open-ended, and that prices are
+    monotonic: base prices never fall and per-app prices never rise from tier to tier.
+    """
+    if not isinstance(tiers, list) or not tiers:
+        return ["a price book needs a non-empty list of tiers"]
+    
+    problems = []
+    for i, tier in enumerate(tiers):
+        if not isinstance(tier, dict):
+            problems.append(f"tier {i + 1} is not an object")
+            continue
+        label = repr(tier.get('name', f"#{i + 1}"))
+        missing = [field for field in _TIER_FIELDS if field not in tier]
+        if missing:
+            problems.append(f"tier {label} is missing {', '.join(missing)}")
+            continue
+        if not isinstance(tier['name'], str) or not tier['name'].strip():
+            problems.append(f"tier {label} needs a non-empty name")
+        if not _is_count(tier['min_apps']) or tier['min_apps'] == float('inf'):
+            problems.append(f"tier {label}: min_apps must be a whole number of at least 1")
+        if not _is_count(tier['max_apps']):
+            problems.append(f"tier {label}: max_apps must be a whole number, or null for open-ended")
+        for field in ('base_price', 'price_per_app'):
+            if not _is_number(tier[field]) or tier[field] < 0:
+                problems.append(f"tier {label}: {field} must be a non-negative number")
+    if problems:
+        return problems
+    
+    names = [tier['name'] for tier in tiers]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        problems.append(f"duplicate tier names: {', '.join(duplicates)}")
+    
+    ordered = sorted(tiers, key=lambda tier: tier['min_apps'])
+    if ordered != tiers:
+        problems.append("tiers must be listed in ascending min_apps order")
+    for tier in ordered:
+        if tier['max_apps'] < tier['min_apps']:
+            problems.append(f"tier {tier['name']!r}: max_apps {tier['max_apps']} is below min_apps {tier['min_apps']}")
+    for lower, upper in zip(ordered, ordered[1:]):
+        pair = f"{lower['name']!r} and {upper['name']!r}"
+        if lower['max_apps'] == float('inf'):
+            problems.append(f"only the last tier may be open-ended, but {lower['name']!r} is")
+        elif upper['min_apps'] <= lower['max_apps']:
+            problems.append(f"{pair} overlap: {upper['min_apps']}-{lower['max_apps']} is in both")
+        elif upper['min_apps'] > lower['max_apps'] + 1:
+            problems.append(f"gap between {pair}: {lower['max_apps'] + 1}-{upper['min_apps'] - 1} is not covered")
+        if upper['base_price'] < lower['base_price']:
+            problems.append(f"base_price falls from {pair}")
+        if upper['price_per_app'] > lower['price_per_app']:
+            problems.append(f"price_per_app rises from {pair}")
+    return problems
+
+def _read_file(path: Path):
+    if path.suffix.lower() == '.json':
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    try:
+        import yaml
+    except ImportError:
+        raise PriceBookError(str(path), ["reading YAML price books requires PyYAML: pip install pyyaml"])
+    with open(path, encoding='utf-8') as handle:
+        return yaml.safe_load(handle)
+
+def tiers_from_data(data, source: str = "<data>") -> List[Dict]:
+    """Validate parsed price-book data and return its tiers as PRICING_TIERS style dicts.
+    
+    Raises PriceBookError listing every problem found.
+    """
+    if isinstance(data, list):
+        data = {'tiers': data}
+    if not isinstance(data, dict):
+        raise PriceBookError(source, ["expected an object with a tiers list, or a list of tiers"])
+    currency = data.get('currency', DEFAULT_CURRENCY)
+    tiers = data.get('tiers')
+    if isinstance(tiers, list):
+        tiers = [dict(tier, max_apps=float('inf') if tier.get('max_apps') is None else tier['max_apps'])
+                 if isinstance(tier, dict) else tier for tier in tiers]
+    problems = validate_tiers(tiers)
+    if not isinstance(currency, str) or len(currency) != 3 or not currency.isalpha():
+        problems.append(f"currency must be a three-letter ISO code, got {currency!r}")
+    if problems:
+        raise PriceBookError(source, problems)
+    return [{**tier, 'currency': currency.upper()} for tier in tiers]
+
+def load_tiers(path) -> List[Dict]:
+    """Read and validate one JSON or YAML price-book file into PRICING_TIERS style dicts."""
+    path = Path(path)
+    try:
+        data = _read_file(path)
+    except PriceBookError:
+        raise
+    except (OSError, ValueError) as error:
+        raise PriceBookError(str(path), [f"cannot read file: {error}"])
+    return tiers_from_data(data, str(path))
+
+def load_price_book(path) -> PriceBook:
+    """Read, validate and compile one JSON or YAML price-book file."""
+    return PriceBook.from_dicts(load_tiers(path))
+
+@dataclass(frozen=True)
+class _Entry:
+    path: Path
+    book: PriceBook
+    mtime_ns: int
+
+class PriceBookRegistry:
+    """Named price books backed by files, reloaded when a file's mtime changes.
+    
+    ``get`` is a dictionary lookup on the fast path; at most once per
+    ``check_interval`` seconds per book it also stats the file. A changed file is
+    compiled by the one caller that noticed, and the new PriceBook replaces the old
+    one with a single reference swap. Other callers never wait for a reload: they
+    keep getting the previous book, as do sessions that already hold it. A file
+    that fails validation is logged and the last good book stays in service.
+    """
+    
+    def __init__(self, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._checked: Dict[str, float] = {}
+        self._reload_lock = threading.Lock()
+        self.errors: Dict[str, str] = {}
+    
+    @classmethod
+    def from_directory(cls, directory=DEFAULT_BOOKS_DIR,
+                       check_interval: float = DEFAULT_CHECK_INTERVAL) -> "PriceBookRegistry":
+        """Register every price-book file in a directory under its file name without suffix.
+        
+        Invalid files are logged, recorded in ``errors`` and skipped, so one bad file
+        does not keep the other books out of service.
+        """
+        registry = cls(check_interval)
+        for path in sorted(Path(directory).iterdir()):
+            if path.suffix.lower() not in BOOK_SUFFIXES:
+                continue
+            try:
+                registry.register(path.stem, path)
+            except PriceBookError as error:
+                LOGGER.warning("Skipping invalid price book %r: %s", path.stem, error)
+                registry.errors[path.stem] = str(error)
+        return registry
+    
+    def register(self, name: str, path) -> PriceBook:
+        """Load a file under ``name``; raises PriceBookError if it is invalid."""
+        path = Path(path)
+        mtime_ns = path.stat().st_mtime_ns
+        book = load_price_book(path)
+        self._entries[name] = _Entry(path, book, mtime_ns)
+        self._checked[name] = time.monotonic()
+        self.errors.pop(name, None)
+        return book
+    
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._entries)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+    
+    def get(self, name: str = DEFAULT_BOOK) -> PriceBook:
+        """Current compiled book for ``name``, reloading it first if its file changed."""
+        entry = self._entries[name]
+        now = time.monotonic()
+        if now - self._checked.get(name, 0.0) >= self.check_interval:
+            self._checked[name] = now
+            entry = self._refresh(name, entry)
+        return entry.book
+    
+    def _refresh(self, name: str, entry: _Entry) -> _Entry:
+        try:
+            mtime_ns = entry.path.stat().st_mtime_ns
+        except OSError:
+            return entry
+        if mtime_ns == entry.mtime_ns or not self._reload_lock.acquire(blocking=False):
+            return entry
+        try:
+            try:
+                book = load_price_book(entry.path)
+            except PriceBookError as error:
+                if self.errors.get(name) != str(error):
+                    LOGGER.warning("Keeping the previous %r price book: %s", name, error)
+                self.errors[name] = str(error)
+                # Remember the bad version so it is not re-parsed on every check
+                self._entries[name] = _Entry(entry.path, entry.book, mtime_ns)
+                return entry
+            self.errors.pop(name, None)
+            entry = _Entry(entry.path, book, mtime_ns)
+            self._entries[name] = entry
+            LOGGER.info("Reloaded price book %r from %s (%s)", name, entry.path, book.fingerprint)
+            return entry
+        finally:
+            self._reload_lock.release()
+
+_DEFAULT_REGISTRY: Optional[PriceBookRegistry] = None
+_DEFAULT_REGISTRY_LOCK = threading.Lock()
+
+def default_registry() -> PriceBookRegistry:
+    """Process-wide registry of the books in PRICING_BOOKS_DIR (default: pricing/price_books)."""
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        with _DEFAULT_REGISTRY_LOCK:
+            if _DEFAULT_REGISTRY is None:
+                _DEFAULT_REGISTRY = PriceBookRegistry.from_directory(
+                    os.environ.get("PRICING_BOOKS_DIR", DEFAULT_BOOKS_DIR)
+                )
+    return _DEFAULT_REGISTRY
@@ -0,0 +1,92 @@
+"""Reverse pricing: the most AI systems a budget can license.
+
+Within one tier the price is flat at the base price up to ``min_apps`` and then
+rises by ``price_per_app`` per system until ``max_apps``, all scaled by the risk
+premium multiplier. So each tier's capacity for a budget is a closed-form floor,
+solved for every (budget, tier) pair at once. The answer is the tier with the
+largest capacity, ties going to the cheaper total and then the lower position.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from .formulas import RISK_PREMIUM_RATE, price_components
+from .model import PriceBook
+from .tiers import PRICE_BOOK
+
+def _tier_totals(num_apps, risk, price_book: PriceBook) -> np.ndarray:
+    num_apps = np.broadcast_to(num_apps, np.broadcast_shapes(np.shape(num_apps), np.shape(risk), price_book.min_apps.shape))
+    return price_components(num_apps, price_book.min_apps, price_book.base_price,
+                            price_book.price_per_app, risk)['total_price']
+
+def tier_capacities(budgets, risk_quantification=False, price_book: PriceBook = PRICE_BOOK) -> np.ndarray:
+    """Largest whole count each tier can license within each budget.
+    
+    Returns a ``(budgets, tiers)`` array; 0 where the budget is below the tier's
+    minimum price. Capacities are exact against ``price_components``: the closed-form
+    floor is corrected by one step where float rounding put it across the budget.
+    """
+    budgets = np.asarray(budgets, dtype=np.float64)[..., None]
+    risk = np.broadcast_to(np.asarray(risk_quantification, dtype=bool), budgets.shape[:-1])[..., None]
+    multiplier = np.where(risk, 1.0 + RISK_PREMIUM_RATE, 1.0)
+    min_apps, max_apps, price_per_app = price_book.min_apps, price_book.max_apps, price_book.price_per_app
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        extra = np.floor((budgets / multiplier - price_book.base_price) / price_per_app)
+    extra = np.where(price_per_app > 0, extra, np.inf)
+    counts = np.minimum(min_apps + np.maximum(extra, 0.0), max_apps)
+    
+    # Undo float rounding at the boundary so every capacity is affordable and maximal
+    finite = np.isfinite(counts)
+    over = finite & (_tier_totals(counts, risk, price_book) > budgets) & (counts > min_apps)
+    counts = np.where(over, counts - 1, counts)
+    under = finite & (counts < max_apps) & (_tier_totals(counts + 1, risk, price_book) <= budgets)
+    counts = np.where(under, counts + 1, counts)
+    
+    # Minimum price of every tier without and with the risk premium
+    min_prices = _tier_totals(min_apps, np.array([[False], [True]]), price_book)
+    affordable = min_prices[risk.astype(np.intp)[..., 0]] <= budgets
+    return np.where(affordable, counts, 0.0)
+
+def max_apps_for_budgets(budgets, risk_quantification=False,
+                         price_book: PriceBook = PRICE_BOOK) -> Dict[str, np.ndarray]:
+    """Batch budget-to-capacity solver.
+    
+    Returns, per budget, the largest ``num_apps`` any tier can license, the
+    ``tier_index`` that does it (-1 if no tier is affordable), its ``total_price``
+    and the ``remaining_budget``. ``risk_quantification`` may be a single flag or an
+    array matching ``budgets``.
+    """
+    budgets = np.asarray(budgets, dtype=np.float64)
+    risk = np.broadcast_to(np.asarray(risk_quantification, dtype=bool), budgets.shape)
+    capacities = tier_capacities(budgets, risk, price_book)
+    totals = _tier_totals(capacities, risk[..., None], price_book)
+    
+    num_apps = capacities.max(axis=-1, initial=0.0)
+    # Among the tiers reaching the largest count, the cheapest one
+    candidates = np.where((capacities == num_apps[..., None]) & (capacities > 0), totals, np.inf)
+    tier_index = np.argmin(candidates, axis=-1)
+    affordable = num_apps > 0
+    total_price = np.where(affordable, np.take_along_axis(totals, tier_index[..., None], axis=-1)[..., 0], 0.0)
+    return {
+        'num_apps': num_apps,
+        'tier_index': np.where(affordable, tier_index, -1),
+        'total_price': total_price,
+        'remaining_budget': np.where(affordable, budgets - total_price, budgets)
+    }
+
+def max_apps_for_budget(budget: float, risk_quantification: bool = False,
+                        price_book: PriceBook = PRICE_BOOK) -> Optional[Dict]:
+    """Most AI systems ``budget`` can license, or None if it is below every tier's minimum price."""
+    result = max_apps_for_budgets([budget], risk_quantification, price_book)
+    position = int(result['tier_index'][0])
+    if position < 0:
+        return None
+    num_apps = float(result['num_apps'][0])
+    return {
+        "num_apps": int(num_apps) if np.isfinite(num_apps) else num_apps,
+        "tier": price_book[position],
+        "total_price": float(result['total_price'][0]),
+        "remaining_budget": float(result['remaining_budget'][0]),
+        "risk_enabled": risk_quantification
+    }
@@ -0,0 +1,242 @@
+"""Contract pricing rules compiled to piecewise-linear segments.
+
+A contract is priced by a pipeline of rules on top of a PriceBook:
+
+* ``GraduatedBands``: per-app prices that step down at app-count thresholds
+  inside one tier (each band prices only the systems that fall in it).
+* ``AddOn``: a stackable add-on charging a share of the subtotal, a fee per AI
+  system and/or a flat fee. ``RISK_QUANTIFICATION`` is the +30% add-on.
+* ``ContractTerm``: a multi-year term whose annual price rises by an escalator.
+
+``compile_rules`` turns a pipeline into per-tier arrays once: segment starts,
+the subtotal at each start and the per-app slope after it, plus add-on and
+term coefficients. Quoting is then a segment lookup and a multiply-add per
+row, never a walk over the rules. Without bands or add-ons the compiled
+subtotal is computed exactly as in ``price_components``.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .formulas import RISK_PREMIUM_RATE
+from .model import PriceBook
+from .tiers import PRICE_BOOK
+
+@dataclass(frozen=True)
+class GraduatedBands:
+    """Per-app prices for the systems of ``tier`` from each threshold on.
+    
+    ``bands`` holds ``(from_apps, price_per_app)`` pairs in ascending order; systems
+    between ``min_apps`` and the first threshold keep the tier's own price_per_app.
+    """
+    tier: str
+    bands: Tuple[Tuple[float, float], ...]
+
+@dataclass(frozen=True)
+class AddOn:
+    """A stackable charge: ``rate`` times the subtotal, plus ``per_app`` per AI system, plus ``flat``."""
+    name: str
+    rate: float = 0.0
+    per_app: float = 0.0
+    flat: float = 0.0
+
+@dataclass(frozen=True)
+class ContractTerm:
+    """``years`` of licensing; each year costs ``escalator`` more than the year before."""
+    years: int = 1
+    escalator: float = 0.0
+    
+    @property
+    def year_factors(self) -> np.ndarray:
+        return (1.0 + self.escalator) ** np.arange(self.years)
+
+Rule = Union[GraduatedBands, AddOn, ContractTerm]
+
+RISK_QUANTIFICATION = AddOn("risk_quantification", rate=RISK_PREMIUM_RATE)
+
+# Quote columns that add-on names must not shadow
+_RESERVED_COLUMNS = ('tier_index', 'subtotal', 'annual_total', 'contract_total', 'year_totals')
+
+@dataclass(frozen=True, eq=False)
+class CompiledRules:
+    """A rule pipeline flattened into arrays for vectorized quoting.
+    
+    Row ``t`` of ``starts``/``values``/``slopes`` holds tier ``t``'s segments, padded
+    with ``inf`` starts: the subtotal for ``n`` systems in segment ``k`` is
+    ``values[t, k] + (n - starts[t, k]) * slopes[t, k]``. The cheapest tier per count
+    is precomputed as a lower envelope of those segments.
+    """
+    price_book: PriceBook
+    starts: np.ndarray
+    values: np.ndarray
+    slopes: np.ndarray
+    add_ons: Tuple[AddOn, ...]
+    term: ContractTerm
+    envelope_starts: np.ndarray = field(init=False, repr=False)
+    envelope_positions: np.ndarray = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Lower envelope as in TierEnvelope, over every tier's flat piece and segment lines
+        finite = np.isfinite(self.starts)
+        starts = self.starts[finite]
+        slopes = np.concatenate([np.zeros(len(self.price_book)), self.slopes[finite]])
+        intercepts = np.concatenate([self.price_book.base_price, self.values[finite] - starts * self.slopes[finite]])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossings = (intercepts[None, :] - intercepts[:, None]) / (slopes[:, None] - slopes[None, :])
+        breakpoints = np.concatenate([starts, self.price_book.max_apps + 1, crossings.ravel()])
+        breakpoints = np.unique(breakpoints[np.isfinite(breakpoints)])
+        
+        edges = np.concatenate([[breakpoints[0] - 1.0], breakpoints, [breakpoints[-1] + 1.0]])
+        winners = self._evaluate_cheapest((edges[:-1] + edges[1:]) / 2)
+        envelope_starts = np.concatenate([[-np.inf], breakpoints])
+        keep = np.concatenate([[True], winners[1:] != winners[:-1]])
+        object.__setattr__(self, 'envelope_starts', envelope_starts[keep])
+        object.__setattr__(self, 'envelope_positions', winners[keep])
+    
+    def subtotals(self, num_apps, positions) -> np.ndarray:
+        """Subtotal of each count in the tier at the matching position."""
+        num_apps = np.asarray(num_apps, dtype=np.float64)
+        starts = self.starts[positions]
+        # Counts below min_apps pay the base price, the first segment's value
+        segment = np.maximum((starts <= num_apps[..., None]).sum(axis=-1) - 1, 0)
+        start = np.take_along_axis(starts, segment[..., None], axis=-1)[..., 0]
+        value = self.values[positions, segment]
+        slope = self.slopes[positions, segment]
+        return value + np.where(num_apps < start, 0.0, (num_apps - start) * slope)
+    
+    def quote_many(self, num_apps, add_ons: Optional[Mapping[str, object]] = None) -> Dict[str, np.ndarray]:
+        """Price arrays of app counts under the compiled rules.
+        
+        ``add_ons`` maps add-on names to a flag or boolean array selecting the rows
+        that take it; add-ons not named apply to every row. Returns ``tier_index``,
+        ``subtotal``, one column per add-on, ``annual_total`` (first year),
+        ``contract_total`` over the term and ``year_totals`` with one column per year.
+        """
+        num_apps = np.asarray(num_apps, dtype=np.float64)
+        add_ons = dict(add_ons or {})
+        unknown = set(add_ons) - {add_on.name for add_on in self.add_ons}
+        if unknown:
+            raise ValueError(f"Unknown add-ons: {', '.join(sorted(unknown))}")
+        
+        positions = self.price_book.index.locate_many(num_apps)
+        subtotal = self.subtotals(num_apps, positions)
+        result = {'tier_index': positions, 'subtotal': subtotal}
+        annual_total = subtotal
+        for add_on in self.add_ons:
+            amount = subtotal * add_on.rate + num_apps * add_on.per_app + add_on.flat
+            selected = np.broadcast_to(np.asarray(add_ons.get(add_on.name, True), dtype=bool), num_apps.shape)
+            result[add_on.name] = np.where(selected, amount, 0.0)
+            annual_total = annual_total + result[add_on.name]
+        
+        factors = self.term.year_factors
+        result['annual_total'] = annual_total
+        result['year_totals'] = annual_total[..., None] * factors
+        result['contract_total'] = annual_total * factors.sum() if self.term.years > 1 else annual_total
+        return result
+    
+    def quote(self, num_apps: float, **add_ons: bool) -> Dict:
+        """Scalar quote_many: plain floats, the tier and a list of yearly totals."""
+        result = self.quote_many(np.array([num_apps], dtype=np.float64), add_ons)
+        quote = {column: float(values[0]) for column, values in result.items()
+                 if column not in ('tier_index', 'year_totals')}
+        quote['tier'] = self.price_book[int(result['tier_index'][0])]
+        quote['year_totals'] = result['year_totals'][0].tolist()
+        return quote
+    
+    def cheapest_many(self, num_apps) -> np.ndarray:
+        """Position of the cheapest tier able to license each count under the rules.
+        
+        Add-ons and the term scale every tier alike, so the smallest subtotal wins;
+        the winner is looked up in the compiled lower envelope.
+        """
+        return self.envelope_positions[np.searchsorted(self.envelope_starts, num_apps, side='right') - 1]
+    
+    def _evaluate_cheapest(self, num_apps: np.ndarray) -> np.ndarray:
+        best_index = np.zeros(num_apps.shape, dtype=np.intp)
+        best_subtotal = np.full(num_apps.shape, np.inf)
+        for position in range(len(self.price_book)):
+            subtotal = self.subtotals(num_apps, np.full(num_apps.shape, position))
+            subtotal = np.where(num_apps < self.price_book.max_apps[position] + 1, subtotal, np.inf)
+            cheaper = subtotal < best_subtotal
+            best_index = np.where(cheaper, position, best_index)
+            best_subtotal = np.where(cheaper, subtotal, best_subtotal)
+        return best_index
+
+def _tier_segments(tier, bands: Sequence[Tuple[float, float]]) -> Tuple[list, list, list]:
+    starts, slopes = [tier.min_apps], [tier.price_per_app]
+    for from_apps, price_per_app in bands:
+        if not tier.min_apps <= from_apps <= tier.max_apps:
+            raise ValueError(f"Band at {from_apps} is outside tier {tier.name!r} "
+                             f"({tier.min_apps}-{tier.max_apps})")
+        if price_per_app < 0:
+            raise ValueError(f"Band price for {tier.name!r} at {from_apps} is negative")
+        if from_apps == starts[-1]:
+            slopes[-1] = price_per_app
+        elif from_apps < starts[-1]:
+            raise ValueError(f"Bands for {tier.name!r} must be in ascending order")
+        else:
+            starts.append(from_apps)
+            slopes.append(price_per_app)
+    values = [tier.base_price]
+    for k in range(1, len(starts)):
+        values.append(values[-1] + (starts[k] - starts[k - 1]) * slopes[k - 1])
+    return starts, values, slopes
+
+@lru_cache(maxsize=64)
+def _compile(price_book: PriceBook, rules: Tuple[Rule, ...]) -> CompiledRules:
+    bands: Dict[str, Tuple[Tuple[float, float], ...]] = {}
+    add_ons = []
+    term = None
+    tier_names = {tier.name for tier in price_book}
+    for rule in rules:
+        if isinstance(rule, GraduatedBands):
+            if rule.tier not in tier_names:
+                raise ValueError(f"Unknown tier in graduated bands: {rule.tier!r}")
+            if rule.tier in bands:
+                raise ValueError(f"Graduated bands given twice for {rule.tier!r}")
+            bands[rule.tier] = tuple(tuple(band) for band in rule.bands)
+        elif isinstance(rule, AddOn):
+            if rule.name in _RESERVED_COLUMNS or rule.name in {add_on.name for add_on in add_ons}:
+                raise ValueError(f"Add-on name {rule.name!r} is reserved or already used")
+            add_ons.append(rule)
+        elif isinstance(rule, ContractTerm):
+            if term is not None:
+                raise ValueError("A pipeline takes at most one ContractTerm")
+            if rule.years < 1 or rule.escalator <= -1:
+                raise ValueError("A contract term needs at least one year and an escalator above -100%")
+            term = rule
+        else:
+            raise TypeError(f"Not a pricing rule: {rule!r}")
+    
+    segments = [_tier_segments(tier, bands.get(tier.name, ())) for tier in price_book]
+    width = max(len(tier_starts) for tier_starts, _, _ in segments)
+    starts = np.full((len(segments), width), np.inf)
+    values = np.zeros((len(segments), width))
+    slopes = np.zeros((len(segments), width))
+    for t, (tier_starts, tier_values, tier_slopes) in enumerate(segments):
+        starts[t, :len(tier_starts)] = tier_starts
+        values[t, :len(tier_values)] = tier_values
+        slopes[t, :len(tier_slopes)] = tier_slopes
+    for array in (starts, values, slopes):
+        array.flags.writeable = False
+    return CompiledRules(price_book, starts, values, slopes, tuple(add_ons), term or ContractTerm())
+
+def compile_rules(rules: Sequence[Rule] = (), price_book: PriceBook = PRICE_BOOK) -> CompiledRules:
+    """Compile a rule pipeline against a price book; cached per (price book, rules)."""
+    return _compile(price_book, tuple(rules))
+
+def rules_from_dict(data: Mapping) -> Tuple[Rule, ...]:
+    """Rules from a JSON-style mapping, e.g. for a contract configuration file::
+    
+        {"bands": {"Mod 200": [[250, 900]]},
+         "add_ons": [{"name": "risk_quantification", "rate": 0.3}],
+         "term": {"years": 3, "escalator": 0.05}}
+    """
+    rules = [GraduatedBands(tier, tuple(tuple(band) for band in bands))
+             for tier, bands in data.get('bands', {}).items()]
+    rules.extend(AddOn(**add_on) for add_on in data.get('add_ons', ()))
+    if 'term' in data:
+        rules.append(ContractTerm(**data['term']))
+    return tuple(rules)
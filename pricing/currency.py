@@ -0,0 +1,117 @@
+"""FX-aware pricing: price books converted once per currency from a local rate file."""
+import json
+from dataclasses import dataclass, replace
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .formulas import price_components
+from .model import PriceBook
+from .tiers import PRICE_BOOK
+
+FX_RATES_PATH = Path(__file__).with_name("fx_rates.json")
+
+@dataclass(frozen=True)
+class FxRates:
+    """Units of each currency per unit of ``base``, with the list-price rounding step."""
+    base: str
+    rates: Tuple[Tuple[str, float], ...]
+    as_of: str = ""
+    rounding: float = 1.0
+    
+    def __post_init__(self):
+        rates = dict(self.rates)
+        if rates.get(self.base, 1.0) != 1.0:
+            raise ValueError(f"The rate of the base currency {self.base} must be 1")
+        invalid = [code for code, rate in rates.items() if not rate > 0]
+        if invalid:
+            raise ValueError(f"FX rates must be positive: {', '.join(invalid)}")
+        if not self.rounding > 0:
+            raise ValueError("rounding must be positive")
+    
+    @property
+    def currencies(self) -> Tuple[str, ...]:
+        return tuple(sorted(set(dict(self.rates)) | {self.base}))
+    
+    def rate(self, source: str, target: str) -> float:
+        """Units of ``target`` per unit of ``source``."""
+        rates = dict(self.rates)
+        rates.setdefault(self.base, 1.0)
+        for code in (source, target):
+            if code not in rates:
+                raise KeyError(f"No FX rate for {code} (have {', '.join(self.currencies)})")
+        return rates[target] / rates[source]
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FxRates":
+        return cls(
+            base=data["base"],
+            rates=tuple(sorted((code, float(rate)) for code, rate in data["rates"].items())),
+            as_of=data.get("as_of", ""),
+            rounding=float(data.get("rounding", 1.0))
+        )
+
+def load_fx_rates(path=FX_RATES_PATH) -> FxRates:
+    """Read a rate file such as pricing/fx_rates.json."""
+    with open(path, encoding='utf-8') as handle:
+        return FxRates.from_dict(json.load(handle))
+
+@lru_cache(maxsize=1)
+def default_fx_rates() -> FxRates:
+    return load_fx_rates()
+
+@lru_cache(maxsize=64)
+def convert_price_book(price_book: PriceBook, currency: str, rates: Optional[FxRates] = None) -> PriceBook:
+    """Return the price book with every tier price converted to ``currency``.
+    
+    Prices are converted once per (price book, currency, rates) and rounded to the
+    rate file's ``rounding`` step, so each currency gets a proper list price table and
+    the converted book is reused by every render and batch instead of converting each
+    displayed number.
+    """
+    if currency == price_book.currency:
+        return price_book
+    rates = rates or default_fx_rates()
+    rate = Decimal(repr(rates.rate(price_book.currency, currency)))
+    step = Decimal(repr(rates.rounding))
+    
+    def convert(amount: float) -> float:
+        # Decimal arithmetic so that e.g. 450 * 0.85 = 382.5 rounds up, not down
+        steps = (Decimal(repr(amount)) * rate / step).to_integral_value(rounding=ROUND_HALF_UP)
+        converted = steps * step
+        return int(converted) if converted == converted.to_integral_value() else float(converted)
+    
+    return PriceBook(tuple(
+        replace(tier, base_price=convert(tier.base_price), price_per_app=convert(tier.price_per_app),
+                currency=currency)
+        for tier in price_book
+    ))
+
+def calculate_prices_by_currency(num_apps, risk_quantification, currencies,
+                                 price_book: PriceBook = PRICE_BOOK,
+                                 rates: Optional[FxRates] = None) -> Dict[str, np.ndarray]:
+    """calculate_prices for a mixed-currency batch.
+    
+    ``currencies`` holds one ISO code per row. Conversion never moves tier boundaries,
+    so the tier index is located once for all rows; each row then picks its tier
+    prices from a (currency, tier) table of the cached converted books, and the whole
+    batch is priced in one vectorized pass. Also returns ``currency_index`` into
+    ``currency_codes``.
+    """
+    num_apps = np.asarray(num_apps, dtype=np.float64)
+    codes, groups = np.unique(np.asarray(currencies, dtype=str), return_inverse=True)
+    groups = groups.reshape(num_apps.shape)
+    books = [convert_price_book(price_book, code, rates) for code in codes.tolist()]
+    base_price = np.stack([book.base_price for book in books])
+    price_per_app = np.stack([book.price_per_app for book in books])
+    
+    positions = price_book.index.locate_many(num_apps)
+    result = price_components(num_apps, price_book.min_apps[positions], base_price[groups, positions],
+                              price_per_app[groups, positions], risk_quantification)
+    result['tier_index'] = positions
+    result['currency_index'] = groups
+    result['currency_codes'] = codes
+    return result
@@ -0,0 +1,85 @@
+"""Vectorized pricing formulas shared by the scalar, batch and solver code paths."""
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Share of the subtotal added when risk quantification is enabled
+RISK_PREMIUM_RATE = 0.30
+
+PRICE_COLUMNS = ('total_price', 'base_cost', 'additional_cost', 'subtotal', 'risk_premium')
+
+def price_components(num_apps, min_apps, base_price, price_per_app,
+                     risk_quantification=False) -> Dict[str, np.ndarray]:
+    """Vectorized pricing formula; all arguments broadcast against each other."""
+    num_apps, min_apps, base_price, price_per_app = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (num_apps, min_apps, base_price, price_per_app))
+    )
+    risk_quantification = np.broadcast_to(np.asarray(risk_quantification, dtype=bool), num_apps.shape)
+    
+    base_cost = base_price.copy()
+    additional_cost = np.where(num_apps < min_apps, 0.0, (num_apps - min_apps) * price_per_app)
+    subtotal = base_cost + additional_cost
+    
+    # Apply 30% increase for risk quantification
+    risk_premium = np.where(risk_quantification, subtotal * RISK_PREMIUM_RATE, 0.0)
+    total_price = subtotal + risk_premium
+    
+    return {
+        'total_price': total_price,
+        'base_cost': base_cost,
+        'additional_cost': additional_cost,
+        'subtotal': subtotal,
+        'risk_premium': risk_premium
+    }
+
+def price_components_scalar(num_apps: float, min_apps: float, base_price: float, price_per_app: float,
+                            risk_quantification: bool = False) -> Dict[str, float]:
+    """price_components for one quote in plain floats; the same operations, so the same results."""
+    num_apps, min_apps = float(num_apps), float(min_apps)
+    base_cost = float(base_price)
+    additional_cost = 0.0 if num_apps < min_apps else (num_apps - min_apps) * float(price_per_app)
+    subtotal = base_cost + additional_cost
+    risk_premium = subtotal * RISK_PREMIUM_RATE if risk_quantification else 0.0
+    return {
+        'total_price': subtotal + risk_premium,
+        'base_cost': base_cost,
+        'additional_cost': additional_cost,
+        'subtotal': subtotal,
+        'risk_premium': risk_premium
+    }
+
+def solve_inflection_points(min_apps, max_apps, base_price, price_per_app,
+                            risk_quantification: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Solve each tier's break-even against the next tier's minimum price in closed form.
+    
+    Tiers run along the last axis, so a stack of price-book variants with shape
+    ``(variants, tiers)`` is solved in one pass. Within a tier the total is
+    ``multiplier * (base_price + (n - min_apps) * price_per_app)``, where the multiplier
+    includes the risk premium, so the break-even is
+    ``min_apps + (next_min_price - min_price) / (multiplier * price_per_app)``.
+    
+    Returns ``(points, percentages)``; percentages are relative to the next tier's
+    ``min_apps``. Points beyond ``max_apps`` and the last tier are NaN. If the next tier
+    is already cheaper at ``min_apps`` the point is ``min_apps``.
+    """
+    min_apps, max_apps, base_price, price_per_app = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (min_apps, max_apps, base_price, price_per_app))
+    )
+    multiplier = 1.0 + RISK_PREMIUM_RATE if risk_quantification else 1.0
+    
+    current = (min_apps[..., :-1], base_price[..., :-1], price_per_app[..., :-1])
+    upcoming = (min_apps[..., 1:], base_price[..., 1:], price_per_app[..., 1:])
+    min_price = price_components(current[0], *current, risk_quantification)['total_price']
+    next_min_price = price_components(upcoming[0], *upcoming, risk_quantification)['total_price']
+    slope = multiplier * current[2]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        points = current[0] + (next_min_price - min_price) / slope
+    next_is_cheaper = next_min_price <= min_price
+    reachable = (slope > 0) & (points <= max_apps[..., :-1])
+    points = np.where(next_is_cheaper, current[0], np.where(reachable, points, np.nan))
+    
+    last = np.full(points.shape[:-1] + (1,), np.nan)
+    points = np.concatenate([points, last], axis=-1)
+    percentages = points / np.concatenate([upcoming[0], last], axis=-1)
+    return points, percentages
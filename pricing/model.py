@@ -0,0 +1,221 @@
+"""Immutable tier and price-book model with precomputed lookup structures."""
+import bisect
+import hashlib
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .formulas import solve_inflection_points
+
+DEFAULT_CURRENCY = "EUR"
+# Display prefix per ISO 4217 code; codes without an entry are shown as "XYZ 1,000"
+CURRENCY_SYMBOLS = {"EUR": "€", "USD": "$", "GBP": "£", "CHF": "CHF "}
+
+def currency_symbol(currency: str) -> str:
+    """Display prefix for an ISO 4217 code."""
+    return CURRENCY_SYMBOLS.get(currency, currency + " ")
+
+def format_money(amount: float, currency: str = DEFAULT_CURRENCY, spec: str = ",.0f") -> str:
+    """Format an amount with its currency prefix, e.g. format_money(20000, "GBP") -> '£20,000'."""
+    return f"{currency_symbol(currency)}{amount:{spec}}"
+
+@dataclass(frozen=True, slots=True)
+class Tier:
+    """Immutable pricing tier; display strings are derived once on construction."""
+    name: str
+    min_apps: int
+    max_apps: float
+    base_price: float
+    price_per_app: float
+    currency: str = DEFAULT_CURRENCY
+    # Break-even against the next tier, solved by the owning PriceBook
+    inflection_point: Optional[float] = field(default=None, init=False, compare=False)
+    inflection_percentage: Optional[float] = field(default=None, init=False, compare=False)
+    is_open_ended: bool = field(init=False, repr=False, compare=False)
+    max_display: str = field(init=False, repr=False, compare=False)
+    range_label: str = field(init=False, repr=False, compare=False)
+    base_price_label: str = field(init=False, repr=False, compare=False)
+    price_per_app_label: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        is_open_ended = self.max_apps == float('inf')
+        max_display = "∞" if is_open_ended else str(self.max_apps)
+        object.__setattr__(self, 'is_open_ended', is_open_ended)
+        object.__setattr__(self, 'max_display', max_display)
+        object.__setattr__(self, 'range_label', f"{self.min_apps}-{max_display}")
+        object.__setattr__(self, 'base_price_label', format_money(self.base_price, self.currency))
+        object.__setattr__(self, 'price_per_app_label', format_money(self.price_per_app, self.currency))
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Tier":
+        """Build a tier from a PRICING_TIERS style dictionary."""
+        return cls(
+            name=data["name"],
+            min_apps=data["min_apps"],
+            max_apps=data["max_apps"],
+            base_price=data["base_price"],
+            price_per_app=data["price_per_app"],
+            currency=data.get("currency", DEFAULT_CURRENCY)
+        )
+
+class TierIndex:
+    """Sorted ``min_apps`` boundaries of a price book for O(log n) tier lookup.
+    
+    A count resolves to the tier with the largest ``min_apps`` not above it, so the
+    open-ended top tier needs no special casing and counts inside a gap between two
+    tiers resolve to the lower one. Counts below the first tier's ``min_apps`` resolve
+    to the first tier, which prices them at its base price.
+    """
+    
+    def __init__(self, tiers: Sequence[Tier]):
+        self.tiers = tiers
+        self._positions = sorted(range(len(tiers)), key=lambda i: tiers[i].min_apps)
+        self._boundaries = [tiers[i].min_apps for i in self._positions]
+        self._position_array = np.array(self._positions, dtype=np.intp)
+        self._boundary_array = np.array(self._boundaries, dtype=np.float64)
+    
+    def locate(self, num_apps: float) -> Tuple[int, Tier]:
+        """Return the position and tier for a single app count."""
+        slot = max(bisect.bisect_right(self._boundaries, num_apps) - 1, 0)
+        position = self._positions[slot]
+        return position, self.tiers[position]
+    
+    def locate_many(self, num_apps) -> np.ndarray:
+        """Return tier positions for an array of app counts."""
+        slots = np.searchsorted(self._boundary_array, num_apps, side='right') - 1
+        return self._position_array[np.maximum(slots, 0)]
+
+class TierEnvelope:
+    """Lower envelope of every tier's price line, for globally cheapest tier queries.
+    
+    A tier can license any count up to its ``max_apps`` (counts below ``min_apps`` pay
+    the base price), so each tier contributes a flat-then-linear price function that
+    stops at ``max_apps + 1``. Every hinge, cut-off and pairwise crossing of those
+    pieces is a candidate breakpoint; between two breakpoints no prices cross, so one
+    evaluation per interval fixes the cheapest tier there. Adjacent intervals with the
+    same winner are merged, and queries bisect the remaining segment starts.
+    
+    The risk premium scales every tier alike and does not change the winner. Ties go
+    to the lower position.
+    """
+    
+    # Breakpoints evaluated per block while building, to bound temporary memory
+    _BLOCK_SIZE = 4096
+    
+    def __init__(self, min_apps, max_apps, base_price, price_per_app):
+        min_apps, max_apps, base_price, price_per_app = (
+            np.asarray(value, dtype=np.float64) for value in (min_apps, max_apps, base_price, price_per_app)
+        )
+        # Each tier as a flat piece (slope 0 at base price) and a sloped piece from min_apps
+        slopes = np.concatenate([np.zeros_like(price_per_app), price_per_app])
+        intercepts = np.concatenate([base_price, base_price - min_apps * price_per_app])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossings = (intercepts[None, :] - intercepts[:, None]) / (slopes[:, None] - slopes[None, :])
+        breakpoints = np.concatenate([min_apps, max_apps + 1, crossings.ravel()])
+        breakpoints = np.unique(breakpoints[np.isfinite(breakpoints)])
+        
+        # One sample strictly inside every interval, including the two unbounded ones
+        edges = np.concatenate([[breakpoints[0] - 1.0], breakpoints, [breakpoints[-1] + 1.0]])
+        samples = (edges[:-1] + edges[1:]) / 2
+        winners = np.empty(samples.shape, dtype=np.intp)
+        for start in range(0, len(samples), self._BLOCK_SIZE):
+            block = samples[start:start + self._BLOCK_SIZE, None]
+            prices = base_price + np.maximum(block - min_apps, 0.0) * price_per_app
+            prices[block >= max_apps + 1] = np.inf
+            winners[start:start + self._BLOCK_SIZE] = np.argmin(prices, axis=1)
+        
+        starts = np.concatenate([[-np.inf], breakpoints])
+        keep = np.concatenate([[True], winners[1:] != winners[:-1]])
+        self.starts = starts[keep]
+        self.positions = winners[keep]
+        self._start_list = self.starts.tolist()
+        self._position_list = self.positions.tolist()
+    
+    def cheapest(self, num_apps: float) -> int:
+        """Return the position of the cheapest tier able to license ``num_apps``."""
+        return self._position_list[bisect.bisect_right(self._start_list, num_apps) - 1]
+    
+    def cheapest_many(self, num_apps) -> np.ndarray:
+        """Return cheapest tier positions for an array of app counts."""
+        return self.positions[np.searchsorted(self.starts, num_apps, side='right') - 1]
+
+def _frozen_array(values) -> np.ndarray:
+    array = np.array(values, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+@dataclass(frozen=True, slots=True)
+class PriceBook:
+    """Immutable, hashable set of tiers with per-tier columns precomputed for NumPy.
+    
+    Equality and hashing only look at the tiers; the derived arrays and the lookup
+    index are built once in ``__post_init__`` and shared by every caller.
+    """
+    tiers: Tuple[Tier, ...]
+    min_apps: np.ndarray = field(init=False, repr=False, compare=False)
+    max_apps: np.ndarray = field(init=False, repr=False, compare=False)
+    base_price: np.ndarray = field(init=False, repr=False, compare=False)
+    price_per_app: np.ndarray = field(init=False, repr=False, compare=False)
+    inflection_points: np.ndarray = field(init=False, repr=False, compare=False)
+    inflection_percentages: np.ndarray = field(init=False, repr=False, compare=False)
+    currency: str = field(init=False, repr=False, compare=False)
+    index: TierIndex = field(init=False, repr=False, compare=False)
+    envelope: TierEnvelope = field(init=False, repr=False, compare=False)
+    fingerprint: str = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        tiers = tuple(self.tiers)
+        currencies = {tier.currency for tier in tiers}
+        if len(currencies) > 1:
+            raise ValueError(f"All tiers of a price book must share one currency, got {', '.join(sorted(currencies))}")
+        object.__setattr__(self, 'currency', currencies.pop() if currencies else DEFAULT_CURRENCY)
+        object.__setattr__(self, 'min_apps', _frozen_array([tier.min_apps for tier in tiers]))
+        object.__setattr__(self, 'max_apps', _frozen_array([tier.max_apps for tier in tiers]))
+        object.__setattr__(self, 'base_price', _frozen_array([tier.base_price for tier in tiers]))
+        object.__setattr__(self, 'price_per_app', _frozen_array([tier.price_per_app for tier in tiers]))
+        
+        points, percentages = solve_inflection_points(self.min_apps, self.max_apps,
+                                                      self.base_price, self.price_per_app)
+        object.__setattr__(self, 'inflection_points', _frozen_array(points))
+        object.__setattr__(self, 'inflection_percentages', _frozen_array(percentages))
+        
+        # Attach the solved points to private copies, never to caller-owned tiers
+        solved_tiers = []
+        for tier, point, percentage in zip(tiers, points, percentages):
+            tier = replace(tier)
+            if not np.isnan(point):
+                object.__setattr__(tier, 'inflection_point', float(point))
+                object.__setattr__(tier, 'inflection_percentage', float(percentage))
+            solved_tiers.append(tier)
+        tiers = tuple(solved_tiers)
+        object.__setattr__(self, 'tiers', tiers)
+        
+        object.__setattr__(self, 'index', TierIndex(tiers))
+        object.__setattr__(self, 'envelope', TierEnvelope(self.min_apps, self.max_apps,
+                                                          self.base_price, self.price_per_app))
+        # Stable content digest, usable as a cache key across reruns and processes
+        object.__setattr__(self, 'fingerprint', hashlib.sha256(repr(tiers).encode()).hexdigest()[:16])
+        object.__setattr__(self, '_hash', hash(tiers))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __len__(self) -> int:
+        return len(self.tiers)
+    
+    def __iter__(self) -> Iterator[Tier]:
+        return iter(self.tiers)
+    
+    def __getitem__(self, position: int) -> Tier:
+        return self.tiers[position]
+    
+    def format_price(self, amount: float, spec: str = ",.0f") -> str:
+        """Format an amount in this price book's currency."""
+        return format_money(amount, self.currency, spec)
+    
+    @classmethod
+    def from_dicts(cls, tiers: List[Dict]) -> "PriceBook":
+        """Build a price book from PRICING_TIERS style dictionaries."""
+        return cls(tuple(Tier.from_dict(tier) for tier in tiers))
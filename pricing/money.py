@@ -0,0 +1,210 @@
+"""Exact money mode: prices as int64 integer cents with explicit rounding rules.
+
+The float path (``price_components``) computes the risk premium as
+``subtotal * 0.30`` in binary floating point, so premiums summed over many line
+items drift from what an invoicing system computes. Here every amount is an
+integer number of cents, the premium rate is applied as an exact fraction and
+the only rounding step, cents of risk premium, follows a named ``decimal``
+rounding mode. Everything stays vectorized over NumPy int64 arrays.
+"""
+from dataclasses import dataclass
+from decimal import (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+)
+from fractions import Fraction
+from typing import Dict
+
+import numpy as np
+
+from .formulas import PRICE_COLUMNS, RISK_PREMIUM_RATE
+from .model import PriceBook
+from .quotes import calculate_prices
+from .tiers import PRICE_BOOK
+
+CENTS_PER_UNIT = 100
+DEFAULT_ROUNDING = ROUND_HALF_UP
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN,
+                  ROUND_UP, ROUND_DOWN, ROUND_CEILING, ROUND_FLOOR)
+
+# The premium rate as an exact fraction (0.30 -> 3/10), not its binary approximation
+RISK_PREMIUM_FRACTION = Fraction(str(RISK_PREMIUM_RATE))
+
+_INT64_MAX = np.iinfo(np.int64).max
+# Largest cent amount whose float euro value is still exact to the cent
+_MAX_EXACT_CENTS = 2.0 ** 53
+
+def to_cents(amounts) -> np.ndarray:
+    """Convert whole-cent euro amounts (e.g. tier prices) to int64 cents.
+    
+    Raises ValueError for amounts with fractions of a cent or that are not finite,
+    instead of silently rounding them.
+    """
+    amounts = np.asarray(amounts)
+    if amounts.dtype.kind in 'iu':
+        return amounts.astype(np.int64) * CENTS_PER_UNIT
+    amounts = amounts.astype(np.float64)
+    cents = np.rint(amounts * CENTS_PER_UNIT)
+    # A float is a whole-cent amount when it is the closest double to cents / 100
+    exact = np.isfinite(amounts) & (np.abs(cents) <= _MAX_EXACT_CENTS) & (cents / CENTS_PER_UNIT == amounts)
+    if not exact.all():
+        raise ValueError(f"{amounts[~exact].ravel()[0]!r} is not a whole number of cents")
+    return cents.astype(np.int64)
+
+def _whole_counts(num_apps) -> np.ndarray:
+    num_apps = np.asarray(num_apps)
+    if num_apps.dtype.kind in 'iu':
+        return num_apps.astype(np.int64)
+    num_apps = num_apps.astype(np.float64)
+    if not np.array_equal(num_apps, np.floor(num_apps)):
+        raise ValueError("Exact money mode needs whole numbers of AI systems")
+    return num_apps.astype(np.int64)
+
+def divide_rounded(numerator, denominator: int, rounding: str = DEFAULT_ROUNDING) -> np.ndarray:
+    """Integer division of int64 arrays by a positive integer, rounded per ``rounding``."""
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unsupported rounding mode {rounding!r}; choose from {', '.join(ROUNDING_MODES)}")
+    numerator = np.asarray(numerator, dtype=np.int64)
+    quotient, remainder = np.divmod(numerator, denominator)
+    # divmod floors, so the remainder is in [0, denominator)
+    inexact = remainder != 0
+    negative = numerator < 0
+    if rounding == ROUND_FLOOR:
+        round_up = np.zeros_like(inexact)
+    elif rounding == ROUND_CEILING:
+        round_up = inexact
+    elif rounding == ROUND_DOWN:
+        round_up = inexact & negative
+    elif rounding == ROUND_UP:
+        round_up = inexact & ~negative
+    else:
+        twice = 2 * remainder
+        if rounding == ROUND_HALF_UP:
+            tie_up = ~negative
+        elif rounding == ROUND_HALF_DOWN:
+            tie_up = negative
+        else:
+            tie_up = quotient % 2 == 1
+        round_up = (twice > denominator) | ((twice == denominator) & tie_up)
+    return quotient + round_up
+
+def price_components_cents(num_apps, min_apps, base_price, price_per_app,
+                           risk_quantification=False,
+                           rounding: str = DEFAULT_ROUNDING) -> Dict[str, np.ndarray]:
+    """Integer-cent form of price_components; returns the PRICE_COLUMNS as int64 cents.
+    
+    ``num_apps`` must hold whole counts. Base and per-app prices are euros in whole
+    cents. Only the risk premium is rounded, once per row, per ``rounding``.
+    """
+    num_apps, min_apps, base_cost, price_per_app = np.broadcast_arrays(
+        _whole_counts(num_apps), _whole_counts(min_apps), to_cents(base_price), to_cents(price_per_app)
+    )
+    risk_quantification = np.broadcast_to(np.asarray(risk_quantification, dtype=bool), num_apps.shape)
+    
+    additional_cost = np.maximum(num_apps - min_apps, 0) * price_per_app
+    subtotal = base_cost + additional_cost
+    
+    numerator, denominator = RISK_PREMIUM_FRACTION.numerator, RISK_PREMIUM_FRACTION.denominator
+    if subtotal.size and np.abs(subtotal).max() > _INT64_MAX // max(numerator, 1):
+        raise OverflowError("Subtotal too large for exact int64 cent arithmetic")
+    premium = divide_rounded(subtotal * numerator, denominator, rounding)
+    risk_premium = np.where(risk_quantification, premium, 0)
+    
+    return {
+        'total_price': subtotal + risk_premium,
+        'base_cost': base_cost.copy(),
+        'additional_cost': additional_cost,
+        'subtotal': subtotal,
+        'risk_premium': risk_premium
+    }
+
+def calculate_prices_cents(num_apps, risk_quantification=False, price_book: PriceBook = PRICE_BOOK,
+                           rounding: str = DEFAULT_ROUNDING) -> Dict[str, np.ndarray]:
+    """Exact-money calculate_prices: the price columns in int64 cents plus ``tier_index``."""
+    num_apps = _whole_counts(num_apps)
+    positions = price_book.index.locate_many(num_apps)
+    result = price_components_cents(num_apps, price_book.min_apps[positions], price_book.base_price[positions],
+                                    price_book.price_per_app[positions], risk_quantification, rounding)
+    result['tier_index'] = positions
+    return result
+
+def find_optimal_recommendations_cents(num_apps, risk_quantification=False,
+                                       price_book: PriceBook = PRICE_BOOK,
+                                       rounding: str = DEFAULT_ROUNDING) -> Dict[str, np.ndarray]:
+    """Exact-money find_optimal_recommendations; prices and savings are int64 cents."""
+    num_apps = _whole_counts(num_apps)
+    current = calculate_prices_cents(num_apps, risk_quantification, price_book, rounding)
+    best_index = price_book.envelope.cheapest_many(num_apps)
+    best_price = price_components_cents(num_apps, price_book.min_apps[best_index], price_book.base_price[best_index],
+                                        price_book.price_per_app[best_index], risk_quantification,
+                                        rounding)['total_price']
+    
+    recommended = best_price < current['total_price']
+    return {
+        'tier_index': current['tier_index'],
+        'current_price': current['total_price'],
+        'recommended_index': best_index,
+        'recommended_price': best_price,
+        'recommended': recommended,
+        'savings': np.where(recommended, current['total_price'] - best_price, 0)
+    }
+
+def format_cents(cents: int, symbol: str = "€") -> str:
+    """Format integer cents exactly, e.g. 2600050 -> '€26,000.50'."""
+    units, remainder = divmod(abs(int(cents)), CENTS_PER_UNIT)
+    sign = "-" if cents < 0 else ""
+    return f"{sign}{symbol}{units:,}.{remainder:02d}"
+
+@dataclass(frozen=True)
+class MoneyCrossCheck:
+    """Divergence of the float pricing path from exact cents over one batch.
+    
+    ``mismatches`` holds, per column, the row positions whose float amount does not
+    round to the exact cents. ``drift_cents`` is the float column sum minus the exact
+    column sum, which is what accumulates across invoice line items.
+    """
+    rows: int
+    rounding: str
+    mismatches: Dict[str, np.ndarray]
+    max_difference_cents: Dict[str, float]
+    drift_cents: Dict[str, float]
+    
+    @property
+    def ok(self) -> bool:
+        return not any(len(rows) for rows in self.mismatches.values())
+    
+    def summary(self) -> str:
+        """One line per price column, for logs and the CLI."""
+        lines = [f"Cross-check of {self.rows:,} rows against exact cents ({self.rounding}):"]
+        for column in PRICE_COLUMNS:
+            lines.append(f"  {column}: {len(self.mismatches[column]):,} rows off by up to "
+                         f"{self.max_difference_cents[column]:.4f} cents, summed drift "
+                         f"{self.drift_cents[column]:+.4f} cents")
+        return "\n".join(lines)
+
+def cross_check(num_apps, risk_quantification=False, price_book: PriceBook = PRICE_BOOK,
+                rounding: str = DEFAULT_ROUNDING) -> MoneyCrossCheck:
+    """Price a batch on both paths and report every divergence of the float path."""
+    floats = calculate_prices(np.asarray(num_apps, dtype=np.float64), risk_quantification, price_book)
+    exact = calculate_prices_cents(num_apps, risk_quantification, price_book, rounding)
+    
+    mismatches, max_difference, drift = {}, {}, {}
+    for column in PRICE_COLUMNS:
+        float_cents = floats[column] * CENTS_PER_UNIT
+        difference = float_cents - exact[column]
+        mismatches[column] = np.flatnonzero(np.rint(float_cents) != exact[column])
+        max_difference[column] = float(np.abs(difference).max()) if difference.size else 0.0
+        # Sum as the float pipeline does, then compare with the exact integer sum
+        drift[column] = float(floats[column].sum() * CENTS_PER_UNIT - int(exact[column].sum()))
+    return MoneyCrossCheck(
+        rows=int(exact['tier_index'].size),
+        rounding=rounding,
+        mismatches=mismatches,
+        max_difference_cents=max_difference,
+        drift_cents=drift
+    )
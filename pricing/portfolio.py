@@ -0,0 +1,255 @@
+"""Portfolio quoting: license a group customer's entities pooled, separately or in between.
+
+Every entity has its own AI-system count. A set of entities licensed together is
+priced like one customer with their summed count (``find_appropriate_tier`` and
+``calculate_price``). Enumerating subsets is exponential, so the search uses the
+shape of the price function instead. Over the counts that resolve to one tier,
+the pooled price is linear, ``K + p * count``. For a pool in that segment, entity
+``i`` therefore saves ``separate_price(i) - p * count(i)`` independently of the
+others, and the best pool is a 0/1 knapsack on those savings, restricted to
+pool sizes inside the segment. The best pool over all segments is formed, and
+further rounds form more pools among the remaining entities while that still
+saves money. Splitting entities across several pools is a bin-packing problem,
+so the rounds are followed by single-entity moves between groups while any
+move lowers the total.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .formulas import RISK_PREMIUM_RATE
+from .model import PriceBook
+from .quotes import calculate_prices
+from .tiers import PRICE_BOOK
+
+# Largest items x pool-size table solved exactly; bigger knapsacks are filled greedily
+MAX_KNAPSACK_CELLS = 20_000_000
+# Group prices are tabulated for portfolios up to this many AI systems in total
+MAX_PRICE_TABLE = 5_000_000
+MAX_IMPROVEMENT_PASSES = 10
+
+@dataclass(frozen=True)
+class PortfolioQuote:
+    """Grouping of a portfolio's entities found by ``quote_portfolio``.
+    
+    ``entity_group[i]`` is the group of entity ``i``; group ``g`` licenses
+    ``group_apps[g]`` AI systems on tier ``group_tier_index[g]`` for
+    ``group_prices[g]``. Entities licensed on their own form groups of one.
+    """
+    entity_group: np.ndarray
+    group_apps: np.ndarray
+    group_tier_index: np.ndarray
+    group_prices: np.ndarray
+    separate_total: float
+    pooled_total: float
+    
+    @property
+    def total_price(self) -> float:
+        return float(self.group_prices.sum())
+    
+    @property
+    def savings(self) -> float:
+        """Saving against licensing every entity separately."""
+        return self.separate_total - self.total_price
+    
+    def groups(self) -> List[np.ndarray]:
+        """Entity positions of every group."""
+        order = np.argsort(self.entity_group, kind='stable')
+        bounds = np.flatnonzero(np.diff(self.entity_group[order])) + 1
+        return np.split(order, bounds)
+
+def price_segments(price_book: PriceBook = PRICE_BOOK,
+                   risk_quantification: bool = False) -> List[Tuple[float, float, float, float]]:
+    """The pooled price as ``(low, high, K, p)`` pieces: ``K + p * count`` for counts in [low, high]."""
+    multiplier = 1.0 + RISK_PREMIUM_RATE if risk_quantification else 1.0
+    order = np.argsort(price_book.min_apps, kind='stable')
+    starts = price_book.min_apps[order]
+    segments = []
+    if starts[0] > 1:
+        # Below the first tier's minimum only its base price is charged
+        segments.append((1.0, starts[0] - 1, multiplier * price_book.base_price[order[0]], 0.0))
+    ends = np.append(starts[1:] - 1, np.inf)
+    for position, low, high in zip(order, starts, ends):
+        if high < low:
+            continue
+        slope = price_book.price_per_app[position]
+        segments.append((low, high, multiplier * (price_book.base_price[position] - low * slope),
+                         multiplier * slope))
+    return segments
+
+def _best_subset(counts: np.ndarray, gains: np.ndarray, low: float, high: float) -> Optional[np.ndarray]:
+    """Mask of the subset with the largest total gain whose count sum lies in [low, high]."""
+    fits = counts <= high
+    positive = fits & (gains > 0)
+    total = counts[positive].sum()
+    if low <= total <= high:
+        return positive
+    if total > high:
+        # Too many apps for the segment: choose among everything that fits
+        chosen = _knapsack(counts, gains, fits, low, high)
+    else:
+        # Too few: every positive entity stays in, top up with the cheapest others
+        extra = _knapsack(counts, gains, fits & ~positive, low - total, high - total)
+        chosen = None if extra is None else positive | extra
+    return chosen
+
+def _knapsack(counts: np.ndarray, gains: np.ndarray, candidates: np.ndarray,
+              low: float, high: float) -> Optional[np.ndarray]:
+    items = np.flatnonzero(candidates)
+    low = max(int(np.ceil(low)), 0)
+    high = int(min(high, counts[items].sum()))
+    if high < low:
+        return None
+    # At most high // c entities of count c fit, and only the best of them can be optimal
+    items = items[np.lexsort((-gains[items], counts[items]))]
+    sizes = counts[items]
+    rank = np.arange(items.size) - np.searchsorted(sizes, sizes, side='left')
+    items = items[rank < high // sizes]
+    if len(items) * (high + 1) > MAX_KNAPSACK_CELLS:
+        return _greedy_fill(counts, gains, items, low, high)
+    
+    best = np.full(high + 1, -np.inf)
+    best[0] = 0.0
+    taken = np.zeros((len(items), high + 1), dtype=bool)
+    for k, item in enumerate(items):
+        size = int(counts[item])
+        if size > high:
+            continue
+        with_item = best[:high + 1 - size] + gains[item]
+        improves = with_item > best[size:]
+        taken[k, size:] = improves
+        best[size:] = np.where(improves, with_item, best[size:])
+    
+    # Among equally good pools take the fullest, leaving fewer apps for later rounds
+    target = high - int(np.argmax(best[low:][::-1]))
+    if not np.isfinite(best[target]):
+        return None
+    chosen = np.zeros(counts.shape, dtype=bool)
+    for k in range(len(items) - 1, -1, -1):
+        if taken[k, target]:
+            chosen[items[k]] = True
+            target -= int(counts[items[k]])
+    return chosen
+
+def _greedy_fill(counts: np.ndarray, gains: np.ndarray, items: np.ndarray,
+                 low: int, high: int) -> Optional[np.ndarray]:
+    chosen = np.zeros(counts.shape, dtype=bool)
+    size = 0
+    for item in items[np.argsort(-gains[items] / counts[items], kind='stable')]:
+        if size >= low and gains[item] <= 0:
+            break
+        if size + counts[item] <= high:
+            chosen[item] = True
+            size += counts[item]
+    return chosen if size >= low else None
+
+def _group_pricer(total_apps: float, risk_quantification: bool, price_book: PriceBook):
+    """Price of one group by its app count; a lookup table when the portfolio is small enough."""
+    if total_apps <= MAX_PRICE_TABLE:
+        table = calculate_prices(np.arange(int(total_apps) + 1), risk_quantification, price_book)['total_price']
+        table[0] = 0.0
+        return lambda apps: table[np.asarray(apps, dtype=np.intp)]
+    return lambda apps: np.where(np.asarray(apps) > 0,
+                                 calculate_prices(apps, risk_quantification, price_book)['total_price'], 0.0)
+
+def _improve_by_moves(counts: np.ndarray, entity_group: np.ndarray, risk_quantification: bool,
+                      price_book: PriceBook, max_passes: int = MAX_IMPROVEMENT_PASSES) -> np.ndarray:
+    """Move single entities to another group (or their own) while that lowers the total.
+    
+    The pool rounds are greedy across pools; a pool that is best on its own can take
+    an entity that a later pool needs more. Returns compacted group labels, pools first.
+    """
+    price = _group_pricer(counts.sum() + counts.max(), risk_quantification, price_book)
+    entity_group = entity_group.copy()
+    # One slot more than entities, so some slot is always empty
+    group_apps = np.bincount(entity_group, weights=counts, minlength=counts.size + 1)
+    for _ in range(max_passes):
+        # Occupied groups plus one empty slot, which stands for licensing an entity alone
+        slots = np.append(np.flatnonzero(group_apps > 0), np.flatnonzero(group_apps == 0)[0])
+        moved = False
+        for i in range(counts.size):
+            own, size = entity_group[i], counts[i]
+            leave = price(group_apps[own] - size) - price(group_apps[own])
+            join = price(group_apps[slots] + size) - price(group_apps[slots])
+            join[slots == own] = np.inf
+            best = int(np.argmin(join))
+            if leave + join[best] >= -1e-9:
+                continue
+            target = slots[best]
+            if group_apps[target] == 0 and (group_apps[slots] == 0).sum() == 1:
+                slots = np.append(slots, np.flatnonzero(group_apps == 0)[1])
+            group_apps[own] -= size
+            group_apps[target] += size
+            entity_group[i] = target
+            moved = True
+        if not moved:
+            break
+    # Relabel: pools (largest first) then entities licensed alone, in entity order
+    members = np.bincount(entity_group, minlength=group_apps.size)
+    order = sorted(np.unique(entity_group), key=lambda g: (members[g] < 2, -group_apps[g], g))
+    labels = np.empty(group_apps.size, dtype=np.intp)
+    labels[order] = np.arange(len(order))
+    return labels[entity_group]
+
+def quote_portfolio(num_apps, risk_quantification: bool = False, price_book: PriceBook = PRICE_BOOK,
+                    max_pools: Optional[int] = None) -> PortfolioQuote:
+    """Heuristically group entities with the given AI-system counts into cheap licenses.
+    
+    Each round forms the pool with the largest saving over licensing its members
+    separately, solved exactly per tier segment. Rounds stop when no pool saves money
+    or after ``max_pools`` pools, then single-entity moves lower the total further.
+    The result never costs more than licensing every entity separately or pooling
+    them all, but it is not guaranteed to be the cheapest partition; the tests check
+    it against exhaustive search only for portfolios of up to six entities.
+    """
+    counts = np.asarray(num_apps, dtype=np.float64)
+    if counts.ndim != 1 or not counts.size:
+        raise ValueError("A portfolio needs a one-dimensional array of at least one entity count")
+    if (counts < 1).any() or not np.array_equal(counts, np.floor(counts)):
+        raise ValueError("Entity counts must be whole numbers of at least 1")
+    
+    separate = calculate_prices(counts, risk_quantification, price_book)['total_price']
+    segments = price_segments(price_book, risk_quantification)
+    entity_group = np.full(counts.size, -1, dtype=np.intp)
+    pools = 0
+    while max_pools is None or pools < max_pools:
+        remaining = np.flatnonzero(entity_group < 0)
+        if remaining.size < 2:
+            break
+        best_saving, best_pool = 0.0, None
+        for low, high, _, slope in segments:
+            gains = separate[remaining] - slope * counts[remaining]
+            pool = _best_subset(counts[remaining], gains, low, high)
+            if pool is None or pool.sum() < 2:
+                continue
+            pooled_price = calculate_prices(counts[remaining][pool].sum(), risk_quantification,
+                                            price_book)['total_price']
+            saving = float(separate[remaining][pool].sum() - pooled_price)
+            if saving > best_saving:
+                best_saving, best_pool = saving, remaining[pool]
+        if best_pool is None:
+            break
+        entity_group[best_pool] = pools
+        pools += 1
+    
+    singles = np.flatnonzero(entity_group < 0)
+    entity_group[singles] = pools + np.arange(singles.size)
+    entity_group = _improve_by_moves(counts, entity_group, risk_quantification, price_book)
+    
+    group_apps = np.bincount(entity_group, weights=counts)
+    group_quotes = calculate_prices(group_apps, risk_quantification, price_book)
+    pooled_total = float(calculate_prices(counts.sum(), risk_quantification, price_book)['total_price'])
+    if pooled_total < group_quotes['total_price'].sum():
+        # The search missed the single pool; fall back to it
+        entity_group = np.zeros(counts.size, dtype=np.intp)
+        group_apps = np.bincount(entity_group, weights=counts)
+        group_quotes = calculate_prices(group_apps, risk_quantification, price_book)
+    return PortfolioQuote(
+        entity_group=entity_group,
+        group_apps=group_apps,
+        group_tier_index=group_quotes['tier_index'],
+        group_prices=group_quotes['total_price'],
+        separate_total=float(separate.sum()),
+        pooled_total=pooled_total
+    )
@@ -0,0 +1,98 @@
+"""Tier selection, quoting and recommendations over a PriceBook."""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .formulas import price_components, price_components_scalar
+from .model import PriceBook, Tier
+from .tiers import PRICE_BOOK
+
+def locate_tier(num_apps: int, price_book: PriceBook = PRICE_BOOK) -> Tuple[int, Tier]:
+    """Find the appropriate pricing tier and its position in the price book."""
+    return price_book.index.locate(num_apps)
+
+def find_appropriate_tier(num_apps: int, price_book: PriceBook = PRICE_BOOK) -> Tier:
+    """Find the appropriate pricing tier for given number of apps."""
+    return price_book.index.locate(num_apps)[1]
+
+def calculate_price(num_apps: int, tier: Tier, risk_quantification: bool = False) -> Dict:
+    """Calculate price based on tier, number of apps, and risk quantification."""
+    # Plain floats: building 0-d arrays costs more than the formula itself
+    result = price_components_scalar(num_apps, tier.min_apps, tier.base_price,
+                                     tier.price_per_app, risk_quantification)
+    result['risk_enabled'] = risk_quantification
+    return result
+
+def calculate_prices(num_apps, risk_quantification=False,
+                     price_book: PriceBook = PRICE_BOOK) -> Dict[str, np.ndarray]:
+    """Price whole arrays of app counts in one pass.
+    
+    ``risk_quantification`` may be a single flag or a boolean array matching ``num_apps``.
+    Returns the ``calculate_price`` columns as arrays plus the selected ``tier_index``.
+    """
+    num_apps = np.asarray(num_apps, dtype=np.float64)
+    positions = price_book.index.locate_many(num_apps)
+    
+    result = price_components(num_apps, price_book.min_apps[positions], price_book.base_price[positions],
+                              price_book.price_per_app[positions], risk_quantification)
+    result['tier_index'] = positions
+    return result
+
+def find_optimal_recommendation(num_apps: int, risk_quantification: bool = False,
+                                price_book: PriceBook = PRICE_BOOK) -> Optional[Dict]:
+    """Find if there's a better tier recommendation across all tiers."""
+    current_index, current_tier = price_book.index.locate(num_apps)
+    current_result = calculate_price(num_apps, current_tier, risk_quantification)
+    current_price = current_result['total_price']
+    
+    # Check if any other tier would be more cost-effective
+    best_index = price_book.envelope.cheapest(num_apps)
+    if best_index == current_index:
+        return None
+    
+    best_tier = price_book[best_index]
+    best_price = calculate_price(num_apps, best_tier, risk_quantification)['total_price']
+    if best_price >= current_price:
+        return None
+    
+    return build_recommendation(num_apps, current_tier, best_tier, current_price, best_price)
+
+def build_recommendation(num_apps: int, current_tier: Tier, best_tier: Tier,
+                         current_price: float, best_price: float) -> Dict:
+    """Assemble the recommendation dict shown to the user for an already priced upgrade."""
+    if current_tier.inflection_point is not None and num_apps >= current_tier.inflection_point:
+        reason = f"You're past the inflection point ({current_tier.inflection_point:.0f} AI systems). Upgrading to {best_tier.name} would be more cost-effective."
+    else:
+        reason = f"{best_tier.name} costs less than {current_tier.name} for {num_apps} AI systems. Upgrading would be more cost-effective."
+    
+    return {
+        "recommended_tier": best_tier,
+        "current_price": current_price,
+        "recommended_price": best_price,
+        "savings": current_price - best_price,
+        "reason": reason
+    }
+
+def find_optimal_recommendations(num_apps, risk_quantification=False,
+                                 price_book: PriceBook = PRICE_BOOK) -> Dict[str, np.ndarray]:
+    """Batch form of find_optimal_recommendation.
+    
+    Returns the current ``tier_index`` and ``current_price`` plus the cheapest
+    ``recommended_index`` and ``recommended_price`` for every count. ``recommended``
+    marks rows where that tier is strictly cheaper; ``savings`` is zero elsewhere.
+    """
+    num_apps = np.asarray(num_apps, dtype=np.float64)
+    current = calculate_prices(num_apps, risk_quantification, price_book)
+    best_index = price_book.envelope.cheapest_many(num_apps)
+    best_price = price_components(num_apps, price_book.min_apps[best_index], price_book.base_price[best_index],
+                                  price_book.price_per_app[best_index], risk_quantification)['total_price']
+    
+    recommended = best_price < current['total_price']
+    return {
+        'tier_index': current['tier_index'],
+        'current_price': current['total_price'],
+        'recommended_index': best_index,
+        'recommended_price': best_price,
+        'recommended': recommended,
+        'savings': np.where(recommended, current['total_price'] - best_price, 0.0)
+    }
@@ -0,0 +1,301 @@
+"""Asyncio JSON/HTTP quoting service with micro-batching onto the vectorized path.
+
+Built on ``asyncio`` streams only, so it needs nothing beyond NumPy. Concurrent
+requests are queued in a QuoteBatcher and priced together by one call to
+``calculate_prices`` / ``find_optimal_recommendations``; the per-request cost is
+then mostly JSON encoding.
+
+Endpoints:
+
+* ``POST /quote`` with ``{"num_apps": 120, "risk_quantification": true}`` returns one
+  quote; ``{"quotes": [{...}, ...]}`` returns ``{"quotes": [...]}`` in the same order.
+* ``GET /metrics`` returns request counts, batch sizes and p50/p99 latency.
+* ``GET /health`` returns ``{"status": "ok"}``.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .formulas import PRICE_COLUMNS, price_components
+from .model import PriceBook
+from .quotes import build_recommendation, calculate_prices, find_optimal_recommendations
+from .tiers import PRICE_BOOK
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 4096
+DEFAULT_MAX_DELAY = 0.002
+MAX_BODY_BYTES = 1 << 20
+MAX_QUOTES_PER_REQUEST = 10_000
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+class RequestError(ValueError):
+    """A client error, reported as a JSON body with the given HTTP status."""
+    
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+class LatencyTracker:
+    """Rolling window of request latencies with percentile summaries."""
+    
+    def __init__(self, window: int = 10_000):
+        self._samples = deque(maxlen=window)
+        self.requests = 0
+    
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self.requests += 1
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at percentile ``q`` (0-100) in seconds, or None before the first request."""
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, dtype=np.float64), q))
+    
+    def snapshot(self) -> Dict:
+        p50, p99 = self.percentile(50), self.percentile(99)
+        return {
+            'requests': self.requests,
+            'window': len(self._samples),
+            'p50_ms': None if p50 is None else p50 * 1000,
+            'p99_ms': None if p99 is None else p99 * 1000
+        }
+
+def _quote_rows(num_apps: np.ndarray, risk: np.ndarray, price_book: PriceBook) -> List[Dict]:
+    """Price a batch and shape every row like the breakdown on the calculator page."""
+    prices = calculate_prices(num_apps, risk, price_book)
+    recommendations = find_optimal_recommendations(num_apps, risk, price_book)
+    tier_prices = price_components(num_apps[:, None], price_book.min_apps, price_book.base_price,
+                                   price_book.price_per_app, risk[:, None])['total_price']
+    
+    columns = {column: prices[column].tolist() for column in PRICE_COLUMNS}
+    positions = prices['tier_index'].tolist()
+    recommended = recommendations['recommended'].tolist()
+    tier_names = [tier.name for tier in price_book]
+    rows = []
+    for i, (count, position) in enumerate(zip(num_apps.tolist(), positions)):
+        tier = price_book[position]
+        count = int(count) if count.is_integer() else count
+        row = {
+            'num_apps': count,
+            'risk_quantification': bool(risk[i]),
+            'tier': tier.name,
+            'tier_range': tier.range_label,
+            **{column: columns[column][i] for column in PRICE_COLUMNS},
+            'price_per_app': columns['total_price'][i] / count,
+            'recommendation': None,
+            'tier_prices': dict(zip(tier_names, tier_prices[i].tolist()))
+        }
+        if recommended[i]:
+            best_tier = price_book[int(recommendations['recommended_index'][i])]
+            recommendation = build_recommendation(count, tier, best_tier, columns['total_price'][i],
+                                                  float(recommendations['recommended_price'][i]))
+            recommendation['recommended_tier'] = best_tier.name
+            row['recommendation'] = recommendation
+        rows.append(row)
+    return rows
+
+class QuoteBatcher:
+    """Coalesces concurrent quote requests into micro-batches.
+    
+    The first request of a batch starts a ``max_delay`` timer; the batch is priced when
+    the timer fires or as soon as ``max_batch`` quotes are waiting, whichever is first.
+    Pricing runs inline on the event loop because a vectorized batch is far cheaper
+    than a thread hand-off.
+    """
+    
+    def __init__(self, price_book: PriceBook = PRICE_BOOK, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        self.price_book = price_book
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: List[Tuple[np.ndarray, np.ndarray, asyncio.Future]] = []
+        self._pending_quotes = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.quotes = 0
+    
+    async def quote(self, num_apps: np.ndarray, risk: np.ndarray) -> List[Dict]:
+        """Queue quotes for the next batch and wait for their rows."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((num_apps, risk, future))
+        self._pending_quotes += len(num_apps)
+        if self._pending_quotes >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+        return await future
+    
+    def flush(self):
+        """Price every waiting request now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._pending_quotes = self._pending, [], 0
+        if not pending:
+            return
+        try:
+            rows = _quote_rows(np.concatenate([item[0] for item in pending]),
+                               np.concatenate([item[1] for item in pending]), self.price_book)
+        except Exception as error:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.batches += 1
+        self.quotes += len(rows)
+        offset = 0
+        for num_apps, _, future in pending:
+            if not future.done():
+                future.set_result(rows[offset:offset + len(num_apps)])
+            offset += len(num_apps)
+
+def _parse_quote(item) -> Tuple[float, bool]:
+    if not isinstance(item, dict):
+        raise RequestError("Each quote must be a JSON object")
+    num_apps = item.get('num_apps')
+    if isinstance(num_apps, bool) or not isinstance(num_apps, (int, float)) or not math.isfinite(num_apps) or num_apps < 1:
+        raise RequestError("num_apps must be a number of at least 1")
+    risk = item.get('risk_quantification', False)
+    if not isinstance(risk, bool):
+        raise RequestError("risk_quantification must be true or false")
+    return float(num_apps), risk
+
+def parse_quote_request(body: bytes) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """Decode a /quote body into (num_apps, risk, is_batch)."""
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise RequestError(f"Invalid JSON: {error}")
+    is_batch = isinstance(payload, dict) and 'quotes' in payload
+    items = payload['quotes'] if is_batch else [payload]
+    if not isinstance(items, list):
+        raise RequestError("quotes must be a list")
+    if len(items) > MAX_QUOTES_PER_REQUEST:
+        raise RequestError(f"At most {MAX_QUOTES_PER_REQUEST:,} quotes per request", 413)
+    parsed = [_parse_quote(item) for item in items]
+    num_apps = np.array([entry[0] for entry in parsed], dtype=np.float64)
+    risk = np.array([entry[1] for entry in parsed], dtype=bool)
+    return num_apps, risk, is_batch
+
+class QuoteService:
+    """HTTP/1.1 front end (keep-alive, JSON only) for a QuoteBatcher."""
+    
+    def __init__(self, price_book: PriceBook = PRICE_BOOK, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        self.batcher = QuoteBatcher(price_book, max_batch, max_delay)
+        self.latency = LatencyTracker()
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> Tuple[str, int]:
+        """Start listening and return the bound (host, port); port 0 picks a free one."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+    
+    async def serve_forever(self):
+        await self._server.serve_forever()
+    
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.batcher.flush()
+    
+    def metrics(self) -> Dict:
+        metrics = self.latency.snapshot()
+        metrics.update({
+            'quotes': self.batcher.quotes,
+            'batches': self.batcher.batches,
+            'mean_batch_size': self.batcher.quotes / self.batcher.batches if self.batcher.batches else None,
+            'price_book': self.batcher.price_book.fingerprint
+        })
+        return metrics
+    
+    async def _route(self, method: str, path: str, body: bytes):
+        if path == '/quote':
+            if method != 'POST':
+                raise RequestError("Use POST for /quote", 405)
+            num_apps, risk, is_batch = parse_quote_request(body)
+            rows = await self.batcher.quote(num_apps, risk) if len(num_apps) else []
+            return {'quotes': rows} if is_batch else rows[0]
+        if path in ('/metrics', '/health'):
+            if method != 'GET':
+                raise RequestError(f"Use GET for {path}", 405)
+            return self.metrics() if path == '/metrics' else {'status': 'ok'}
+        raise RequestError(f"No endpoint {path}", 404)
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                keep_alive = True
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+    
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY_BYTES:
+                        raise RequestError(f"Body larger than {MAX_BODY_BYTES:,} bytes", 413)
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = 200, await self._route(method, target.split('?', 1)[0], body)
+                except RequestError as error:
+                    status, payload = error.status, {'error': str(error)}
+                except ValueError:
+                    status, payload, keep_alive = 400, {'error': "Malformed HTTP request"}, False
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as error:
+                    status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+    
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                self.latency.record(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, price_book: PriceBook = PRICE_BOOK,
+          max_batch: int = DEFAULT_MAX_BATCH, max_delay: float = DEFAULT_MAX_DELAY):
+    """Run the quoting service until interrupted."""
+    async def run():
+        service = QuoteService(price_book, max_batch, max_delay)
+        bound_host, bound_port = await service.start(host, port)
+        print(f"Serving quotes on http://{bound_host}:{bound_port} (POST /quote, GET /metrics)", flush=True)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,203 @@
+"""Monte Carlo revenue what-ifs over a distribution of customer portfolio sizes.
+
+Customers are sampled in chunks from a ``Population`` (a lognormal model or an
+empirical customer file) and priced with the vectorized ``calculate_prices``.
+Every reported figure is a mean over sampled customers: revenue, the share of
+customers per tier, and the share sitting past their tier's inflection point,
+where the next tier is already cheaper. Only running sums are kept, so memory
+stays bounded by the chunk size. Confidence intervals come from the sample
+variance (normal approximation), which is tight at the default million customers.
+
+A price elasticity scales each customer's demand by
+``(price / reference_price) ** -elasticity``, comparing ``price_book`` with a
+reference book (by default the same book, so demand stays 1).
+"""
+import time
+from dataclasses import dataclass, replace
+from statistics import NormalDist
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .model import PriceBook
+from .quotes import calculate_prices
+from .tiers import PRICE_BOOK
+
+DEFAULT_CUSTOMERS = 1_000_000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+@dataclass(frozen=True, eq=False)
+class Population:
+    """Where sampled customers come from: a lognormal model or empirical records.
+    
+    Empirical records are bootstrapped, optionally weighted; their risk flags are
+    sampled with them. Without recorded flags, each customer takes risk
+    quantification with probability ``risk_share``.
+    """
+    median: Optional[float] = None
+    sigma: Optional[float] = None
+    num_apps: Optional[np.ndarray] = None
+    risk: Optional[np.ndarray] = None
+    weights: Optional[np.ndarray] = None
+    risk_share: float = 0.0
+    
+    @classmethod
+    def lognormal(cls, median: float, sigma: float, risk_share: float = 0.0) -> "Population":
+        """Portfolio sizes ``median * exp(sigma * Z)``, rounded and at least 1."""
+        if median < 1 or sigma < 0:
+            raise ValueError("A lognormal population needs median >= 1 and sigma >= 0")
+        return cls(median=float(median), sigma=float(sigma), risk_share=risk_share)
+    
+    @classmethod
+    def empirical(cls, num_apps, risk=None, weights=None, risk_share: float = 0.0) -> "Population":
+        """Resample observed portfolio sizes (and risk flags, if given)."""
+        num_apps = np.asarray(num_apps, dtype=np.float64)
+        if num_apps.size == 0 or np.isnan(num_apps).any() or (num_apps < 1).any():
+            raise ValueError("An empirical population needs at least one count, every count at least 1")
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            weights = weights / weights.sum()
+        return cls(num_apps=num_apps, risk=None if risk is None else np.asarray(risk, dtype=bool),
+                   weights=weights, risk_share=risk_share)
+    
+    def sample(self, rng: np.random.Generator, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw ``size`` customers as ``(num_apps, risk_quantification)`` arrays."""
+        if self.num_apps is None:
+            num_apps = np.maximum(np.rint(self.median * np.exp(self.sigma * rng.standard_normal(size))), 1.0)
+        else:
+            rows = rng.choice(self.num_apps.size, size, p=self.weights)
+            num_apps = self.num_apps[rows]
+            if self.risk is not None:
+                return num_apps, self.risk[rows]
+        return num_apps, rng.random(size) < self.risk_share
+
+def scale_prices(price_book: PriceBook, factor: float) -> PriceBook:
+    """Copy of the price book with every base and per-app price multiplied by ``factor``."""
+    return PriceBook(tuple(replace(tier, base_price=tier.base_price * factor,
+                                   price_per_app=tier.price_per_app * factor) for tier in price_book))
+
+def load_population(path, risk_share: float = 0.0) -> Population:
+    """Empirical population from a customer CSV or Parquet file (num_apps, optional risk_quantification)."""
+    from .batch import as_risk_flags, iter_chunks
+    
+    num_apps, risk = [], []
+    for frame in iter_chunks(path):
+        num_apps.append(frame['num_apps'].to_numpy(dtype=np.float64))
+        if 'risk_quantification' in frame.columns:
+            risk.append(as_risk_flags(frame['risk_quantification'].to_numpy()))
+    if not num_apps:
+        raise ValueError(f"{path}: no customer records")
+    return Population.empirical(np.concatenate(num_apps), np.concatenate(risk) if risk else None,
+                                risk_share=risk_share)
+
+@dataclass(frozen=True)
+class Estimate:
+    """A Monte Carlo mean with its confidence interval; arrays for per-tier figures."""
+    mean: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Per-customer expectations under one price book; revenue and demand estimates are floats."""
+    customers: int
+    confidence: float
+    tier_names: Tuple[str, ...]
+    inflection_points: np.ndarray
+    revenue: Estimate
+    demand: Estimate
+    tier_mix: Estimate
+    crossing_rate: Estimate
+    seconds: float
+    
+    def total_revenue(self, customers: int) -> Estimate:
+        """Expected revenue of a customer base of the given size."""
+        return Estimate(self.revenue.mean * customers, self.revenue.low * customers,
+                        self.revenue.high * customers)
+    
+    def to_frame(self):
+        """One row per tier: customer share and share past the inflection point, with intervals.
+        
+        Shares are of all sampled customers, weighted by demand, so they sum to ``demand``.
+        """
+        import pandas as pd
+    
+        return pd.DataFrame({
+            'tier': self.tier_names,
+            'inflection_point': self.inflection_points,
+            'share': self.tier_mix.mean,
+            'share_low': self.tier_mix.low,
+            'share_high': self.tier_mix.high,
+            'past_inflection': self.crossing_rate.mean,
+            'past_inflection_low': self.crossing_rate.low,
+            'past_inflection_high': self.crossing_rate.high
+        })
+    
+    def summary(self) -> str:
+        level = f"{self.confidence:.0%}"
+        return (f"{self.customers:,} customers in {self.seconds:.2f}s: revenue per customer "
+                f"{self.revenue.mean:,.0f} ({level} CI {self.revenue.low:,.0f} - {self.revenue.high:,.0f}), "
+                f"{self.crossing_rate.mean.sum():.2%} of customers past an inflection point")
+
+class _Moments:
+    """Running sum and sum of squares, per column."""
+    
+    def __init__(self, columns: int = 1):
+        self.total = np.zeros(columns)
+        self.squares = np.zeros(columns)
+    
+    def add(self, total, squares):
+        self.total += total
+        self.squares += squares
+    
+    def estimate(self, count: int, z: float, scalar: bool = False) -> Estimate:
+        mean = self.total / count
+        variance = np.maximum(self.squares - count * mean ** 2, 0) / max(count - 1, 1)
+        half_width = z * np.sqrt(variance / count)
+        if scalar:
+            return Estimate(float(mean[0]), float(mean[0] - half_width[0]), float(mean[0] + half_width[0]))
+        return Estimate(mean, mean - half_width, mean + half_width)
+
+def simulate(population: Population, customers: int = DEFAULT_CUSTOMERS, price_book: PriceBook = PRICE_BOOK,
+             confidence: float = DEFAULT_CONFIDENCE, seed: Optional[int] = None, elasticity: float = 0.0,
+             reference_book: Optional[PriceBook] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> SimulationResult:
+    """Sample ``customers`` customers from ``population`` and estimate revenue and tier figures."""
+    if customers < 2:
+        raise ValueError("Simulate at least 2 customers")
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    tiers = len(price_book)
+    # Customers at or past their tier's inflection point would pay less in the next tier
+    thresholds = np.where(np.isnan(price_book.inflection_points), np.inf, price_book.inflection_points)
+    revenue, demand, tier_mix, crossing = _Moments(), _Moments(), _Moments(tiers), _Moments(tiers)
+    
+    for offset in range(0, customers, chunk_size):
+        num_apps, risk = population.sample(rng, min(chunk_size, customers - offset))
+        prices = calculate_prices(num_apps, risk, price_book)
+        tier_index, price = prices['tier_index'], prices['total_price']
+        if elasticity and reference_book is not None and reference_book != price_book:
+            reference = calculate_prices(num_apps, risk, reference_book)['total_price']
+            weight = (price / reference) ** -elasticity
+        else:
+            weight = np.ones_like(price)
+        crossed = weight * (num_apps >= thresholds[tier_index])
+    
+        revenue.add((price * weight).sum(), ((price * weight) ** 2).sum())
+        demand.add(weight.sum(), (weight ** 2).sum())
+        tier_mix.add(np.bincount(tier_index, weight, tiers), np.bincount(tier_index, weight ** 2, tiers))
+        crossing.add(np.bincount(tier_index, crossed, tiers), np.bincount(tier_index, crossed ** 2, tiers))
+    
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return SimulationResult(
+        customers=customers,
+        confidence=confidence,
+        tier_names=tuple(tier.name for tier in price_book),
+        inflection_points=price_book.inflection_points,
+        revenue=revenue.estimate(customers, z, scalar=True),
+        demand=demand.estimate(customers, z, scalar=True),
+        tier_mix=tier_mix.estimate(customers, z),
+        crossing_rate=crossing.estimate(customers, z),
+        seconds=time.perf_counter() - start
+    )
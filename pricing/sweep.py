@@ -0,0 +1,142 @@
+"""Parallel what-if sweeps over price-book variants against a whole customer base."""
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .model import PriceBook, Tier
+from .quotes import find_optimal_recommendations
+from .tiers import PRICE_BOOK
+
+SWEEPABLE_FIELDS = ('min_apps', 'max_apps', 'base_price', 'price_per_app')
+
+# Customer columns memory-mapped by every worker process
+_CUSTOMERS: Dict[str, np.ndarray] = {}
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Aggregates per variant; row i of every array belongs to ``parameters[i]``."""
+    parameters: List[Dict[Tuple[str, str], float]]
+    tier_names: Tuple[str, ...]
+    customers: int
+    revenue: np.ndarray
+    tier_mix: np.ndarray
+    recommendation_rate: np.ndarray
+
+    def to_frame(self):
+        """Flatten into a pandas DataFrame with one row per variant."""
+        import pandas as pd
+
+        frame = pd.DataFrame([
+            {f"{tier}.{field}": value for (tier, field), value in parameters.items()}
+            for parameters in self.parameters
+        ])
+        frame['revenue'] = self.revenue
+        frame['recommendation_rate'] = self.recommendation_rate
+        for i, name in enumerate(self.tier_names):
+            frame[f"mix:{name}"] = self.tier_mix[:, i]
+        return frame
+
+def expand_grid(grid: Dict[str, Dict[str, Sequence[float]]],
+                price_book: PriceBook = PRICE_BOOK) -> List[Dict[Tuple[str, str], float]]:
+    """Cartesian product of a ``{tier name: {field: values}}`` grid.
+
+    Returns one ``{(tier name, field): value}`` mapping per variant.
+    """
+    tier_names = {tier.name for tier in price_book}
+    axes = []
+    for tier_name, fields in grid.items():
+        if tier_name not in tier_names:
+            raise ValueError(f"Unknown tier in sweep grid: {tier_name!r}")
+        for field_name, values in fields.items():
+            if field_name not in SWEEPABLE_FIELDS:
+                raise ValueError(f"Cannot sweep {field_name!r}; choose from {', '.join(SWEEPABLE_FIELDS)}")
+            axes.append([((tier_name, field_name), value) for value in values])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+def variant_tiers(tiers: Sequence[Tier], parameters: Dict[Tuple[str, str], float]) -> Tuple[Tier, ...]:
+    """Return the tiers with the variant's fields overridden, without building a price book."""
+    overrides: Dict[str, Dict[str, float]] = {}
+    for (tier_name, field_name), value in parameters.items():
+        overrides.setdefault(tier_name, {})[field_name] = value
+    return tuple(replace(tier, **overrides[tier.name]) if tier.name in overrides else tier for tier in tiers)
+
+def apply_variant(price_book: PriceBook, parameters: Dict[Tuple[str, str], float]) -> PriceBook:
+    """Return a copy of the price book with the variant's tier fields overridden."""
+    return PriceBook(variant_tiers(price_book.tiers, parameters))
+
+def _attach_customers(directory: str):
+    for column in ('num_apps', 'risk', 'weights'):
+        _CUSTOMERS[column] = np.load(os.path.join(directory, f"{column}.npy"), mmap_mode='r')
+
+def _evaluate(tiers_per_variant: List[Tuple[Tier, ...]]) -> List[Tuple[float, np.ndarray, float]]:
+    num_apps, risk, weights = _CUSTOMERS['num_apps'], _CUSTOMERS['risk'], _CUSTOMERS['weights']
+    total_customers = weights.sum()
+    results = []
+    for tiers in tiers_per_variant:
+        book = PriceBook(tiers)
+        quotes = find_optimal_recommendations(num_apps, risk, book)
+        revenue = float(np.dot(weights, quotes['current_price']))
+        tier_counts = np.bincount(quotes['tier_index'], weights=weights, minlength=len(book))
+        recommended = float(weights[quotes['recommended']].sum())
+        results.append((revenue, tier_counts / total_customers, recommended / total_customers))
+    return results
+
+def run_sweep(num_apps, risk_quantification, grid: Dict[str, Dict[str, Sequence[float]]],
+              price_book: PriceBook = PRICE_BOOK, workers: Optional[int] = None,
+              variants_per_task: Optional[int] = None) -> SweepResult:
+    """Evaluate every grid variant of the price book against the customer arrays.
+
+    Customers with the same (num_apps, risk) pair are priced identically, so the arrays
+    are collapsed to unique pairs with multiplicities first. Those columns are written
+    once to ``.npy`` files that every worker memory-maps read-only, so no customer data
+    is pickled per task. Only the small tier tuples travel to the pool. ``workers=0``
+    evaluates in-process.
+    """
+    # Unknown tiers or fields fail here, before any customer file is written or worker started
+    parameters = expand_grid(grid, price_book)
+    num_apps = np.asarray(num_apps, dtype=np.float64)
+    if not num_apps.size:
+        raise ValueError("A sweep needs at least one customer")
+    risk = np.broadcast_to(np.asarray(risk_quantification, dtype=bool), num_apps.shape)
+    pairs, weights = np.unique(np.stack([num_apps, risk.astype(np.float64)]), axis=1, return_counts=True)
+
+    # Plain tier tuples: each variant's PriceBook (and its envelope) is built once, in the worker
+    tiers = [variant_tiers(price_book.tiers, variant) for variant in parameters]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if variants_per_task is None:
+        variants_per_task = max(1, len(tiers) // (max(workers, 1) * 4))
+    tasks = [tiers[i:i + variants_per_task] for i in range(0, len(tiers), variants_per_task)]
+
+    with tempfile.TemporaryDirectory(prefix="pricing-sweep-") as directory:
+        np.save(Path(directory, "num_apps.npy"), pairs[0])
+        np.save(Path(directory, "risk.npy"), pairs[1].astype(bool))
+        np.save(Path(directory, "weights.npy"), weights.astype(np.float64))
+
+        if workers == 0:
+            _attach_customers(directory)
+            try:
+                chunks = [_evaluate(task) for task in tasks]
+            finally:
+                _CUSTOMERS.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_customers,
+                                     initargs=(directory,)) as pool:
+                chunks = list(pool.map(_evaluate, tasks))
+
+    rows = [row for chunk in chunks for row in chunk]
+    tier_names = tuple(tier.name for tier in price_book)
+    return SweepResult(
+        parameters=parameters,
+        tier_names=tier_names,
+        customers=int(num_apps.size),
+        revenue=np.array([row[0] for row in rows]),
+        tier_mix=np.array([row[1] for row in rows]).reshape(len(rows), len(tier_names)),
+        recommendation_rate=np.array([row[2] for row in rows])
+    )
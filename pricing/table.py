@@ -0,0 +1,90 @@
+"""Precomputed quote tables: every result for counts 1..max_apps, fetched by row."""
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from .formulas import PRICE_COLUMNS, price_components
+from .model import PriceBook, Tier
+from .quotes import build_recommendation, find_optimal_recommendations
+from .tiers import PRICE_BOOK
+
+def _frozen(array) -> np.ndarray:
+    array = np.ascontiguousarray(array)
+    array.flags.writeable = False
+    return array
+
+@dataclass(frozen=True)
+class QuoteRow:
+    """Everything the calculator page shows for one app count."""
+    num_apps: int
+    tier_index: int
+    tier: Tier
+    price: Dict
+    recommendation: Optional[Dict]
+    tier_prices: np.ndarray
+
+@dataclass(frozen=True)
+class QuoteTable:
+    """Columnar quotes for every count from 1 to ``max_apps`` under one risk flag.
+    
+    Row ``n - 1`` holds count ``n``. The columns are read-only NumPy arrays built with
+    the batch pricing path, which is bit-identical to calculate_price, so a lookup is
+    an O(1) row fetch instead of a tier search, pricing pass and envelope query.
+    """
+    price_book: PriceBook
+    max_apps: int
+    risk_quantification: bool
+    columns: Dict[str, np.ndarray] = field(repr=False)
+    # Price of every tier at every count, shape (max_apps, len(price_book))
+    tier_prices: np.ndarray = field(repr=False)
+    
+    @classmethod
+    def build(cls, max_apps: int, risk_quantification: bool = False,
+              price_book: PriceBook = PRICE_BOOK) -> "QuoteTable":
+        """Price counts 1..max_apps against every tier in a single vectorized pass."""
+        if max_apps < 1:
+            raise ValueError("max_apps must be at least 1")
+        num_apps = np.arange(1, max_apps + 1, dtype=np.float64)
+        recommendations = find_optimal_recommendations(num_apps, risk_quantification, price_book)
+        positions = recommendations['tier_index']
+        tier_prices = price_components(num_apps[:, None], price_book.min_apps, price_book.base_price,
+                                       price_book.price_per_app, risk_quantification)
+        
+        rows = np.arange(max_apps)
+        columns = {column: tier_prices[column][rows, positions] for column in PRICE_COLUMNS}
+        columns['tier_index'] = positions
+        for column in ('recommended', 'recommended_index', 'recommended_price', 'savings'):
+            columns[column] = recommendations[column]
+        return cls(
+            price_book=price_book,
+            max_apps=max_apps,
+            risk_quantification=risk_quantification,
+            columns={column: _frozen(values) for column, values in columns.items()},
+            tier_prices=_frozen(tier_prices['total_price'])
+        )
+    
+    def __contains__(self, num_apps) -> bool:
+        return isinstance(num_apps, (int, np.integer)) and 1 <= num_apps <= self.max_apps
+    
+    def __len__(self) -> int:
+        return self.max_apps
+    
+    def lookup(self, num_apps: int) -> QuoteRow:
+        """Fetch the precomputed quote for one count; raises KeyError outside 1..max_apps."""
+        if num_apps not in self:
+            raise KeyError(f"No precomputed quote for {num_apps!r} AI systems (1-{self.max_apps})")
+        row = num_apps - 1
+        columns = self.columns
+        tier_index = int(columns['tier_index'][row])
+        tier = self.price_book[tier_index]
+        price = {column: float(columns[column][row]) for column in PRICE_COLUMNS}
+        price['risk_enabled'] = self.risk_quantification
+        
+        recommendation = None
+        if columns['recommended'][row]:
+            recommendation = build_recommendation(
+                num_apps, tier, self.price_book[int(columns['recommended_index'][row])],
+                price['total_price'], float(columns['recommended_price'][row])
+            )
+        return QuoteRow(num_apps, tier_index, tier, price, recommendation, self.tier_prices[row])
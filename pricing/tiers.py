@@ -0,0 +1,9 @@
+"""Default Modulos AI GRC price book."""
+from .books import DEFAULT_BOOK, DEFAULT_BOOKS_DIR, load_tiers
+from .model import PriceBook
+
+# Pricing data structure based on your Excel file, kept in price_books/standard.json
+PRICING_TIERS = load_tiers(DEFAULT_BOOKS_DIR / f"{DEFAULT_BOOK}.json")
+
+# Compiled once per process and shared by every caller
+PRICE_BOOK = PriceBook.from_dicts(PRICING_TIERS)
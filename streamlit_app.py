@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from typing import Dict, List, Tuple, Optional
+
+from ui.auth import check_password, current_user
 
 # Page configuration - must be first
 st.set_page_config(
@@ -11,55 +10,24 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Try importing plotly, fall back if not available
-try:
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-
-# Password protection - matching your exact style
-def check_password():
-    def password_entered():
-        if st.session_state["password"] == "Modulos2025P!":
-            st.session_state["password_correct"] = True
-            del st.session_state["password"]
-        else:
-            st.session_state["password_correct"] = False
-
-    if "password_correct" not in st.session_state:
-        st.markdown("""
-        <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; margin: 2rem 0;">
-            <h1 style="color: white; font-size: 3rem; margin-bottom: 1rem;">Modulos AI GRC</h1>
-            <h3 style="color: white; opacity: 0.9; font-weight: 300;">Premium Pricing Calculator</h3>
-        </div>
-        """, unsafe_allow_html=True)
-        st.text_input("Enter Password", type="password", on_change=password_entered, key="password", 
-                     placeholder="Enter your access credentials")
-        st.markdown("*Please enter password to access the Modulos AI GRC pricing calculator*")
-        st.info("Contact your Modulos AI representative for access credentials")
-        return False
-    elif not st.session_state["password_correct"]:
-        st.markdown("""
-        <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; margin: 2rem 0;">
-            <h1 style="color: white; font-size: 3rem; margin-bottom: 1rem;">Modulos AI GRC</h1>
-            <h3 style="color: white; opacity: 0.9; font-weight: 300;">Premium Pricing Calculator</h3>
-        </div>
-        """, unsafe_allow_html=True)
-        st.text_input("Enter Password", type="password", on_change=password_entered, key="password",
-                     placeholder="Enter your access credentials")
-        st.error("Password incorrect. Please try again.")
-        st.info("Contact your Modulos AI representative for access credentials")
-        return False
-    else:
-        return True
-
+# Password protection runs before pandas, NumPy, Plotly and the pricing core are
+# imported, so rejected and throttled logins stop here
 if not check_password():
     st.stop()
 
+import pandas as pd  # noqa: E402
+
+from pricing import DEFAULT_BOOK, PRICE_BOOK, convert_price_book, default_fx_rates, default_registry, quote_portfolio  # noqa: E402
+from ui.audit import record_quote  # noqa: E402
+from ui.charts import PLOTLY_AVAILABLE, create_pricing_chart  # noqa: E402
+from ui.fragments import fragment  # noqa: E402
+from ui.profiling import start_profile  # noqa: E402
+from ui.quote_table import MAX_APPS, lookup_quote  # noqa: E402
+from ui.simulator import run_lognormal, run_uploaded  # noqa: E402
+from ui.templates import render_quote_cards  # noqa: E402
+
 # Exact CSS styling from your file
-st.markdown("""
+PAGE_STYLE = """
 <style>
     .main { font-family: 'Inter', sans-serif; }
     .main-header {
@@ -129,272 +97,28 @@ st.markdown("""
         margin: 1.5rem 0; box-shadow: 0 4px 20px rgba(39, 174, 96, 0.1);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # Header - matching your exact branding
-st.markdown("""
+HEADER = """
 <div class="main-header">
     <h1>Modulos AI GRC</h1>
     <p>Professional AI Governance Pricing Calculator</p>
 </div>
-""", unsafe_allow_html=True)
-
-# Pricing data structure based on your Excel file
-PRICING_TIERS = [
-    {
-        "name": "Mod Mini",
-        "min_apps": 10,
-        "max_apps": 49,
-        "base_price": 20000,
-        "price_per_app": 2000,
-        "inflection_point": 42.5,
-        "inflection_percentage": 0.85
-    },
-    {
-        "name": "Mod 50",
-        "min_apps": 50,
-        "max_apps": 99,
-        "base_price": 85000,
-        "price_per_app": 1700,
-        "inflection_point": 88.24,
-        "inflection_percentage": 0.88
-    },
-    {
-        "name": "Mod 100",
-        "min_apps": 100,
-        "max_apps": 199,
-        "base_price": 150000,
-        "price_per_app": 1500,
-        "inflection_point": 146.67,
-        "inflection_percentage": 0.73
-    },
-    {
-        "name": "Mod 200",
-        "min_apps": 200,
-        "max_apps": 349,
-        "base_price": 220000,
-        "price_per_app": 1100,
-        "inflection_point": 222.73,
-        "inflection_percentage": 0.64
-    },
-    {
-        "name": "Mod 350",
-        "min_apps": 350,
-        "max_apps": 999,
-        "base_price": 245000,
-        "price_per_app": 700,
-        "inflection_point": 642.86,
-        "inflection_percentage": 0.64
-    },
-    {
-        "name": "Mod 1000+",
-        "min_apps": 1000,
-        "max_apps": float('inf'),
-        "base_price": 450000,
-        "price_per_app": 450,
-        "inflection_point": None,
-        "inflection_percentage": None
-    }
-]
-
-def find_appropriate_tier(num_apps: int) -> Dict:
-    """Find the appropriate pricing tier for given number of apps."""
-    for tier in PRICING_TIERS:
-        if tier["min_apps"] <= num_apps <= tier["max_apps"]:
-            return tier
-    return PRICING_TIERS[-1]  # Default to highest tier
-
-def calculate_price(num_apps: int, tier: Dict, risk_quantification: bool = False) -> Dict:
-    """Calculate price based on tier, number of apps, and risk quantification."""
-    if num_apps < tier["min_apps"]:
-        base_cost = tier["base_price"]
-        additional_cost = 0
-    else:
-        additional_apps = num_apps - tier["min_apps"]
-        base_cost = tier["base_price"]
-        additional_cost = additional_apps * tier["price_per_app"]
-    
-    subtotal = base_cost + additional_cost
-    
-    if risk_quantification:
-        # Apply 30% increase for risk quantification
-        risk_premium = subtotal * 0.30
-        total_price = subtotal + risk_premium
-    else:
-        risk_premium = 0
-        total_price = subtotal
-    
-    return {
-        'total_price': total_price,
-        'base_cost': base_cost,
-        'additional_cost': additional_cost,
-        'subtotal': subtotal,
-        'risk_premium': risk_premium,
-        'risk_enabled': risk_quantification
-    }
-
-def find_optimal_recommendation(num_apps: int, risk_quantification: bool = False) -> Optional[Dict]:
-    """Find if there's a better tier recommendation."""
-    current_tier = find_appropriate_tier(num_apps)
-    current_result = calculate_price(num_apps, current_tier, risk_quantification)
-    current_price = current_result['total_price']
-    
-    # Check if next tier would be more cost-effective
-    current_index = PRICING_TIERS.index(current_tier)
-    
-    if current_index < len(PRICING_TIERS) - 1:
-        next_tier = PRICING_TIERS[current_index + 1]
-        next_tier_result = calculate_price(next_tier["min_apps"], next_tier, risk_quantification)
-        next_tier_min_price = next_tier_result['total_price']
-        
-        # Check if the inflection point suggests upgrading
-        if (current_tier["inflection_point"] and 
-            num_apps >= current_tier["inflection_point"]):
-            return {
-                "recommended_tier": next_tier,
-                "current_price": current_price,
-                "recommended_price": next_tier_min_price,
-                "savings": current_price - next_tier_min_price,
-                "reason": f"You're past the inflection point ({current_tier['inflection_point']:.0f} AI systems). Upgrading to {next_tier['name']} would be more cost-effective."
-            }
-    
-    return None
+"""
 
-def create_pricing_chart(num_apps: int, risk_quantification: bool = False):
-    """Create an interactive pricing chart matching your style."""
-    
-    if not PLOTLY_AVAILABLE:
-        st.info("📊 Interactive charts require Plotly installation. The calculator works perfectly without charts!")
-        return None
-    
-    # Generate data points for visualization
-    app_ranges = []
-    prices = []
-    tier_names = []
-    colors = []
-    
-    # Using your color palette
-    color_palette = ['#667eea', '#764ba2', '#e74c3c', '#27ae60', '#f39c12', '#8b5cf6']
-    
-    for i, tier in enumerate(PRICING_TIERS):
-        if tier["max_apps"] == float('inf'):
-            max_range = 1500
-        else:
-            max_range = min(tier["max_apps"], 1500)
-            
-        tier_apps = list(range(tier["min_apps"], max_range + 1, 10))
-        tier_prices = [calculate_price(apps, tier, risk_quantification)['total_price'] for apps in tier_apps]
-        
-        app_ranges.extend(tier_apps)
-        prices.extend(tier_prices)
-        tier_names.extend([tier["name"]] * len(tier_apps))
-        colors.extend([color_palette[i % len(color_palette)]] * len(tier_apps))
-    
-    df = pd.DataFrame({
-        'Apps': app_ranges,
-        'Price': prices,
-        'Tier': tier_names,
-        'Color': colors
-    })
-    
-    fig = go.Figure()
-    
-    # Add lines for each tier
-    for i, tier in enumerate(PRICING_TIERS):
-        if tier["max_apps"] == float('inf'):
-            max_range = 1500
-        else:
-            max_range = min(tier["max_apps"], 1500)
-        
-        tier_apps = list(range(tier["min_apps"], max_range + 1, 10))
-        tier_prices = [calculate_price(apps, tier, risk_quantification)['total_price'] for apps in tier_apps]
-        
-        line_name = f"{tier['name']}" + (" + Risk Q" if risk_quantification else "")
-        
-        fig.add_trace(go.Scatter(
-            x=tier_apps,
-            y=tier_prices,
-            mode='lines+markers',
-            name=line_name,
-            line=dict(color=color_palette[i % len(color_palette)], width=3),
-            marker=dict(size=6),
-            hovertemplate=f'<b>{tier["name"]}</b><br>' +
-                         'AI Systems: %{x}<br>' +
-                         'Price: €%{y:,.0f}' +
-                         ('<br><i>Risk Quantification: +30%</i>' if risk_quantification else '') +
-                         '<extra></extra>'
-        ))
-    
-    # Add current selection point
-    current_tier = find_appropriate_tier(num_apps)
-    current_result = calculate_price(num_apps, current_tier, risk_quantification)
-    current_price = current_result['total_price']
-    
-    fig.add_scatter(
-        x=[num_apps], 
-        y=[current_price], 
-        mode='markers', 
-        marker=dict(size=20, color='#e74c3c', symbol='diamond'),
-        name='Your Selection',
-        hovertemplate=f'<b>Your Configuration</b><br>' +
-                     f'AI Systems: {num_apps}<br>' +
-                     f'Price: €{current_price:,.0f}<br>' +
-                     f'Tier: {current_tier["name"]}' +
-                     ('<br><i>Risk Quantification: Enabled</i>' if risk_quantification else '') +
-                     '<extra></extra>'
-    )
-    
-    # Add inflection points
-    for tier in PRICING_TIERS:
-        if tier["inflection_point"] and tier["inflection_point"] <= 1500:
-            inflection_result = calculate_price(int(tier["inflection_point"]), tier, risk_quantification)
-            inflection_price = inflection_result['total_price']
-            fig.add_vline(
-                x=tier["inflection_point"], 
-                line_dash="dash", 
-                line_color="orange", 
-                opacity=0.7,
-                annotation_text=f"{tier['name']} Optimization Point"
-            )
-    
-    chart_title = '<b>Modulos AI GRC Pricing Structure</b><br><sub>Interactive Pricing Across All Tiers'
-    if risk_quantification:
-        chart_title += ' (with Risk Quantification +30%)'
-    chart_title += '</sub>'
-    
-    fig.update_layout(
-        title={
-            'text': chart_title,
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'family': 'Inter', 'size': 20}
-        },
-        xaxis_title='Number of AI Systems',
-        yaxis_title='Investment (EUR)',
-        height=600,
-        showlegend=True,
-        template="plotly_white",
-        hovermode='closest',
-        plot_bgcolor='rgba(248, 250, 254, 0.8)',
-        paper_bgcolor='rgba(255, 255, 255, 0.0)',
-        font=dict(family="Inter, sans-serif", size=12),
-        legend=dict(
-            orientation='h',
-            yanchor='bottom',
-            y=-0.15,
-            xanchor='center',
-            x=0.5,
-            font=dict(size=12, family='Inter', color='#475569'),
-            bgcolor='rgba(255,255,255,0.9)',
-            bordercolor='rgba(148, 163, 184, 0.2)',
-            borderwidth=1
-        )
-    )
-    
-    return fig
+@fragment
+def pricing_sections():
+    """Inputs and every price-dependent section.
+    
+    Changing a widget in here reruns only this function, so the CSS, header and
+    footer outside it are not sent again.
+    """
+    with start_profile("fragment") as fragment_profile:
+        _pricing_sections(fragment_profile)
 
-def main():
-    st.markdown('<h2 class="section-header">AI System Portfolio Pricing</h2>', unsafe_allow_html=True)
+def _pricing_sections(fragment_profile):
+    fragment_profile.mark("inputs")
     
     # Configuration section
     col1, col2 = st.columns([1, 2])
@@ -409,12 +133,53 @@ def main():
         num_apps = st.number_input(
             "Number of AI Systems",
             min_value=1,
-            max_value=2000,
+            max_value=MAX_APPS,
             value=100,
             step=1,
             help="Enter the total number of AI systems in your portfolio"
         )
         
+        # Re-reads a price-book file only if it changed; otherwise a dictionary lookup
+        books = default_registry()
+        book_names = books.names()
+        if not book_names:
+            st.error("No valid price-book files were found; using the built-in standard price book.")
+            base_book = PRICE_BOOK
+        else:
+            book_name = DEFAULT_BOOK if DEFAULT_BOOK in books else book_names[0]
+            if len(book_names) > 1:
+                book_name = st.selectbox(
+                    "Price book",
+                    book_names,
+                    index=book_names.index(book_name),
+                    help="Price books are loaded from pricing/price_books (or PRICING_BOOKS_DIR)"
+                )
+            base_book = books.get(book_name)
+        
+        currency_options = default_fx_rates().currencies
+        if base_book.currency in currency_options:
+            currency = st.selectbox(
+                "Currency",
+                currency_options,
+                index=currency_options.index(base_book.currency),
+                help="List prices are converted from EUR with the rates in pricing/fx_rates.json"
+            )
+        else:
+            # Any ISO code passes validation, but only currencies with an FX rate convert
+            currency = st.selectbox(
+                "Currency",
+                [base_book.currency],
+                disabled=True,
+                help=f"pricing/fx_rates.json has no {base_book.currency} rate, so this book is priced "
+                     "only in its own currency"
+            )
+        price_book = convert_price_book(base_book, currency)
+        # Shared with the simulator and portfolio fragments; switching books reruns the page so they follow
+        previous_book = st.session_state.get("price_book")
+        st.session_state["price_book"] = price_book
+        if previous_book is not None and previous_book.fingerprint != price_book.fingerprint:
+            st.rerun()
+        
         # Risk Quantification Toggle
         st.markdown("### Risk Quantification")
         risk_quantification = st.checkbox(
@@ -436,139 +201,33 @@ def main():
             <h5 style="color: #2c3e50; margin-bottom: 1rem;">Available Tiers</h5>
         """, unsafe_allow_html=True)
         
-        for tier in PRICING_TIERS:
-            max_display = "∞" if tier["max_apps"] == float('inf') else tier["max_apps"]
-            st.markdown(f"• **{tier['name']}**: {tier['min_apps']} - {max_display} AI systems")
+        for tier in price_book:
+            st.markdown(f"• **{tier.name}**: {tier.min_apps} - {tier.max_display} AI systems")
         
         st.markdown("</div>", unsafe_allow_html=True)
     
     with col2:
-        # Current pricing calculation
-        current_tier = find_appropriate_tier(num_apps)
-        price_result = calculate_price(num_apps, current_tier, risk_quantification)
-        current_price = price_result['total_price']
-        
-        st.markdown(f"""
-        <div class="premium-card highlight-card">
-            <h3>Investment Analysis for {num_apps} AI Systems</h3>
-            <h2 style="font-size: 2.5rem; margin: 1rem 0;">€{current_price:,.0f}</h2>
-            <p style="font-size: 1.2rem;">Selected Tier: {current_tier["name"]}</p>
-            {'<p style="font-size: 1rem; opacity: 0.9;">Risk Quantification: Enabled (+30%)</p>' if risk_quantification else ''}
-        </div>
-        """, unsafe_allow_html=True)
+        # Current pricing calculation, fetched from the precomputed quote table
+        fragment_profile.mark("tier_calculation")
+        quote = lookup_quote(num_apps, risk_quantification, price_book)
+        current_index = quote.tier_index
+        record_quote(quote, risk_quantification, price_book, user=current_user())
+        fragment_profile.mark("highlight_stats")
+        # Pre-rendered once per (price book, count, risk flag) and shared across sessions
+        cards = render_quote_cards(num_apps, risk_quantification, price_book)
+        st.markdown(cards.highlight, unsafe_allow_html=True)
         
         # Key metrics
-        price_per_app_calc = current_price / num_apps
-        base_price_per_app = price_result['subtotal'] / num_apps
-        
-        if risk_quantification:
-            st.markdown(f"""
-            <div class="stats-container">
-                <div class="stat-box">
-                    <div class="stat-value">€{price_per_app_calc:.0f}</div>
-                    <div class="stat-label">Total Cost per AI System</div>
-                </div>
-                <div class="stat-box">
-                    <div class="stat-value">€{base_price_per_app:.0f}</div>
-                    <div class="stat-label">Base Cost per AI System</div>
-                </div>
-                <div class="stat-box">
-                    <div class="stat-value">€{price_result['risk_premium']:,.0f}</div>
-                    <div class="stat-label">Risk Premium Total</div>
-                </div>
-                <div class="stat-box">
-                    <div class="stat-value">{current_tier["min_apps"]}-{current_tier["max_apps"] if current_tier["max_apps"] != float('inf') else '∞'}</div>
-                    <div class="stat-label">Tier Range</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-            <div class="stats-container">
-                <div class="stat-box">
-                    <div class="stat-value">€{price_per_app_calc:.0f}</div>
-                    <div class="stat-label">Cost per AI System</div>
-                </div>
-                <div class="stat-box">
-                    <div class="stat-value">{current_tier["min_apps"]}-{current_tier["max_apps"] if current_tier["max_apps"] != float('inf') else '∞'}</div>
-                    <div class="stat-label">Tier Range</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(cards.stats, unsafe_allow_html=True)
     
     # Optimization recommendation
-    recommendation = find_optimal_recommendation(num_apps, risk_quantification)
-    
-    if recommendation:
-        st.markdown(f"""
-        <div class="optimization-alert">
-            <h4 style="color: #c0392b; margin-bottom: 1rem;">⚠️ Optimization Opportunity Detected</h4>
-            <p><strong>{recommendation["reason"]}</strong></p>
-            <div style="margin-top: 1rem;">
-                <p>• Current Configuration: €{recommendation['current_price']:,.0f}</p>
-                <p>• Recommended Tier: {recommendation['recommended_tier']['name']} - €{recommendation['recommended_price']:,.0f}</p>
-                <p style="color: #c0392b; font-weight: 600;">• Potential Savings: €{recommendation['savings']:,.0f}</p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="optimal-badge">
-            <h4 style="color: #229954; margin-bottom: 1rem;">✅ Optimal Configuration</h4>
-            <p>You're getting the best value with the <strong>{current_tier['name']}</strong> tier for {num_apps} AI systems!</p>
-            <p>This configuration provides optimal cost efficiency for your portfolio size.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    fragment_profile.mark("recommendation")
+    st.markdown(cards.recommendation, unsafe_allow_html=True)
     
     # Pricing breakdown
+    fragment_profile.mark("breakdown_html")
     st.markdown('<h3 class="section-header">Investment Breakdown</h3>', unsafe_allow_html=True)
-    
-    additional_apps = max(0, num_apps - current_tier['min_apps'])
-    
-    if risk_quantification:
-        st.markdown(f"""
-        <div class="simple-breakdown">
-            <h4 style="margin-bottom: 1rem; color: #2c3e50;">Pricing Components</h4>
-            <div class="simple-item">
-                <span>Base Tier Price ({current_tier['name']})</span>
-                <strong>€{current_tier['base_price']:,.0f}</strong>
-            </div>
-            <div class="simple-item">
-                <span>Additional AI Systems ({additional_apps} × €{current_tier['price_per_app']:,.0f})</span>
-                <strong>€{price_result['additional_cost']:,.0f}</strong>
-            </div>
-            <div class="simple-item">
-                <span>Subtotal (Base + Additional)</span>
-                <strong>€{price_result['subtotal']:,.0f}</strong>
-            </div>
-            <div class="simple-item">
-                <span>Risk Quantification Premium (+30%)</span>
-                <strong>€{price_result['risk_premium']:,.0f}</strong>
-            </div>
-            <div class="simple-final">
-                <span>Total Investment</span>
-                <strong>€{current_price:,.0f}</strong>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="simple-breakdown">
-            <h4 style="margin-bottom: 1rem; color: #2c3e50;">Pricing Components</h4>
-            <div class="simple-item">
-                <span>Base Tier Price ({current_tier['name']})</span>
-                <strong>€{current_tier['base_price']:,.0f}</strong>
-            </div>
-            <div class="simple-item">
-                <span>Additional AI Systems ({additional_apps} × €{current_tier['price_per_app']:,.0f})</span>
-                <strong>€{price_result['additional_cost']:,.0f}</strong>
-            </div>
-            <div class="simple-final">
-                <span>Total Investment</span>
-                <strong>€{current_price:,.0f}</strong>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(cards.breakdown, unsafe_allow_html=True)
     
     # Risk Quantification Information Panel
     if risk_quantification:
@@ -597,20 +256,21 @@ def main():
         """, unsafe_allow_html=True)
     
     # Tier comparison table
+    fragment_profile.mark("comparison_table")
     st.markdown('<h3 class="section-header">Tier Comparison Analysis</h3>', unsafe_allow_html=True)
     
     comparison_data = []
-    for tier in PRICING_TIERS:
-        price_result_tier = calculate_price(num_apps, tier, risk_quantification)
-        price_for_tier = price_result_tier['total_price']
-        is_selected = tier == current_tier
+    tier_prices = quote.tier_prices
+    for i, tier in enumerate(price_book):
+        price_for_tier = tier_prices[i]
+        is_selected = i == current_index
         
         comparison_data.append({
-            "Tier": tier["name"],
-            "Range": f"{tier['min_apps']}-{tier['max_apps'] if tier['max_apps'] != float('inf') else '∞'}",
-            "Base Price": f"€{tier['base_price']:,.0f}",
-            "Per Additional": f"€{tier['price_per_app']:,.0f}",
-            "Your Price": f"€{price_for_tier:,.0f}" + (" (+30% Risk)" if risk_quantification else ""),
+            "Tier": tier.name,
+            "Range": tier.range_label,
+            "Base Price": tier.base_price_label,
+            "Per Additional": tier.price_per_app_label,
+            "Your Price": price_book.format_price(price_for_tier) + (" (+30% Risk)" if risk_quantification else ""),
             "Selected": "✅" if is_selected else ""
         })
     
@@ -629,9 +289,10 @@ def main():
     )
     
     # Interactive visualization
+    fragment_profile.mark("pricing_chart")
     if PLOTLY_AVAILABLE:
         st.markdown('<h3 class="section-header">Interactive Pricing Visualization</h3>', unsafe_allow_html=True)
-        fig = create_pricing_chart(num_apps, risk_quantification)
+        fig = create_pricing_chart(num_apps, risk_quantification, price_book)
         if fig:
             st.plotly_chart(fig, use_container_width=True)
     else:
@@ -645,16 +306,150 @@ def main():
             <div style="font-family: monospace; background: #f8f9fa; padding: 1rem; border-radius: 8px;">
         """, unsafe_allow_html=True)
         
-        for tier in PRICING_TIERS:
-            tier_result = calculate_price(num_apps, tier, risk_quantification)
-            tier_price = tier_result['total_price']
-            is_current = tier == current_tier
+        for i, tier in enumerate(price_book):
+            tier_price = tier_prices[i]
+            is_current = i == current_index
             marker = "👉 " if is_current else "   "
-            st.write(f"{marker}{tier['name']:<12}: €{tier_price:>10,.0f}" + (" (SELECTED)" if is_current else ""))
+            st.write(f"{marker}{tier.name:<12}: {price_book.format_price(tier_price, '>10,.0f')}" + (" (SELECTED)" if is_current else ""))
         
         st.markdown("</div></div>", unsafe_allow_html=True)
+
+@fragment
+def revenue_simulator():
+    """Expected revenue, tier mix and inflection-point crossings over sampled customers."""
+    # Tabs run every body on each full rerun, so sampling waits for this toggle
+    if st.toggle("Run the simulation", value=False, key="simulator_on"):
+        _revenue_simulator(st.session_state.get("price_book", PRICE_BOOK))
+
+def _revenue_simulator(price_book):
+    st.caption("Samples customer portfolio sizes and prices every customer under the selected "
+               "price book. Intervals are 95% Monte Carlo confidence intervals.")
+    source = st.radio("Customer distribution", ["Lognormal model", "Customer file"], horizontal=True,
+                      key="simulator_source")
+    col1, col2 = st.columns(2)
+    with col1:
+        risk_share = st.slider("Customers with Risk Quantification (%)", 0, 100, 30,
+                               key="simulator_risk_share") / 100
+        customers = st.select_slider("Sampled customers", [100_000, 1_000_000, 5_000_000], value=1_000_000,
+                                     format_func="{:,}".format, key="simulator_customers")
+    with col2:
+        price_change = st.slider("What-if price change (%)", -30, 30, 0, key="simulator_price_change") / 100
+        elasticity = st.slider("Price elasticity of demand", 0.0, 3.0, 0.0, 0.1, key="simulator_elasticity",
+                               help="Demand scales with (new price / current price) ^ -elasticity")
+    
+    if source == "Lognormal model":
+        median = st.number_input("Median AI systems per customer", min_value=1, max_value=MAX_APPS, value=80,
+                                 key="simulator_median")
+        sigma = st.slider("Spread (lognormal sigma)", 0.0, 2.0, 0.8, 0.1, key="simulator_sigma")
+        
+        def run(change, elasticity):
+            return run_lognormal(price_book, median, sigma, risk_share, customers, change, elasticity)
+    else:
+        upload = st.file_uploader("Customer CSV with num_apps (risk_quantification optional)", type="csv",
+                                  key="simulator_file")
+        if upload is None:
+            st.info("Upload a customer CSV to resample its portfolio sizes.")
+            return
+        data = upload.getvalue()
+        
+        def run(change, elasticity):
+            return run_uploaded(price_book, data, risk_share, customers, change, elasticity)
+    
+    try:
+        current = run(0.0, 0.0)
+        result = run(price_change, elasticity) if price_change else current
+    except (KeyError, ValueError) as error:
+        st.error(f"Could not simulate these customers: {error}")
+        return
+    
+    revenue_delta = result.revenue.mean - current.revenue.mean
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Expected Revenue per Customer", price_book.format_price(result.revenue.mean),
+                delta=price_book.format_price(revenue_delta) if price_change else None,
+                help=f"95% CI {price_book.format_price(result.revenue.low)} - "
+                     f"{price_book.format_price(result.revenue.high)}")
+    col2.metric("Expected Demand", f"{result.demand.mean:.1%}", help="Share of customers still buying at the what-if prices")
+    col3.metric("Past an Inflection Point", f"{result.crossing_rate.mean.sum():.1%}",
+                help="Customers whose next tier would already be cheaper")
+    
+    frame = result.to_frame()
+    st.dataframe(pd.DataFrame({
+        'Tier': frame['tier'],
+        'Inflection Point': frame['inflection_point'].round(1),
+        'Customer Share': [f"{m:.2%} ({lo:.2%} - {hi:.2%})" for m, lo, hi in
+                           zip(frame['share'], frame['share_low'], frame['share_high'])],
+        'Past Inflection Point': [f"{m:.2%} ({lo:.2%} - {hi:.2%})" for m, lo, hi in
+                                  zip(frame['past_inflection'], frame['past_inflection_low'],
+                                      frame['past_inflection_high'])]
+    }), hide_index=True, use_container_width=True)
+    st.caption(f"{result.customers:,} customers simulated in {result.seconds:.2f}s")
+
+@fragment
+def portfolio_section():
+    """Group customers: license each subsidiary separately, pooled, or in a cheaper grouping."""
+    # Tabs run every body on each full rerun, so the editor and the search wait for this
+    # toggle and stay off the full-page rerun path until someone uses them
+    if not st.toggle("Quote a group portfolio", value=False, key="portfolio_open"):
+        return
+    st.caption("Enter the AI systems of each subsidiary. Pooled entities are priced as one "
+               "customer with their combined count; the quote searches for the cheapest grouping "
+               "under the selected price book and currency.")
+    entities = st.data_editor(
+        pd.DataFrame({'Entity': ["Subsidiary A", "Subsidiary B", "Subsidiary C"], 'AI Systems': [40, 25, 60]}),
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        key="portfolio_entities"
+    )
+    risk_quantification = st.checkbox("Enable Risk Quantification (+30%)", value=False, key="portfolio_risk")
+    
+    entities = entities.dropna(subset=['AI Systems'])
+    counts = pd.to_numeric(entities['AI Systems'], errors='coerce')
+    if entities.empty or counts.isna().any() or (counts < 1).any() or (counts % 1 != 0).any():
+        st.info("Enter a whole number of at least 1 AI system for every entity.")
+        return
+    
+    price_book = st.session_state.get("price_book", PRICE_BOOK)
+    quote = quote_portfolio(counts.to_numpy(), risk_quantification, price_book)
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Suggested Grouping", price_book.format_price(quote.total_price))
+    col2.metric("All Separate", price_book.format_price(quote.separate_total))
+    col3.metric("All Pooled", price_book.format_price(quote.pooled_total))
+    
+    names = entities['Entity'].fillna("").astype(str).to_numpy()
+    st.dataframe(pd.DataFrame([
+        {
+            'Group': f"Pool {g + 1}" if len(members) > 1 else "Separate",
+            'Entities': ", ".join(names[members]),
+            'AI Systems': int(quote.group_apps[g]),
+            'Tier': price_book[int(quote.group_tier_index[g])].name,
+            'Price': price_book.format_price(quote.group_prices[g])
+        }
+        for g, members in enumerate(quote.groups())
+    ]), hide_index=True, use_container_width=True)
+
+def main(profile):
+    profile.mark("page_style_header")
+    st.markdown(PAGE_STYLE, unsafe_allow_html=True)
+    st.markdown(HEADER, unsafe_allow_html=True)
+    
+    st.markdown('<h2 class="section-header">AI System Portfolio Pricing</h2>', unsafe_allow_html=True)
+    
+    profile.mark("pricing_sections")
+    pricing_sections()
+    
+    # Fragments called inside tabs created here rerun in place
+    simulator_tab, portfolio_tab = st.tabs(["Revenue Simulator", "Multi-entity Portfolio"])
+    with simulator_tab:
+        profile.mark("revenue_simulator")
+        revenue_simulator()
+    with portfolio_tab:
+        profile.mark("portfolio")
+        portfolio_section()
     
     # Footer - matching your exact styling
+    profile.mark("footer")
     st.markdown("---")
     st.markdown("""
     <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #f8fafe 0%, #e8ecff 100%); border-radius: 15px; margin-top: 2rem;">
@@ -665,4 +460,6 @@ def main():
     """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
+    # Opt-in render profiling (?profile=1); a no-op unless requested
+    with start_profile() as profile:
+        main(profile)
@@ -0,0 +1,95 @@
+"""Quote audit log: background appends, crash-safe header count and vectorized replay."""
+import numpy as np
+import pytest
+
+from pricing import (
+    PRICE_BOOK,
+    PRICING_TIERS,
+    AuditLog,
+    PriceBook,
+    calculate_prices,
+    convert_price_book,
+    default_audit_log,
+    read_audit_log,
+    replay,
+)
+from pricing.audit import GROW_RECORDS, HEADER_SIZE
+
+def _log_quotes(path, num_apps, risk, price_book=PRICE_BOOK):
+    prices = calculate_prices(num_apps, risk, price_book)
+    log = AuditLog(path)
+    for i in range(len(num_apps)):
+        log.record(num_apps[i], risk[i], prices['tier_index'][i], prices['subtotal'][i],
+                   prices['risk_premium'][i], prices['total_price'][i], price_book, user="ana", session="s1")
+    log.close()
+    return prices
+
+def test_records_round_trip_across_growth_and_reopen(tmp_path):
+    path = tmp_path / "quotes.audit"
+    rng = np.random.default_rng(0)
+    num_apps = rng.integers(1, 2000, GROW_RECORDS + 10).astype(np.float64)
+    risk = rng.random(num_apps.size) < 0.5
+    prices = _log_quotes(path, num_apps, risk)
+    
+    log = AuditLog(path)
+    log.record(7, False, 0, 20_000, 0, 20_000, convert_price_book(PRICE_BOOK, "USD"), session="s2")
+    assert log.flush()
+    log.close()
+    
+    records = read_audit_log(path)
+    assert len(records) == num_apps.size + 1
+    np.testing.assert_array_equal(records['num_apps'][:-1], num_apps)
+    np.testing.assert_array_equal(records['risk_quantification'][:-1], risk)
+    np.testing.assert_array_equal(records['total_price'][:-1], prices['total_price'])
+    assert (records['price_book'][:-1] == PRICE_BOOK.fingerprint.encode()).all()
+    assert (records['user'][:-1] == b"ana").all()
+    assert (records['currency'][-1], records['session'][-1]) == (b"USD", b"s2")
+    assert np.all(np.diff(records['timestamp_ns']) >= 0)
+
+def test_long_names_are_cut_on_a_character_boundary(tmp_path):
+    path = tmp_path / "quotes.audit"
+    log = AuditLog(path)
+    # 31 ASCII bytes leave one byte of the 32-byte field for a two-byte character
+    log.record(5, False, 0, 20_000, 0, 20_000, PRICE_BOOK, user="a" * 31 + "é", session="ß" * 40)
+    log.close()
+    records = read_audit_log(path)
+    assert records['user'][0].decode("utf-8") == "a" * 31
+    assert records['session'][0].decode("utf-8") == "ß" * 18
+
+def test_auditing_is_off_unless_configured(monkeypatch):
+    monkeypatch.delenv("PRICING_AUDIT_LOG", raising=False)
+    assert default_audit_log() is None
+    monkeypatch.setenv("PRICING_AUDIT_LOG", "")
+    assert default_audit_log() is None
+
+def test_uncommitted_tail_is_ignored(tmp_path):
+    path = tmp_path / "quotes.audit"
+    _log_quotes(path, np.array([10.0, 20.0]), np.array([False, True]))
+    # Bytes past the committed count (a write cut short) are never read
+    with open(path, "r+b") as handle:
+        handle.seek(HEADER_SIZE + 2 * read_audit_log(path).dtype.itemsize)
+        handle.write(b"\xff" * 64)
+    assert len(read_audit_log(path)) == 2
+    
+    with open(path, "r+b") as handle:
+        handle.write(b"NOTAUDIT")
+    with pytest.raises(ValueError):
+        read_audit_log(path)
+
+def test_replay_reprices_under_a_new_book(tmp_path):
+    path = tmp_path / "quotes.audit"
+    rng = np.random.default_rng(1)
+    num_apps = rng.integers(1, 2000, 5000).astype(np.float64)
+    risk = rng.random(num_apps.size) < 0.3
+    prices = _log_quotes(path, num_apps, risk)
+    
+    same = replay(path, chunk_size=777)
+    np.testing.assert_array_equal(same.replayed_total, prices['total_price'])
+    assert same.tier_changes == 0
+    
+    dearer = PriceBook.from_dicts([dict(tier, base_price=tier['base_price'] * 1.1,
+                                        price_per_app=tier['price_per_app'] * 1.1) for tier in PRICING_TIERS])
+    result = replay(path, dearer)
+    assert result.records == num_apps.size
+    np.testing.assert_allclose(result.replayed_total, prices['total_price'] * 1.1)
+    assert "+10.00%" in result.summary()
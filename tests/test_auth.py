@@ -0,0 +1,95 @@
+"""Password gate: PBKDF2 hashes, token-bucket throttling and the login flow."""
+from pathlib import Path
+
+import pytest
+
+from ui.auth import MAX_CONCURRENT_VERIFICATIONS, SESSION_ATTEMPTS, VERIFICATION_SLOTS, AttemptThrottle, hash_password, load_credentials, verify_password
+
+APP_PATH = Path(__file__).resolve().parents[1] / "streamlit_app.py"
+
+def test_hashes_verify_and_reject():
+    encoded = hash_password("correct horse", iterations=1000)
+    assert verify_password("correct horse", encoded)
+    assert not verify_password("correct horse!", encoded)
+    assert encoded != hash_password("correct horse", iterations=1000)
+    for malformed in ("", "plaintext", "md5$1$c2FsdA==$aGFzaA==", "pbkdf2_sha256$x$c2FsdA==$aGFzaA=="):
+        assert not verify_password("plaintext", malformed)
+
+def test_throttle_limits_sessions_and_ips(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("ui.auth.time.monotonic", lambda: clock[0])
+    throttle = AttemptThrottle(session_attempts=2, ip_attempts=3, refill_seconds=10)
+    assert throttle.allow("a", "1.2.3.4") and throttle.allow("a", "1.2.3.4")
+    assert not throttle.allow("a", "1.2.3.4")
+    # A fresh session from the same address still hits the address' bucket
+    assert not throttle.allow("b", "1.2.3.4")
+    assert throttle.allow("c", "5.6.7.8")
+    clock[0] = 10.0
+    assert throttle.allow("a", "5.6.7.8")
+    assert not throttle.allow("a", "5.6.7.8")
+
+def test_new_sessions_without_an_ip_share_the_global_bucket(monkeypatch):
+    monkeypatch.setattr("ui.auth.time.monotonic", lambda: 0.0)
+    throttle = AttemptThrottle(session_attempts=5, global_attempts=3, refill_seconds=10)
+    assert all(throttle.allow(f"session {i}") for i in range(3))
+    assert not throttle.allow("session 3")
+    # Clients with a known IP have their own buckets
+    assert throttle.allow("session 4", "1.2.3.4")
+
+def test_login_requires_configured_credentials(monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    monkeypatch.delenv("PRICING_PASSWORD_HASH", raising=False)
+    monkeypatch.delenv("PRICING_USERS", raising=False)
+    assert load_credentials() == (None, {})
+    
+    app = testing.AppTest.from_file(str(APP_PATH), default_timeout=60)
+    app.run()
+    assert app.error[0].value.startswith("Login is not configured")
+    assert not app.text_input and not app.number_input
+
+def test_login_flow(monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    monkeypatch.setenv("PRICING_PASSWORD_HASH", hash_password("s3cret", iterations=1000))
+    monkeypatch.setenv("PRICING_USERS", f"alice={hash_password('wonderland', iterations=1000)}")
+    monkeypatch.delenv("PRICING_AUDIT_LOG", raising=False)
+    
+    app = testing.AppTest.from_file(str(APP_PATH), default_timeout=60)
+    app.run()
+    assert [field.label for field in app.text_input] == ["Username", "Enter Password"]
+    app.text_input(key="password").input("wrong").run()
+    assert app.error[0].value == "Password incorrect. Please try again."
+    app.text_input(key="username").input("alice")
+    app.text_input(key="password").input("wonderland").run()
+    assert not app.exception
+    assert app.session_state["auth_user"] == "alice"
+    assert len(app.number_input) >= 1
+
+def test_login_attempts_are_throttled(monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    monkeypatch.setenv("PRICING_PASSWORD_HASH", hash_password("s3cret", iterations=1000))
+    
+    app = testing.AppTest.from_file(str(APP_PATH), default_timeout=60)
+    app.run()
+    for attempt in range(SESSION_ATTEMPTS + 1):
+        app.text_input(key="password").input(f"guess {attempt}").run()
+    assert app.error[0].value.startswith("Too many attempts")
+    # Even the right password is refused until the bucket refills
+    app.text_input(key="password").input("s3cret").run()
+    assert not app.session_state["password_correct"]
+
+def test_busy_verification_slots_reject_without_hashing(monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    monkeypatch.setenv("PRICING_PASSWORD_HASH", hash_password("s3cret", iterations=1000))
+    monkeypatch.setattr("ui.auth.verify_password", lambda *args: pytest.fail("hashed while every slot was busy"))
+    
+    app = testing.AppTest.from_file(str(APP_PATH), default_timeout=60)
+    app.run()
+    for _ in range(MAX_CONCURRENT_VERIFICATIONS):
+        assert VERIFICATION_SLOTS.acquire(blocking=False)
+    try:
+        app.text_input(key="password").input("s3cret").run()
+    finally:
+        for _ in range(MAX_CONCURRENT_VERIFICATIONS):
+            VERIFICATION_SLOTS.release()
+    assert app.error[0].value.startswith("Too many attempts")
+    assert not app.session_state["password_correct"]
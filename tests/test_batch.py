@@ -0,0 +1,20 @@
+"""Streaming bulk quoting: output types stay stable across chunks."""
+import pandas as pd
+import pytest
+
+from pricing import quote_file
+
+def test_whole_counts_are_written_as_integers_in_every_chunk(tmp_path):
+    source, output = tmp_path / "customers.csv", tmp_path / "quotes.csv"
+    source.write_text("customer_id,num_apps,risk_quantification\na,5,no\nb,7.0,yes\nc,250,no\n", encoding="utf-8")
+    stats = quote_file(source, output, chunk_size=1)
+    quotes = pd.read_csv(output)
+    assert stats.chunks == 3
+    assert quotes['num_apps'].tolist() == [5, 7, 250]
+    assert quotes['num_apps'].dtype.kind == 'i'
+
+def test_fractional_counts_are_rejected(tmp_path):
+    source = tmp_path / "customers.csv"
+    source.write_text("customer_id,num_apps,risk_quantification\na,5,no\nb,7.5,no\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Row 1: num_apps must be a whole number"):
+        quote_file(source, tmp_path / "quotes.csv", chunk_size=1)
@@ -0,0 +1,79 @@
+"""Price-book files: validation and hot-swapping on change."""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from pricing import PRICE_BOOK, PRICING_TIERS, PriceBookError, PriceBookRegistry, load_price_book, validate_tiers
+from pricing.books import DEFAULT_BOOKS_DIR
+
+def _write(path, tiers, currency="EUR", mtime_ns=None):
+    path.write_text(json.dumps({'currency': currency, 'tiers': tiers}), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def _tiers(**overrides):
+    tiers = [dict(tier, max_apps=None if tier['max_apps'] == float('inf') else tier['max_apps'])
+             for tier in PRICING_TIERS]
+    for name, fields in overrides.items():
+        next(tier for tier in tiers if tier['name'] == name).update(fields)
+    return tiers
+
+def test_standard_file_compiles_to_the_default_book():
+    assert not validate_tiers(PRICING_TIERS)
+    assert load_price_book(DEFAULT_BOOKS_DIR / "standard.json").fingerprint == PRICE_BOOK.fingerprint
+
+def test_validation_reports_every_problem(tmp_path):
+    path = tmp_path / "broken.json"
+    _write(path, _tiers(**{'Mod 50': {'min_apps': 45}, 'Mod 200': {'min_apps': 210},
+                           'Mod 350': {'price_per_app': 1200}}))
+    with pytest.raises(PriceBookError) as error:
+        load_price_book(path)
+    problems = error.value.problems
+    assert any("overlap" in problem and "'Mod 50'" in problem for problem in problems)
+    assert any("gap between 'Mod 100' and 'Mod 200'" in problem for problem in problems)
+    assert any("price_per_app rises from 'Mod 200' and 'Mod 350'" in problem for problem in problems)
+
+def test_registry_swaps_changed_files_and_keeps_the_last_good_book(tmp_path):
+    path = tmp_path / "partner.json"
+    _write(path, _tiers(), mtime_ns=1_000_000_000)
+    books = PriceBookRegistry.from_directory(tmp_path, check_interval=0)
+    original = books.get("partner")
+    assert books.names() == ("partner",)
+    assert books.get("partner") is original
+    
+    _write(path, _tiers(**{'Mod Mini': {'base_price': 18000}}), mtime_ns=2_000_000_000)
+    swapped = books.get("partner")
+    assert swapped[0].base_price == 18000
+    assert original[0].base_price == 20000
+    
+    _write(path, _tiers(**{'Mod Mini': {'max_apps': 60}}), mtime_ns=3_000_000_000)
+    assert books.get("partner") is swapped
+    assert "partner" in books.errors
+
+def test_registry_skips_invalid_files(tmp_path):
+    _write(tmp_path / "good.json", _tiers())
+    _write(tmp_path / "bad.json", _tiers(**{'Mod 50': {'min_apps': 45}}))
+    books = PriceBookRegistry.from_directory(tmp_path)
+    assert books.names() == ("good",)
+    assert books.get("good").fingerprint == PRICE_BOOK.fingerprint
+    assert "overlap" in books.errors["bad"]
+
+def test_page_prices_a_book_without_an_fx_rate_in_its_own_currency(tmp_path, monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    (tmp_path / "standard.json").write_text((DEFAULT_BOOKS_DIR / "standard.json").read_text(encoding='utf-8'),
+                                            encoding='utf-8')
+    _write(tmp_path / "nordic.json", _tiers(), currency="SEK")
+    monkeypatch.setenv("PRICING_BOOKS_DIR", str(tmp_path))
+    monkeypatch.setattr("pricing.books._DEFAULT_REGISTRY", None)
+    
+    app = testing.AppTest.from_file(str(Path(__file__).resolve().parents[1] / "streamlit_app.py"),
+                                    default_timeout=60)
+    app.session_state["password_correct"] = True
+    app.run()
+    next(box for box in app.selectbox if box.label == "Price book").set_value("nordic").run()
+    assert not app.exception
+    currency = next(box for box in app.selectbox if box.label == "Currency")
+    assert currency.options == ["SEK"] and currency.disabled
+    assert any("SEK " in card.value for card in app.markdown if "Investment Analysis" in card.value)
@@ -0,0 +1,29 @@
+"""Budget-to-capacity solver against a brute-force search over app counts."""
+import numpy as np
+
+from pricing import find_optimal_recommendations, max_apps_for_budget, max_apps_for_budgets
+
+MAX_COUNT = 5000
+
+def _brute_force(budgets, risk):
+    counts = np.arange(1, MAX_COUNT + 1, dtype=np.float64)
+    cheapest = find_optimal_recommendations(counts, risk)['recommended_price']
+    # Cheapest price of licensing at least n systems, non-decreasing in n
+    floor_price = np.minimum.accumulate(cheapest[::-1])[::-1]
+    return np.searchsorted(floor_price, budgets, side='right').astype(np.float64)
+
+def test_batch_matches_brute_force_at_and_around_every_price():
+    rng = np.random.default_rng(3)
+    for risk in (False, True):
+        prices = find_optimal_recommendations(np.arange(1, MAX_COUNT), risk)['recommended_price']
+        budgets = np.concatenate([prices, prices - 0.01, prices + 0.01, rng.uniform(0, 2e6, 5000)])
+        result = max_apps_for_budgets(budgets, risk)
+        np.testing.assert_array_equal(result['num_apps'], _brute_force(budgets, risk))
+        assert (result['total_price'] <= budgets).all()
+        np.testing.assert_allclose(result['remaining_budget'], budgets - result['total_price'])
+
+def test_scalar_budget():
+    result = max_apps_for_budget(300_000, True)
+    assert (result['num_apps'], result['tier'].name, result['total_price']) == (209, "Mod 200", 298_870)
+    assert max_apps_for_budget(300_000)['num_apps'] == 428
+    assert max_apps_for_budget(19_999.99) is None
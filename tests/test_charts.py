@@ -0,0 +1,29 @@
+"""Pricing chart: a shared validated base figure, with the selection moved per session."""
+import pytest
+
+pytest.importorskip("plotly")
+
+from pricing import PRICE_BOOK, calculate_price, convert_price_book
+from ui import charts
+
+def test_rerun_moves_the_marker_of_the_session_copy():
+    first = charts.create_pricing_chart(250, True, PRICE_BOOK)
+    marker = first.data[-1]
+    assert marker.name == "Your Selection"
+    assert list(marker.x) == [250]
+    tier = PRICE_BOOK.index.locate(250)[1]
+    assert list(marker.y) == [calculate_price(250, tier, True)['total_price']]
+    assert tier.name in marker.hovertemplate
+    
+    second = charts.create_pricing_chart(900, True, PRICE_BOOK)
+    assert second is first and list(second.data[-1].x) == [900]
+    # The figure shared by every session keeps its empty marker
+    shared = charts.build_base_pricing_chart(PRICE_BOOK, PRICE_BOOK.fingerprint, True)
+    assert shared is not first and len(shared.data[-1].x) == 0
+
+def test_new_book_or_risk_flag_starts_a_new_copy():
+    eur = charts.create_pricing_chart(100, False, PRICE_BOOK)
+    usd = charts.create_pricing_chart(100, False, convert_price_book(PRICE_BOOK, "USD"))
+    assert usd is not eur and usd.layout.yaxis.title.text == "Investment (USD)"
+    assert charts.create_pricing_chart(100, True, PRICE_BOOK).data[-1].name == "Your Selection"
+    assert len(eur.data) == len(PRICE_BOOK) + 1
@@ -0,0 +1,61 @@
+"""Compiled contract pricing rules against the simple formula and a hand-worked deal."""
+import numpy as np
+import pytest
+
+from pricing import (
+    RISK_QUANTIFICATION,
+    AddOn,
+    ContractTerm,
+    GraduatedBands,
+    calculate_prices,
+    compile_rules,
+    find_optimal_recommendations,
+    rules_from_dict,
+)
+
+def test_risk_add_on_alone_reproduces_calculate_prices_exactly():
+    rng = np.random.default_rng(11)
+    num_apps = np.concatenate([rng.integers(1, 3000, 50_000), rng.uniform(0, 3000, 5_000)])
+    risk = rng.random(num_apps.size) < 0.5
+    compiled = compile_rules([RISK_QUANTIFICATION])
+    quotes = compiled.quote_many(num_apps, {'risk_quantification': risk})
+    expected = calculate_prices(num_apps, risk)
+    np.testing.assert_array_equal(quotes['tier_index'], expected['tier_index'])
+    np.testing.assert_array_equal(quotes['subtotal'], expected['subtotal'])
+    np.testing.assert_array_equal(quotes['annual_total'], expected['total_price'])
+    np.testing.assert_array_equal(quotes['contract_total'], expected['total_price'])
+    np.testing.assert_array_equal(compiled.cheapest_many(num_apps),
+                                  find_optimal_recommendations(num_apps)['recommended_index'])
+
+def test_bands_add_ons_and_term_stack():
+    rules = rules_from_dict({
+        'bands': {'Mod 200': [[250, 900], [300, 800]]},
+        'add_ons': [{'name': 'support', 'rate': 0.1, 'flat': 5000}, {'name': 'training', 'per_app': 50}],
+        'term': {'years': 3, 'escalator': 0.05}
+    })
+    quote = compile_rules(rules).quote(320)
+    # 220,000 + 50 x 1,100 + 50 x 900 + 20 x 800
+    assert quote['subtotal'] == 336_000
+    assert quote['support'] == pytest.approx(38_600)
+    assert quote['training'] == 16_000
+    assert quote['year_totals'] == pytest.approx([390_600, 410_130, 430_636.5])
+    assert quote['contract_total'] == pytest.approx(sum(quote['year_totals']))
+
+def test_cheapest_tier_follows_bands():
+    compiled = compile_rules([GraduatedBands("Mod 200", ((210, 100),)), ContractTerm(2)])
+    num_apps = np.arange(1, 2500)
+    brute = compiled._evaluate_cheapest(num_apps)
+    np.testing.assert_array_equal(compiled.cheapest_many(num_apps), brute)
+    # 220,000 + 10 x 1,100 + 90 x 100 undercuts Mod 350's 245,000 base price
+    assert find_optimal_recommendations([300])['recommended_index'][0] == 4
+    assert compiled.cheapest_many([300])[0] == 3
+
+def test_invalid_pipelines_are_rejected():
+    with pytest.raises(ValueError):
+        compile_rules([GraduatedBands("Mod 200", ((400, 900),))])
+    with pytest.raises(ValueError):
+        compile_rules([AddOn("subtotal", rate=0.1)])
+    with pytest.raises(ValueError):
+        compile_rules([ContractTerm(2), ContractTerm(3)])
+    with pytest.raises(ValueError):
+        compile_rules([RISK_QUANTIFICATION]).quote_many([10], {'support': True})
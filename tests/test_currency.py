@@ -0,0 +1,34 @@
+"""Currency conversion of price books and mixed-currency batch quoting."""
+import numpy as np
+import pytest
+
+from pricing import PRICE_BOOK, PriceBook, Tier, calculate_prices, calculate_prices_by_currency, convert_price_book
+from pricing.currency import FxRates
+
+RATES = FxRates(base="EUR", rates=(("CHF", 0.95), ("GBP", 0.85), ("USD", 1.08)))
+
+def test_converted_books_are_cached_and_rounded_half_up():
+    book = convert_price_book(PRICE_BOOK, "GBP", RATES)
+    assert convert_price_book(PRICE_BOOK, "GBP", RATES) is book
+    assert book.currency == "GBP"
+    # 450 * 0.85 = 382.5
+    assert book[-1].price_per_app == 383
+    assert book[0].base_price_label == "£17,000"
+    assert convert_price_book(PRICE_BOOK, "EUR", RATES) is PRICE_BOOK
+
+def test_mixed_currency_batch_matches_per_currency_pricing():
+    rng = np.random.default_rng(7)
+    num_apps = rng.integers(1, 2500, 20_000)
+    risk = rng.random(num_apps.size) < 0.5
+    currencies = rng.choice(["EUR", "USD", "GBP", "CHF"], num_apps.size)
+    
+    mixed = calculate_prices_by_currency(num_apps, risk, currencies, rates=RATES)
+    for code in ("EUR", "USD", "GBP", "CHF"):
+        rows = currencies == code
+        expected = calculate_prices(num_apps[rows], risk[rows], convert_price_book(PRICE_BOOK, code, RATES))
+        for column in ('total_price', 'risk_premium', 'tier_index'):
+            np.testing.assert_array_equal(mixed[column][rows], expected[column], err_msg=f"{code} {column}")
+
+def test_price_book_rejects_mixed_currencies():
+    with pytest.raises(ValueError):
+        PriceBook((Tier("A", 1, 9, 100, 10, "EUR"), Tier("B", 10, float('inf'), 150, 5, "USD")))
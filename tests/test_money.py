@@ -0,0 +1,36 @@
+"""Exact integer-cent money mode against Decimal arithmetic and the float path."""
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from pricing import PRICE_BOOK, PriceBook, Tier, calculate_prices_cents, cross_check, format_cents
+from pricing.money import ROUNDING_MODES, divide_rounded, to_cents
+
+@pytest.mark.parametrize("rounding", ROUNDING_MODES)
+def test_divide_rounded_matches_decimal(rounding):
+    numerators = np.arange(-60, 61)
+    expected = [int((Decimal(int(value)) / 10).quantize(Decimal(1), rounding=rounding)) for value in numerators]
+    assert divide_rounded(numerators, 10, rounding).tolist() == expected
+
+def test_default_book_has_no_float_divergence():
+    num_apps = np.arange(1, 2001)
+    for risk in (False, True):
+        result = cross_check(num_apps, risk)
+        assert result.ok, result.summary()
+
+def test_premium_is_rounded_once_per_row():
+    # 0.30 * 0.05 EUR = 1.5 cents: half-up gives 2, half-even gives 2, floor gives 1
+    book = PriceBook((Tier("Cents", 1, float('inf'), 0.05, 0.0),))
+    totals = {rounding: calculate_prices_cents([1], True, book, rounding)['risk_premium'].item()
+              for rounding in ('ROUND_HALF_UP', 'ROUND_HALF_EVEN', 'ROUND_FLOOR')}
+    assert totals == {'ROUND_HALF_UP': 2, 'ROUND_HALF_EVEN': 2, 'ROUND_FLOOR': 1}
+
+def test_exact_totals_are_int64_cents():
+    prices = calculate_prices_cents(np.arange(1, 2001), True, PRICE_BOOK)
+    assert prices['total_price'].dtype == np.int64
+    assert format_cents(prices['total_price'][99]) == "€195,000.00"
+
+def test_sub_cent_prices_are_rejected():
+    with pytest.raises(ValueError):
+        to_cents([19.999])
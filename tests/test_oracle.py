@@ -0,0 +1,135 @@
+"""Correctness oracle: every app count from 1 to 2000, with and without risk quantification.
+
+The expected values in data/quote_oracle.csv are the outputs of the pricing core when
+the oracle was recorded. Any change to prices, tier selection or recommendations fails
+here; if a change is intended, re-record with PRICING_REGENERATE_ORACLE=1.
+
+The oracle was recorded after one intended change to the original page, listed in
+ORIGINAL_PAGE_DELTAS: counts below the first tier's minimum (1-9 AI systems) fell
+through the original linear scan to Mod 1000+ and paid its EUR 450,000 base; they
+are now priced on Mod Mini, the lowest tier, at its EUR 20,000 base. Every other
+row (3,982 of 4,000) equals the original page's output.
+"""
+import csv
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pricing import (
+    PRICE_BOOK,
+    QuoteTable,
+    calculate_price,
+    calculate_prices,
+    find_appropriate_tier,
+    find_optimal_recommendation,
+    find_optimal_recommendations,
+    price_components,
+)
+
+ORACLE_PATH = Path(__file__).parent / "data" / "quote_oracle.csv"
+MAX_APPS = 2000
+PRICE_FIELDS = ('total_price', 'base_cost', 'additional_cost', 'subtotal', 'risk_premium')
+FIELDS = ('num_apps', 'risk_quantification', 'tier') + PRICE_FIELDS + (
+    'recommended_tier', 'recommended_price', 'savings'
+)
+
+# (tier, subtotal) the original page gave every count below the first tier's minimum
+ORIGINAL_PAGE_DELTAS = {num_apps: ("Mod 1000+", 450000.0) for num_apps in range(1, 10)}
+
+def _current_rows():
+    rows = []
+    for risk in (False, True):
+        for num_apps in range(1, MAX_APPS + 1):
+            tier = find_appropriate_tier(num_apps)
+            price = calculate_price(num_apps, tier, risk)
+            recommendation = find_optimal_recommendation(num_apps, risk)
+            rows.append({
+                'num_apps': num_apps,
+                'risk_quantification': risk,
+                'tier': tier.name,
+                **{field: price[field] for field in PRICE_FIELDS},
+                'recommended_tier': recommendation['recommended_tier'].name if recommendation else '',
+                'recommended_price': recommendation['recommended_price'] if recommendation else '',
+                'savings': recommendation['savings'] if recommendation else 0.0
+            })
+    return rows
+
+def _parse(row):
+    parsed = dict(row)
+    parsed['num_apps'] = int(row['num_apps'])
+    parsed['risk_quantification'] = row['risk_quantification'] == 'True'
+    for field in PRICE_FIELDS + ('savings',):
+        parsed[field] = float(row[field])
+    parsed['recommended_price'] = float(row['recommended_price']) if row['recommended_price'] else ''
+    return parsed
+
+@pytest.fixture(scope="module")
+def oracle():
+    if os.environ.get("PRICING_REGENERATE_ORACLE") == "1":
+        with open(ORACLE_PATH, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.DictWriter(handle, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows({key: repr(value) if isinstance(value, float) else value
+                              for key, value in row.items()} for row in _current_rows())
+    with open(ORACLE_PATH, newline='', encoding='utf-8') as handle:
+        return [_parse(row) for row in csv.DictReader(handle)]
+
+def test_oracle_covers_every_count(oracle):
+    assert [(row['num_apps'], row['risk_quantification']) for row in oracle] == [
+        (num_apps, risk) for risk in (False, True) for num_apps in range(1, MAX_APPS + 1)
+    ]
+
+def test_oracle_differs_from_the_original_page_only_below_the_first_tier(oracle):
+    below_first_tier = [row for row in oracle if row['num_apps'] < PRICE_BOOK[0].min_apps]
+    assert sorted({row['num_apps'] for row in below_first_tier}) == sorted(ORIGINAL_PAGE_DELTAS)
+    for row in below_first_tier:
+        original_tier, original_subtotal = ORIGINAL_PAGE_DELTAS[row['num_apps']]
+        assert (row['tier'], row['subtotal']) == (PRICE_BOOK[0].name, float(PRICE_BOOK[0].base_price))
+        assert original_tier != row['tier'] and original_subtotal > row['subtotal']
+        assert row['recommended_tier'] == ''
+
+def test_scalar_quotes_match_oracle(oracle):
+    mismatches = [(expected, actual) for expected, actual in zip(oracle, _current_rows())
+                  if expected != actual]
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[0]}"
+
+@pytest.mark.parametrize("risk", [False, True])
+def test_batch_quotes_match_oracle(oracle, risk):
+    expected = [row for row in oracle if row['risk_quantification'] == risk]
+    num_apps = np.array([row['num_apps'] for row in expected])
+    prices = calculate_prices(num_apps, risk)
+    recommendations = find_optimal_recommendations(num_apps, risk)
+    tier_names = np.array([tier.name for tier in PRICE_BOOK])
+    
+    assert tier_names[prices['tier_index']].tolist() == [row['tier'] for row in expected]
+    for field in PRICE_FIELDS:
+        np.testing.assert_array_equal(prices[field], [row[field] for row in expected], err_msg=field)
+    np.testing.assert_array_equal(recommendations['savings'], [row['savings'] for row in expected])
+    assert np.where(recommendations['recommended'], tier_names[recommendations['recommended_index']], '').tolist() == [
+        row['recommended_tier'] for row in expected
+    ]
+
+@pytest.mark.parametrize("risk", [False, True])
+def test_quote_table_matches_oracle(oracle, risk):
+    table = QuoteTable.build(MAX_APPS, risk)
+    for expected in (row for row in oracle if row['risk_quantification'] == risk):
+        quote = table.lookup(expected['num_apps'])
+        recommendation = quote.recommendation
+        assert quote.tier.name == expected['tier']
+        assert {field: quote.price[field] for field in PRICE_FIELDS} == {
+            field: expected[field] for field in PRICE_FIELDS
+        }
+        assert (recommendation['recommended_tier'].name if recommendation else '') == expected['recommended_tier']
+        assert (recommendation['savings'] if recommendation else 0.0) == expected['savings']
+
+def test_scalar_fast_path_matches_the_vectorized_formula():
+    rng = np.random.default_rng(1)
+    for _ in range(500):
+        tier = PRICE_BOOK[int(rng.integers(len(PRICE_BOOK)))]
+        num_apps, risk = float(rng.integers(1, 3000)), bool(rng.random() < 0.5)
+        vectorized = price_components(num_apps, tier.min_apps, tier.base_price, tier.price_per_app, risk)
+        assert calculate_price(num_apps, tier, risk) == {
+            **{field: vectorized[field].item() for field in PRICE_FIELDS}, 'risk_enabled': risk
+        }
@@ -0,0 +1,70 @@
+"""Portfolio grouping against exhaustive search over every partition."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pricing import PRICE_BOOK, PriceBook, Tier, calculate_prices, quote_portfolio
+
+def _partitions(items):
+    if not items:
+        yield []
+        return
+    first, rest = items[0], items[1:]
+    for partition in _partitions(rest):
+        for i in range(len(partition)):
+            yield partition[:i] + [[first] + partition[i]] + partition[i + 1:]
+        yield [[first]] + partition
+
+def _cheapest_partition(counts, risk, price_book):
+    return min(
+        sum(calculate_prices(float(counts[group].sum()), risk, price_book)['total_price'] for group in partition)
+        for partition in _partitions(list(range(len(counts))))
+    )
+
+STEEP_BOOK = PriceBook((
+    Tier("Small", 1, 99, 1000, 10),
+    Tier("Medium", 100, 199, 60000, 50),
+    Tier("Large", 200, float('inf'), 50000, 80),
+))
+
+@pytest.mark.parametrize("price_book", [PRICE_BOOK, STEEP_BOOK], ids=["standard", "steep"])
+def test_grouping_matches_exhaustive_search(price_book):
+    rng = np.random.default_rng(21)
+    for _ in range(60):
+        counts = rng.integers(1, 150, rng.integers(1, 7))
+        risk = bool(rng.random() < 0.5)
+        quote = quote_portfolio(counts, risk, price_book)
+        assert quote.total_price == pytest.approx(_cheapest_partition(counts, risk, price_book))
+        assert quote.total_price <= min(quote.separate_total, quote.pooled_total) + 1e-6
+
+def test_large_portfolio_groups_every_entity_once():
+    counts = np.random.default_rng(4).integers(1, 400, 5000)
+    quote = quote_portfolio(counts, True)
+    assert sorted(np.concatenate(quote.groups()).tolist()) == list(range(counts.size))
+    assert quote.group_apps.sum() == counts.sum()
+    assert quote.total_price == pytest.approx(quote.pooled_total)
+
+def test_separate_licensing_wins_when_pooling_jumps_a_tier():
+    quote = quote_portfolio([60, 60], False, STEEP_BOOK)
+    assert len(quote.groups()) == 2
+    assert quote.savings == 0
+
+@pytest.mark.parametrize("price_book", [PRICE_BOOK, STEEP_BOOK], ids=["standard", "steep"])
+def test_heuristic_never_costs_more_than_separate_or_pooled(price_book):
+    rng = np.random.default_rng(8)
+    for _ in range(40):
+        counts = rng.integers(1, 300, rng.integers(7, 40))
+        quote = quote_portfolio(counts, bool(rng.random() < 0.5), price_book)
+        assert quote.total_price <= min(quote.separate_total, quote.pooled_total) + 1e-6
+
+def test_page_runs_the_portfolio_search_only_when_toggled_on():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    app = testing.AppTest.from_file(str(Path(__file__).resolve().parents[1] / "streamlit_app.py"),
+                                    default_timeout=60)
+    app.session_state["password_correct"] = True
+    app.run()
+    assert "Suggested Grouping" not in [metric.label for metric in app.metric]
+    app.toggle(key="portfolio_open").set_value(True).run()
+    assert not app.exception
+    assert "Suggested Grouping" in [metric.label for metric in app.metric]
@@ -0,0 +1,60 @@
+"""Render profiles hook the run's message queue only while their block runs."""
+from types import SimpleNamespace
+
+import pytest
+
+from ui import profiling
+from ui.profiling import ProfileRegistry, RenderProfile
+
+class Message:
+    def __init__(self, size):
+        self.size = size
+    
+    def ByteSize(self):
+        return self.size
+
+@pytest.fixture
+def context(monkeypatch):
+    sent = []
+    context = SimpleNamespace(_enqueue=sent.append, sent=sent)
+    monkeypatch.setattr(profiling, "get_script_run_ctx", lambda: context)
+    return context
+
+def test_profile_counts_bytes_per_section_and_unhooks(context):
+    original = context._enqueue
+    with RenderProfile(True, registry=ProfileRegistry()) as profile:
+        profile.mark("header")
+        context._enqueue(Message(10))
+        profile.mark("body")
+        context._enqueue(Message(5))
+        context._enqueue(Message(7))
+    assert context._enqueue is original
+    assert len(context.sent) == 3
+    assert profile.sections['header']['bytes'] == 10
+    assert profile.sections['body']['bytes'] == 12
+    assert profile.registry.runs == 1
+
+def test_interrupted_runs_unhook_and_record_nothing(context):
+    original = context._enqueue
+    registry = ProfileRegistry()
+    for _ in range(3):
+        # Streamlit ends a superseded or stopped run by raising out of the script
+        with pytest.raises(RuntimeError):
+            with RenderProfile(True, registry=registry) as profile:
+                profile.mark("body")
+                raise RuntimeError("rerun")
+        assert context._enqueue is original
+    assert registry.runs == 0
+    
+    with RenderProfile(True, registry=registry) as profile:
+        profile.mark("body")
+        context._enqueue(Message(4))
+    assert profile.sections['body']['bytes'] == 4
+    assert registry.runs == 1
+
+def test_disabled_profile_leaves_the_queue_alone(context):
+    original = context._enqueue
+    with RenderProfile(False) as profile:
+        assert context._enqueue is original
+        profile.mark("body")
+    assert profile.sections == {}
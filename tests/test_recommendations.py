@@ -0,0 +1,64 @@
+"""Cheapest-tier recommendations against exhaustive pricing of every eligible tier."""
+import numpy as np
+import pytest
+
+from pricing import PRICE_BOOK, PriceBook, Tier, find_optimal_recommendation, find_optimal_recommendations
+
+# Mod B's base price is above Mod C's, so counts near the top of Mod A jump straight to Mod C
+SKIP_BOOK = PriceBook((
+    Tier("Mod A", 1, 99, 1000, 500),
+    Tier("Mod B", 100, 199, 45000, 400),
+    Tier("Mod C", 200, float('inf'), 42000, 300),
+))
+
+def _exhaustive(num_apps, price_book):
+    """Cheapest price over every tier that can license each count (counts below min_apps pay the base)."""
+    prices = np.array([
+        np.where(num_apps <= tier.max_apps,
+                 tier.base_price + np.maximum(num_apps - tier.min_apps, 0) * tier.price_per_app, np.inf)
+        for tier in price_book
+    ])
+    return prices.min(axis=0)
+
+def _random_book(rng):
+    bounds = np.sort(rng.choice(np.arange(2, 1500), rng.integers(1, 7), replace=False))
+    mins = np.concatenate([[1], bounds])
+    maxes = np.concatenate([bounds - 1, [np.inf]])
+    return PriceBook(tuple(
+        Tier(f"Tier {i}", int(low), high if high == np.inf else int(high),
+             int(rng.integers(1, 400)) * 500, int(rng.integers(1, 60)) * 50)
+        for i, (low, high) in enumerate(zip(mins, maxes))
+    ))
+
+def _check(price_book, risk):
+    num_apps = np.arange(1, 2001, dtype=np.float64)
+    quotes = find_optimal_recommendations(num_apps, risk, price_book)
+    best = _exhaustive(num_apps, price_book) * (1.3 if risk else 1.0)
+    np.testing.assert_allclose(quotes['recommended_price'], best)
+    np.testing.assert_array_equal(quotes['recommended'], best < quotes['current_price'])
+    eligible = num_apps <= np.array([price_book[int(i)].max_apps for i in quotes['recommended_index']])
+    assert eligible.all()
+    for count in num_apps[::37]:
+        recommendation = find_optimal_recommendation(int(count), risk, price_book)
+        i = int(count) - 1
+        if quotes['recommended'][i]:
+            assert recommendation['recommended_price'] == pytest.approx(best[i])
+        else:
+            assert recommendation is None
+
+@pytest.mark.parametrize("risk", [False, True])
+@pytest.mark.parametrize("price_book", [PRICE_BOOK, SKIP_BOOK], ids=["standard", "skip"])
+def test_hand_built_books_match_exhaustive_search(price_book, risk):
+    _check(price_book, risk)
+
+def test_generated_books_match_exhaustive_search():
+    rng = np.random.default_rng(6)
+    for _ in range(40):
+        _check(_random_book(rng), bool(rng.random() < 0.5))
+
+def test_recommendation_can_skip_a_tier():
+    quotes = find_optimal_recommendations([80, 95, 150], False, SKIP_BOOK)
+    np.testing.assert_array_equal(quotes['tier_index'], [0, 0, 1])
+    np.testing.assert_array_equal(quotes['recommended'], [False, True, True])
+    assert quotes['recommended_index'][1] == 2
+    assert find_optimal_recommendation(95, False, SKIP_BOOK)['recommended_tier'].name == "Mod C"
@@ -0,0 +1,79 @@
+"""Quoting service exercised through a local asyncio HTTP client."""
+import asyncio
+import json
+
+from pricing import calculate_price, find_appropriate_tier, find_optimal_recommendation
+from pricing.service import QuoteService
+
+async def _request(host, port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    body = b'' if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(data)
+
+def _serve(client):
+    async def run():
+        service = QuoteService(max_delay=0.005)
+        host, port = await service.start('127.0.0.1', 0)
+        try:
+            return await client(service, host, port)
+        finally:
+            await service.close()
+    return asyncio.run(run())
+
+def test_concurrent_requests_are_batched_and_match_the_ui():
+    counts = list(range(1, 1201, 7))
+    
+    async def client(service, host, port):
+        responses = await asyncio.gather(*(
+            _request(host, port, 'POST', '/quote', {'num_apps': n, 'risk_quantification': n % 2 == 0})
+            for n in counts
+        ))
+        return responses, service.metrics()
+    
+    responses, metrics = _serve(client)
+    for n, (status, quote) in zip(counts, responses):
+        risk = n % 2 == 0
+        tier = find_appropriate_tier(n)
+        expected = calculate_price(n, tier, risk)
+        recommendation = find_optimal_recommendation(n, risk)
+        assert status == 200
+        assert quote['tier'] == tier.name
+        assert quote['total_price'] == expected['total_price']
+        assert quote['risk_premium'] == expected['risk_premium']
+        if recommendation is None:
+            assert quote['recommendation'] is None
+        else:
+            assert quote['recommendation']['recommended_tier'] == recommendation['recommended_tier'].name
+            assert quote['recommendation']['savings'] == recommendation['savings']
+            assert quote['recommendation']['reason'] == recommendation['reason']
+    assert metrics['quotes'] == len(counts)
+    assert metrics['batches'] < len(counts)
+    assert metrics['p50_ms'] <= metrics['p99_ms']
+
+def test_batch_request_keeps_order():
+    async def client(service, host, port):
+        return await _request(host, port, 'POST', '/quote', {'quotes': [
+            {'num_apps': 643, 'risk_quantification': True}, {'num_apps': 12}
+        ]})
+    
+    status, payload = _serve(client)
+    assert status == 200
+    assert [quote['num_apps'] for quote in payload['quotes']] == [643, 12]
+    assert [quote['risk_quantification'] for quote in payload['quotes']] == [True, False]
+
+def test_invalid_requests_get_json_errors():
+    async def client(service, host, port):
+        return [
+            await _request(host, port, 'POST', '/quote', {'num_apps': 0}),
+            await _request(host, port, 'POST', '/quote', {'num_apps': 5, 'risk_quantification': 'yes'}),
+            await _request(host, port, 'GET', '/quote'),
+            await _request(host, port, 'GET', '/nope'),
+        ]
+    
+    assert [status for status, _ in _serve(client)] == [400, 400, 405, 404]
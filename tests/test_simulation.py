@@ -0,0 +1,55 @@
+"""Monte Carlo revenue simulator against exact expectations over small populations."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pricing import PRICE_BOOK, Population, calculate_prices, scale_prices, simulate
+
+def test_empirical_population_matches_exact_expectation():
+    counts = np.array([10.0, 45.0, 100.0, 150.0, 700.0])
+    weights = np.array([4.0, 3.0, 2.0, 1.0, 1.0])
+    result = simulate(Population.empirical(counts, weights=weights), customers=400_000, seed=5,
+                      chunk_size=150_000)
+    
+    prices = calculate_prices(counts, False)
+    p = weights / weights.sum()
+    assert result.revenue.low <= np.dot(p, prices['total_price']) <= result.revenue.high
+    expected_mix = np.bincount(prices['tier_index'], p, len(PRICE_BOOK))
+    assert ((result.tier_mix.low <= expected_mix + 1e-12) & (expected_mix <= result.tier_mix.high + 1e-12)).all()
+    # 45, 150 and 700 are past the inflection points of Mod Mini (42.5), Mod 100 (146.7) and Mod 350 (642.9)
+    np.testing.assert_allclose(result.crossing_rate.mean[[0, 2, 4]], p[[1, 3, 4]], atol=0.005)
+    assert result.crossing_rate.mean[[1, 3, 5]].sum() == 0
+    assert result.demand.mean == 1.0
+
+def test_recorded_risk_flags_travel_with_their_counts():
+    result = simulate(Population.empirical([100.0, 100.0], risk=[True, False]), customers=100_000, seed=0)
+    premium, plain = calculate_prices([100.0, 100.0], [True, False])['total_price']
+    assert result.revenue.low <= (premium + plain) / 2 <= result.revenue.high
+
+def test_unit_elasticity_keeps_revenue_and_seed_repeats():
+    population = Population.lognormal(80, 0.8, risk_share=0.3)
+    current = simulate(population, customers=200_000, seed=9)
+    dearer = simulate(population, customers=200_000, price_book=scale_prices(PRICE_BOOK, 1.25), seed=9,
+                      elasticity=1.0, reference_book=PRICE_BOOK)
+    assert dearer.revenue.mean == pytest.approx(current.revenue.mean, rel=1e-12)
+    assert dearer.demand.mean == pytest.approx(0.8)
+    assert simulate(population, customers=200_000, seed=9).revenue == current.revenue
+
+def test_invalid_populations():
+    with pytest.raises(ValueError):
+        Population.lognormal(0, 1)
+    with pytest.raises(ValueError):
+        Population.empirical([0.0, 5.0])
+
+def test_page_samples_customers_only_while_the_toggle_is_on():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    app = testing.AppTest.from_file(str(Path(__file__).resolve().parents[1] / "streamlit_app.py"),
+                                    default_timeout=60)
+    app.session_state["password_correct"] = True
+    app.run()
+    assert [tab.label for tab in app.tabs] == ["Revenue Simulator", "Multi-entity Portfolio"]
+    assert "Expected Revenue per Customer" not in [metric.label for metric in app.metric]
+    app.toggle(key="simulator_on").set_value(True).run()
+    assert not app.exception
+    assert "Expected Revenue per Customer" in [metric.label for metric in app.metric]
@@ -0,0 +1,40 @@
+"""Price-book sweeps against aggregates computed directly on each variant's book."""
+import numpy as np
+import pytest
+
+from pricing import PRICE_BOOK, find_optimal_recommendations, run_sweep
+from pricing.sweep import apply_variant, expand_grid
+
+GRID = {
+    'Mod 50': {'price_per_app': [1500, 1700]},
+    'Mod 100': {'base_price': [140000, 150000, 170000]},
+}
+
+def _customers():
+    rng = np.random.default_rng(9)
+    num_apps = rng.integers(1, 1500, 3000).astype(np.float64)
+    return num_apps, rng.random(num_apps.size) < 0.4
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_sweep_matches_direct_pricing_of_every_variant(workers):
+    num_apps, risk = _customers()
+    result = run_sweep(num_apps, risk, GRID, workers=workers, variants_per_task=2)
+    assert result.parameters == expand_grid(GRID)
+    assert result.customers == num_apps.size
+    assert result.tier_names == tuple(tier.name for tier in PRICE_BOOK)
+    for i, variant in enumerate(result.parameters):
+        book = apply_variant(PRICE_BOOK, variant)
+        quotes = find_optimal_recommendations(num_apps, risk, book)
+        assert result.revenue[i] == pytest.approx(quotes['current_price'].sum())
+        np.testing.assert_allclose(result.tier_mix[i],
+                                   np.bincount(quotes['tier_index'], minlength=len(book)) / num_apps.size)
+        assert result.recommendation_rate[i] == pytest.approx(quotes['recommended'].mean())
+
+def test_sweep_rejects_bad_grids_and_empty_customer_bases():
+    num_apps, risk = _customers()
+    with pytest.raises(ValueError, match="Unknown tier"):
+        run_sweep(num_apps, risk, {'Mod 75': {'base_price': [1]}}, workers=2)
+    with pytest.raises(ValueError, match="Cannot sweep"):
+        run_sweep(num_apps, risk, {'Mod 50': {'name': ["x"]}}, workers=2)
+    with pytest.raises(ValueError, match="at least one customer"):
+        run_sweep(np.array([]), False, GRID, workers=0)
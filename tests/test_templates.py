@@ -0,0 +1,40 @@
+"""Pre-compiled quote card templates and their shared LRU."""
+import pytest
+
+from pricing import PRICE_BOOK, PRICING_TIERS, PriceBook, convert_price_book
+from ui.templates import HtmlTemplate, render_quote_cards
+
+def test_template_renders_plain_fields_only():
+    assert HtmlTemplate("<b>{name}</b> {{literal}}").render(name="Mod 50") == "<b>Mod 50</b> {literal}"
+    with pytest.raises(ValueError):
+        HtmlTemplate("{price:,.0f}")
+
+def test_cards_follow_the_risk_flag():
+    plain = render_quote_cards(100, False, PRICE_BOOK)
+    risk = render_quote_cards(100, True, PRICE_BOOK)
+    assert plain.stats.count('class="stat-box"') == 2
+    assert risk.stats.count('class="stat-box"') == 4
+    assert "Risk Premium Total" in risk.stats and "Risk Premium Total" not in plain.stats
+    assert plain.breakdown.count('class="simple-item"') == 2
+    assert risk.breakdown.count('class="simple-item"') == 4
+    assert "Enabled (+30%)" in risk.highlight and "Enabled" not in plain.highlight
+    assert "Optimal Configuration" in plain.recommendation
+    assert "Optimization Opportunity" in render_quote_cards(49, False, PRICE_BOOK).recommendation
+
+def test_cards_are_memoized_per_book_count_and_flag():
+    render_quote_cards.cache_clear()
+    first = render_quote_cards(200, False, PRICE_BOOK)
+    assert render_quote_cards(200, False, PRICE_BOOK) is first
+    assert render_quote_cards.cache_info().hits == 1
+    usd = render_quote_cards(200, False, convert_price_book(PRICE_BOOK, "USD"))
+    assert usd is not first and "$" in usd.highlight
+
+def test_book_supplied_strings_are_escaped():
+    book = PriceBook.from_dicts([dict(tier, name=f"<i>{tier['name']}</i> & co") for tier in PRICING_TIERS])
+    cards = render_quote_cards(49, True, book)
+    html = cards.highlight + cards.stats + cards.recommendation + cards.breakdown
+    assert "<i>" not in html
+    assert "&lt;i&gt;Mod Mini&lt;/i&gt; &amp; co" in cards.highlight
+    assert "&lt;i&gt;Mod 50&lt;/i&gt;" in cards.recommendation
+    # Markup from the templates themselves is kept
+    assert 'class="stat-box"' in cards.stats and "Enabled (+30%)</p>" in cards.highlight
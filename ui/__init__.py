@@ -0,0 +1 @@
+"""Streamlit UI helpers for streamlit_app.py; the pricing logic lives in pricing."""
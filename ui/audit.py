@@ -0,0 +1,18 @@
+"""Append every quote the page computes to the process-wide quote audit log."""
+from pricing import PriceBook, QuoteRow, default_audit_log
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+def record_quote(quote: QuoteRow, risk_quantification: bool, price_book: PriceBook, user: str = ""):
+    """Queue ``quote`` for the audit log; the write happens on the log's writer thread."""
+    log = default_audit_log()
+    if log is None:
+        return
+    context = get_script_run_ctx() if get_script_run_ctx is not None else None
+    price = quote.price
+    log.record(quote.num_apps, risk_quantification, quote.tier_index, price['subtotal'],
+               price['risk_premium'], price['total_price'], price_book, user=user,
+               session=context.session_id if context is not None else "")
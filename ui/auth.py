@@ -0,0 +1,229 @@
+"""Password gate for the Streamlit page: hashed credentials and throttled attempts.
+
+Credentials are PBKDF2-SHA256 hashes in the ``pbkdf2_sha256$iterations$salt$hash``
+format (base64 salt and hash). They are read from ``st.secrets``::
+
+    [auth]
+    password_hash = "pbkdf2_sha256$600000$..."      # shared password, no username
+
+    [auth.users]
+    alice = "pbkdf2_sha256$600000$..."              # named users; adds a Username field
+
+or from the PRICING_PASSWORD_HASH and PRICING_USERS (``name=hash,name=hash``)
+environment variables. Without any of them the login is disabled and the page
+shows a configuration error. Generate a hash with ``python -m ui.auth``.
+
+Every attempt first takes a token from the bucket of its client IP, or from one
+global bucket when Streamlit does not report the IP, and then one from its
+session's bucket. An empty bucket rejects the attempt before the password is
+hashed, and the page stops before any pricing module is imported. At most
+MAX_CONCURRENT_VERIFICATIONS hashes run at once in the process; an attempt that
+finds every slot busy is rejected as throttled instead of queueing, so a storm
+spread over many IPs costs at most that many cores.
+"""
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import streamlit as st
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+LOGGER = logging.getLogger(__name__)
+
+ALGORITHM = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 600_000
+
+# Burst of attempts allowed per session / per client IP / for all clients without
+# a known IP, then one more every REFILL_SECONDS
+SESSION_ATTEMPTS = 5
+IP_ATTEMPTS = 20
+GLOBAL_ATTEMPTS = 50
+REFILL_SECONDS = 30.0
+MAX_TRACKED_KEYS = 10_000
+# Each verification is a 600k-iteration PBKDF2 on a script thread
+MAX_CONCURRENT_VERIFICATIONS = 2
+
+def hash_password(password: str, salt: Optional[bytes] = None, iterations: int = DEFAULT_ITERATIONS) -> str:
+    """Encode ``password`` as ``pbkdf2_sha256$iterations$salt$hash`` with a random 16-byte salt."""
+    salt = os.urandom(16) if salt is None else salt
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${base64.b64encode(salt).decode()}${base64.b64encode(digest).decode()}"
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Check ``password`` against an encoded hash in constant time; malformed hashes never match."""
+    try:
+        algorithm, iterations, salt, expected = encoded.split("$")
+        if algorithm != ALGORITHM:
+            return False
+        salt, expected = base64.b64decode(salt), base64.b64decode(expected)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, int(iterations))
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(digest, expected)
+
+def _secrets_auth() -> Dict:
+    try:
+        return dict(st.secrets.get("auth", {}))
+    except Exception:
+        # No secrets.toml at all
+        return {}
+
+def load_credentials() -> Tuple[Optional[str], Dict[str, str]]:
+    """The shared password hash (or None) and the named users' hashes; both empty when unconfigured."""
+    auth = _secrets_auth()
+    users = {str(name): str(encoded) for name, encoded in dict(auth.get("users", {})).items()}
+    for entry in filter(None, os.environ.get("PRICING_USERS", "").split(",")):
+        name, _, encoded = entry.partition("=")
+        users[name.strip()] = encoded.strip()
+    shared = auth.get("password_hash") or os.environ.get("PRICING_PASSWORD_HASH") or None
+    return shared, users
+
+class TokenBucket:
+    """``capacity`` attempts at once, refilled continuously at ``rate`` per second."""
+    
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+class AttemptThrottle:
+    """Process-wide token buckets per session, per client IP and for clients without an IP."""
+    
+    def __init__(self, session_attempts: float = SESSION_ATTEMPTS, ip_attempts: float = IP_ATTEMPTS,
+                 refill_seconds: float = REFILL_SECONDS, max_keys: int = MAX_TRACKED_KEYS,
+                 global_attempts: float = GLOBAL_ATTEMPTS):
+        self.limits = {'session': session_attempts, 'ip': ip_attempts, 'global': global_attempts}
+        self.rate = 1 / refill_seconds
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _bucket(self, kind: str, key: str) -> TokenBucket:
+        bucket = self._buckets.get((kind, key))
+        if bucket is None:
+            bucket = self._buckets[(kind, key)] = TokenBucket(self.limits[kind], self.rate)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end((kind, key))
+        return bucket
+    
+    def allow(self, session: str, ip: Optional[str] = None) -> bool:
+        """Take one attempt for the client, then for the session; False if either is exhausted.
+        
+        A new browser session starts with a full session bucket, so the IP bucket
+        (or the global one when the IP is unknown) is what bounds a scripted client.
+        It is checked first, and a rejected attempt does not spend a session token.
+        """
+        now = time.monotonic()
+        with self._lock:
+            client = self._bucket('ip', ip) if ip else self._bucket('global', "")
+            return client.take(now) and self._bucket('session', session).take(now)
+
+THROTTLE = AttemptThrottle()
+VERIFICATION_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_VERIFICATIONS)
+
+def _client() -> Tuple[str, Optional[str]]:
+    context = get_script_run_ctx() if get_script_run_ctx is not None else None
+    session = context.session_id if context is not None else ""
+    # st.context.ip_address exists from Streamlit 1.45
+    ip = getattr(getattr(st, "context", None), "ip_address", None)
+    return session, ip
+
+def _reject_throttled(ip: Optional[str]):
+    st.session_state["password_correct"] = False
+    st.session_state["auth_throttled"] = True
+    del st.session_state["password"]
+    LOGGER.warning("Throttled login attempt from %s", ip or "unknown IP")
+
+def _password_entered():
+    session, ip = _client()
+    if not THROTTLE.allow(session, ip):
+        _reject_throttled(ip)
+        return
+    st.session_state["auth_throttled"] = False
+    shared, users = load_credentials()
+    if shared is None and not users:
+        st.session_state["password_correct"] = False
+        del st.session_state["password"]
+        return
+    if not VERIFICATION_SLOTS.acquire(blocking=False):
+        _reject_throttled(ip)
+        return
+    password = st.session_state.pop("password")
+    username = st.session_state.get("username", "").strip()
+    if username:
+        encoded, user = users.get(username), username
+    else:
+        encoded, user = shared, ""
+    # Hash against a configured hash even for unknown users, so the response time
+    # does not reveal which names exist
+    decoy = encoded or shared or next(iter(users.values()))
+    try:
+        correct = verify_password(password, decoy) and encoded is not None
+    finally:
+        VERIFICATION_SLOTS.release()
+    st.session_state["password_correct"] = correct
+    if correct:
+        st.session_state["auth_user"] = user
+
+def _render_login(named_users: bool):
+    st.markdown("""
+    <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; margin: 2rem 0;">
+        <h1 style="color: white; font-size: 3rem; margin-bottom: 1rem;">Modulos AI GRC</h1>
+        <h3 style="color: white; opacity: 0.9; font-weight: 300;">Premium Pricing Calculator</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    if named_users:
+        st.text_input("Username", key="username", placeholder="Leave empty for the shared password")
+    st.text_input("Enter Password", type="password", on_change=_password_entered, key="password",
+                  placeholder="Enter your access credentials")
+    if "password_correct" not in st.session_state:
+        st.markdown("*Please enter password to access the Modulos AI GRC pricing calculator*")
+    elif st.session_state.get("auth_throttled"):
+        st.error("Too many attempts. Please wait a minute and try again.")
+    else:
+        st.error("Password incorrect. Please try again.")
+    st.info("Contact your Modulos AI representative for access credentials")
+
+def check_password() -> bool:
+    """True once this session has logged in; otherwise render the login form."""
+    if st.session_state.get("password_correct"):
+        return True
+    shared, users = load_credentials()
+    if shared is None and not users:
+        LOGGER.error("No password hash configured; set [auth] in secrets or PRICING_PASSWORD_HASH")
+        st.error("Login is not configured. Set `password_hash` under `[auth]` in .streamlit/secrets.toml "
+                 "or the PRICING_PASSWORD_HASH environment variable; generate a hash with "
+                 "`python -m ui.auth`.")
+        return False
+    _render_login(bool(users))
+    return False
+
+def current_user() -> str:
+    """Name of the logged-in user; empty for the shared password."""
+    return st.session_state.get("auth_user", "")
+
+if __name__ == "__main__":
+    import getpass
+    
+    print(hash_password(getpass.getpass("Password to hash: ")))
@@ -0,0 +1,160 @@
+"""Plotly pricing chart for the Streamlit page.
+
+Every tier's price is linear in the number of AI systems, so each tier line is
+drawn exactly from its two segment endpoints instead of sampled points. The
+figure, with an empty selection marker, is built and validated once per (price
+book, risk flag) and cached for every session. Each session copies it once into
+its session state; a rerun only moves the marker of that copy, and Streamlit
+serializes the finished figure as is.
+"""
+import streamlit as st
+
+from pricing import PRICE_BOOK, PriceBook, calculate_price, price_components
+from pricing.model import currency_symbol
+
+# Try importing plotly, fall back if not available
+try:
+    import plotly.graph_objects as go
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+# Using your color palette
+CHART_COLOR_PALETTE = ['#667eea', '#764ba2', '#e74c3c', '#27ae60', '#f39c12', '#8b5cf6']
+CHART_MAX_APPS = 1500
+SESSION_CHART_KEY = "_pricing_chart"
+
+def _build_base_chart(price_book: PriceBook, risk_quantification: bool = False) -> "go.Figure":
+    """Build the pricing chart with an empty "Your Selection" marker as its last trace."""
+    fig = go.Figure()
+    symbol = currency_symbol(price_book.currency)
+    
+    # Add lines for each tier
+    for i, tier in enumerate(price_book):
+        if tier.is_open_ended:
+            max_range = CHART_MAX_APPS
+        else:
+            max_range = min(tier.max_apps, CHART_MAX_APPS)
+        
+        # A straight segment: its endpoints are the whole line (one point if it is a single count)
+        tier_apps = sorted({tier.min_apps, max_range}) if max_range >= tier.min_apps else []
+        tier_prices = price_components(tier_apps, tier.min_apps, tier.base_price,
+                                       tier.price_per_app, risk_quantification)['total_price']
+        
+        line_name = f"{tier.name}" + (" + Risk Q" if risk_quantification else "")
+        
+        fig.add_trace(go.Scatter(
+            x=tier_apps,
+            y=tier_prices,
+            mode='lines+markers',
+            name=line_name,
+            line=dict(color=CHART_COLOR_PALETTE[i % len(CHART_COLOR_PALETTE)], width=3),
+            marker=dict(size=6),
+            hovertemplate=f'<b>{tier.name}</b><br>' +
+                         'AI Systems: %{x}<br>' +
+                         f'Price: {symbol}%{{y:,.0f}}' +
+                         ('<br><i>Risk Quantification: +30%</i>' if risk_quantification else '') +
+                         '<extra></extra>'
+        ))
+    
+    # Add inflection points
+    for tier in price_book:
+        if tier.inflection_point and tier.inflection_point <= CHART_MAX_APPS:
+            fig.add_vline(
+                x=tier.inflection_point, 
+                line_dash="dash", 
+                line_color="orange", 
+                opacity=0.7,
+                annotation_text=f"{tier.name} Optimization Point"
+            )
+    
+    # Moved to the selection on every rerun
+    fig.add_trace(go.Scatter(
+        x=[],
+        y=[],
+        mode='markers',
+        marker=dict(size=20, color='#e74c3c', symbol='diamond'),
+        name='Your Selection'
+    ))
+    
+    chart_title = '<b>Modulos AI GRC Pricing Structure</b><br><sub>Interactive Pricing Across All Tiers'
+    if risk_quantification:
+        chart_title += ' (with Risk Quantification +30%)'
+    chart_title += '</sub>'
+    
+    fig.update_layout(
+        title={
+            'text': chart_title,
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'family': 'Inter', 'size': 20}
+        },
+        xaxis_title='Number of AI Systems',
+        yaxis_title=f'Investment ({price_book.currency})',
+        height=600,
+        showlegend=True,
+        template="plotly_white",
+        hovermode='closest',
+        plot_bgcolor='rgba(248, 250, 254, 0.8)',
+        paper_bgcolor='rgba(255, 255, 255, 0.0)',
+        font=dict(family="Inter, sans-serif", size=12),
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=-0.15,
+            xanchor='center',
+            x=0.5,
+            font=dict(size=12, family='Inter', color='#475569'),
+            bgcolor='rgba(255,255,255,0.9)',
+            bordercolor='rgba(148, 163, 184, 0.2)',
+            borderwidth=1
+        )
+    )
+    
+    return fig
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def build_base_pricing_chart(_price_book: PriceBook, price_book_fingerprint: str,
+                             risk_quantification: bool = False) -> "go.Figure":
+    """Cached _build_base_chart, shared across sessions per (price book, risk flag).
+    
+    The price book is keyed by its fingerprint. The shared figure is never
+    modified; sessions draw on copies of it.
+    """
+    return _build_base_chart(_price_book, risk_quantification)
+
+def _session_chart(price_book: PriceBook, risk_quantification: bool) -> "go.Figure":
+    key = (price_book.fingerprint, risk_quantification)
+    cached = st.session_state.get(SESSION_CHART_KEY)
+    if cached is None or cached[0] != key:
+        base = build_base_pricing_chart(price_book, price_book.fingerprint, risk_quantification)
+        # This session's own copy, since reruns move its marker in place
+        cached = st.session_state[SESSION_CHART_KEY] = (key, go.Figure(base))
+    return cached[1]
+
+def create_pricing_chart(num_apps: int, risk_quantification: bool = False,
+                         price_book: PriceBook = PRICE_BOOK):
+    """Create an interactive pricing chart matching your style."""
+    
+    if not PLOTLY_AVAILABLE:
+        st.info("📊 Interactive charts require Plotly installation. The calculator works perfectly without charts!")
+        return None
+    
+    fig = _session_chart(price_book, risk_quantification)
+    
+    # Move the selection marker
+    current_tier = price_book.index.locate(num_apps)[1]
+    current_result = calculate_price(num_apps, current_tier, risk_quantification)
+    current_price = current_result['total_price']
+    
+    fig.data[-1].update(
+        x=[num_apps],
+        y=[current_price],
+        hovertemplate=f'<b>Your Configuration</b><br>' +
+                      f'AI Systems: {num_apps}<br>' +
+                      f'Price: {price_book.format_price(current_price)}<br>' +
+                      f'Tier: {current_tier.name}' +
+                      ('<br><i>Risk Quantification: Enabled</i>' if risk_quantification else '') +
+                      '<extra></extra>'
+    )
+    return fig
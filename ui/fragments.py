@@ -0,0 +1,9 @@
+"""Fragment-scoped reruns, with fallbacks for Streamlit releases that lack st.fragment."""
+import streamlit as st
+
+def _full_rerun(func):
+    return func
+
+# st.fragment (1.37+), st.experimental_fragment (1.33-1.36), otherwise plain full reruns
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or _full_rerun
+FRAGMENTS_AVAILABLE = fragment is not _full_rerun
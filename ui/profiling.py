@@ -0,0 +1,193 @@
+"""Opt-in per-section render timing and payload accounting for the Streamlit page.
+
+Enable with ``?profile=1`` in the page URL or ``PRICING_PROFILE=1`` in the server
+environment. Each rerun is split into named sections with ``RenderProfile.mark``;
+for every section the profile records wall time and the bytes of the ForwardMsg
+protobufs Streamlit enqueued for the browser while it was open. Finished runs are
+logged as one JSON line on the ``pricing.profiling`` logger, aggregated across
+sessions for a Prometheus-style text dump, and shown in a debug sidebar panel.
+When profiling is off every call returns immediately.
+
+A profile is a context manager: ``with start_profile() as profile:`` around a
+script or fragment body. Byte counting hooks the run's message queue on entry and
+always unhooks it on exit, including when Streamlit cuts the run short with a
+rerun or stop exception, so hooks never outlive their run or pile up. Only a
+run that completes is recorded and shown.
+
+A fragment-only rerun skips the page script, so a fragment body starts and
+finishes a profile of its own (``start_profile("fragment")``) with its own panel.
+During a full run the page profile sees the whole fragment as one section.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+LOGGER = logging.getLogger("pricing.profiling")
+METRIC_PREFIX = "pricing_render"
+
+class ProfileRegistry:
+    """Process-wide per-section totals over every profiled rerun, for export."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self._totals: Dict[Tuple[str, str], Dict[str, float]] = {}
+    
+    def add(self, scope: str, sections: Dict[str, Dict[str, float]]):
+        with self._lock:
+            self.runs += 1
+            for name, sample in sections.items():
+                totals = self._totals.setdefault((scope, name), {'count': 0, 'seconds': 0.0, 'bytes': 0})
+                totals['count'] += 1
+                totals['seconds'] += sample['seconds']
+                totals['bytes'] += sample['bytes']
+    
+    def prometheus_text(self) -> str:
+        """Render the totals in the Prometheus text exposition format."""
+        with self._lock:
+            totals = {name: dict(values) for name, values in self._totals.items()}
+            runs = self.runs
+        lines = [
+            f"# HELP {METRIC_PREFIX}_runs_total Profiled page and fragment runs.",
+            f"# TYPE {METRIC_PREFIX}_runs_total counter",
+            f"{METRIC_PREFIX}_runs_total {runs}",
+        ]
+        metrics = (
+            ('section_seconds', 'summary', "Wall time per page section.", 'seconds'),
+            ('section_bytes', 'summary', "ForwardMsg bytes sent to the browser per page section.", 'bytes'),
+        )
+        for metric, kind, help_text, key in metrics:
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (scope, section), values in totals.items():
+                labels = f'scope="{scope}",section="{section}"'
+                lines.append(f'{name}_sum{{{labels}}} {values[key]}')
+                lines.append(f'{name}_count{{{labels}}} {values["count"]}')
+        return "\n".join(lines) + "\n"
+
+REGISTRY = ProfileRegistry()
+
+class RenderProfile:
+    """Timings and payload bytes of the sections of one script run."""
+    
+    def __init__(self, enabled: bool, scope: str = "page", registry: ProfileRegistry = REGISTRY):
+        self.enabled = enabled
+        self.scope = scope
+        self.registry = registry
+        self.finished = False
+        self.sections: Dict[str, Dict[str, float]] = {}
+        self._current: Optional[str] = None
+        self._started = time.perf_counter()
+        self._section_started = self._started
+        self._context = None
+        self._enqueue = None
+        self.panel = None
+        if enabled:
+            # Claimed at the start so the panel keeps its place on fragment reruns
+            self.panel = st.sidebar.empty()
+    
+    def __enter__(self) -> "RenderProfile":
+        if self.enabled:
+            self._attach()
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if exc_type is None:
+            self.finish()
+        else:
+            # RerunException/StopException end the run early: unhook, record nothing
+            self._detach()
+        return False
+    
+    def _attach(self):
+        # Streamlit has no public hook for outgoing messages, so wrap the run's
+        # enqueue function; _detach puts the original back
+        context = get_script_run_ctx() if get_script_run_ctx is not None else None
+        if context is None:
+            return
+        enqueue = context._enqueue
+        
+        def counting_enqueue(msg):
+            if self._current is not None:
+                self.sections[self._current]['bytes'] += msg.ByteSize()
+            enqueue(msg)
+        
+        self._context, self._enqueue = context, enqueue
+        context._enqueue = counting_enqueue
+    
+    def _detach(self):
+        if self._context is not None:
+            self._context._enqueue = self._enqueue
+            self._context = None
+    
+    def _close_section(self, now: float):
+        if self._current is not None:
+            self.sections[self._current]['seconds'] += now - self._section_started
+        self._current = None
+    
+    def mark(self, name: str):
+        """Start timing section ``name``; the previous section ends here."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._close_section(now)
+        self.sections.setdefault(name, {'seconds': 0.0, 'bytes': 0})
+        self._current = name
+        self._section_started = now
+    
+    def finish(self) -> Optional[Dict]:
+        """Close the run, record and log it, and render the debug sidebar panel."""
+        if not self.enabled or self.finished:
+            return None
+        self.finished = True
+        self._close_section(time.perf_counter())
+        self._detach()
+        run = {
+            'event': 'render_profile',
+            'scope': self.scope,
+            'run_seconds': time.perf_counter() - self._started,
+            'total_bytes': sum(sample['bytes'] for sample in self.sections.values()),
+            'sections': self.sections
+        }
+        self.registry.add(self.scope, self.sections)
+        LOGGER.info(json.dumps(run))
+        render_debug_sidebar(run, self.registry, self.panel)
+        return run
+
+def profiling_requested() -> bool:
+    """True when the URL has ``?profile=1`` or the environment sets PRICING_PROFILE=1."""
+    if os.environ.get("PRICING_PROFILE") == "1":
+        return True
+    try:
+        return st.query_params.get("profile") == "1"
+    except Exception:
+        return False
+
+def start_profile(scope: str = "page") -> RenderProfile:
+    """Profile this run of ``scope`` if requested, otherwise a no-op; use it as a context manager."""
+    return RenderProfile(profiling_requested(), scope)
+
+def _section_rows(sections: Dict[str, Dict[str, float]]) -> List[Dict]:
+    return [{'Section': name, 'ms': round(sample['seconds'] * 1000, 2), 'Bytes': int(sample['bytes'])}
+            for name, sample in sections.items()]
+
+def render_debug_sidebar(run: Dict, registry: ProfileRegistry = REGISTRY, panel=None):
+    """Show the last run's section table and the aggregated export in the sidebar."""
+    with (panel if panel is not None else st.sidebar.empty()).container():
+        st.markdown(f"### Render profile: {run['scope']}")
+        st.caption(f"Last run: {run['run_seconds'] * 1000:.1f} ms, {run['total_bytes']:,} bytes "
+                   f"to the browser ({registry.runs} profiled runs in this process)")
+        st.dataframe(_section_rows(run['sections']), hide_index=True, use_container_width=True)
+        with st.expander("Prometheus export"):
+            st.code(registry.prometheus_text(), language="text")
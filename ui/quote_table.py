@@ -0,0 +1,21 @@
+"""Session-shared precomputed quote tables for the Streamlit page."""
+import streamlit as st
+
+from pricing import PRICE_BOOK, PriceBook, QuoteRow, QuoteTable
+
+# Upper bound of the page's "Number of AI Systems" input
+MAX_APPS = 2000
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def load_quote_table(_price_book: PriceBook, price_book_fingerprint: str,
+                     risk_quantification: bool = False, max_apps: int = MAX_APPS) -> QuoteTable:
+    """Build the quote table once per (price book, risk flag) and share it across sessions.
+    
+    The price book is keyed by its fingerprint, so editing the tiers builds a new table.
+    """
+    return QuoteTable.build(max_apps, risk_quantification, _price_book)
+
+def lookup_quote(num_apps: int, risk_quantification: bool = False,
+                 price_book: PriceBook = PRICE_BOOK) -> QuoteRow:
+    """Fetch the precomputed quote row for the current selection."""
+    return load_quote_table(price_book, price_book.fingerprint, risk_quantification).lookup(num_apps)
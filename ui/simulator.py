@@ -0,0 +1,40 @@
+"""Session-shared Monte Carlo runs for the page's revenue simulator tab."""
+import hashlib
+import io
+
+import pandas as pd
+import streamlit as st
+
+from pricing import PriceBook, Population, SimulationResult, scale_prices, simulate
+from pricing.batch import as_risk_flags
+
+# Same seed for every run, so what-if prices are compared on the same sampled customers
+SEED = 2025
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _run(_price_book: PriceBook, price_book_fingerprint: str, _population: Population, population_key: tuple,
+         customers: int, price_change: float, elasticity: float) -> SimulationResult:
+    book = scale_prices(_price_book, 1 + price_change) if price_change else _price_book
+    return simulate(_population, customers, book, seed=SEED, elasticity=elasticity, reference_book=_price_book)
+
+def run_lognormal(price_book: PriceBook, median: float, sigma: float, risk_share: float, customers: int,
+                  price_change: float = 0.0, elasticity: float = 0.0) -> SimulationResult:
+    """Simulate a lognormal population once per set of inputs and share the result across sessions."""
+    population = Population.lognormal(median, sigma, risk_share)
+    return _run(price_book, price_book.fingerprint, population, ('lognormal', median, sigma, risk_share),
+                customers, price_change, elasticity)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_uploaded(_data: bytes, digest: str, risk_share: float) -> Population:
+    frame = pd.read_csv(io.BytesIO(_data))
+    risk = as_risk_flags(frame['risk_quantification'].to_numpy()) if 'risk_quantification' in frame else None
+    return Population.empirical(pd.to_numeric(frame['num_apps'], errors='coerce').to_numpy(), risk,
+                                risk_share=risk_share)
+
+def run_uploaded(price_book: PriceBook, data: bytes, risk_share: float, customers: int,
+                 price_change: float = 0.0, elasticity: float = 0.0) -> SimulationResult:
+    """Simulate by resampling an uploaded customer CSV; the file is keyed by its content digest."""
+    digest = hashlib.sha256(data).hexdigest()
+    population = _load_uploaded(data, digest, risk_share)
+    return _run(price_book, price_book.fingerprint, population, ('file', digest, risk_share),
+                customers, price_change, elasticity)
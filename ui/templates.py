@@ -0,0 +1,157 @@
+"""Pre-compiled HTML for the quote cards, memoized per (price book, app count, risk flag).
+
+Each card is a template parsed once at import into literal text and field
+names. Risk and non-risk variants share one template and differ only in the rows
+they fill in. Rendered cards are kept in a bounded, process-wide LRU, so popular
+selections such as 50, 100 or 200 AI systems are formatted once for every session.
+
+Tier names and labels come from price-book files and the cards are shown with
+``unsafe_allow_html``, so every value is HTML-escaped unless it is ``Html``
+produced by another template.
+"""
+import html
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Iterable, Tuple
+
+from pricing import PriceBook
+from ui.quote_table import lookup_quote
+
+RENDER_CACHE_SIZE = 1024
+
+class Html(str):
+    """Markup inserted into a template as is; any other value is escaped."""
+
+def _escape(value) -> str:
+    # Fields only ever sit in element text, never in attributes, so quotes stay as they are
+    return value if isinstance(value, Html) else html.escape(str(value), quote=False)
+
+class HtmlTemplate:
+    """A ``{field}`` template split once into (literal, field) parts; values are pre-formatted strings."""
+    
+    def __init__(self, source: str):
+        self.source = source
+        self._parts = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Format {field!r} before rendering; templates take plain fields")
+            self._parts.append((literal, field))
+    
+    def render(self, **values) -> Html:
+        return Html("".join(literal if field is None else literal + _escape(values[field])
+                            for literal, field in self._parts))
+
+HIGHLIGHT = HtmlTemplate("""
+        <div class="premium-card highlight-card">
+            <h3>Investment Analysis for {num_apps} AI Systems</h3>
+            <h2 style="font-size: 2.5rem; margin: 1rem 0;">{total}</h2>
+            <p style="font-size: 1.2rem;">Selected Tier: {tier}</p>
+            {risk_line}
+        </div>
+        """)
+RISK_LINE = Html('<p style="font-size: 1rem; opacity: 0.9;">Risk Quantification: Enabled (+30%)</p>')
+
+STATS = HtmlTemplate("""
+            <div class="stats-container">
+{boxes}
+            </div>
+            """)
+STAT_BOX = HtmlTemplate("""                <div class="stat-box">
+                    <div class="stat-value">{value}</div>
+                    <div class="stat-label">{label}</div>
+                </div>""")
+
+OPTIMIZATION_ALERT = HtmlTemplate("""
+        <div class="optimization-alert">
+            <h4 style="color: #c0392b; margin-bottom: 1rem;">⚠️ Optimization Opportunity Detected</h4>
+            <p><strong>{reason}</strong></p>
+            <div style="margin-top: 1rem;">
+                <p>• Current Configuration: {current_price}</p>
+                <p>• Recommended Tier: {recommended_tier} - {recommended_price}</p>
+                <p style="color: #c0392b; font-weight: 600;">• Potential Savings: {savings}</p>
+            </div>
+        </div>
+        """)
+OPTIMAL_BADGE = HtmlTemplate("""
+        <div class="optimal-badge">
+            <h4 style="color: #229954; margin-bottom: 1rem;">✅ Optimal Configuration</h4>
+            <p>You're getting the best value with the <strong>{tier}</strong> tier for {num_apps} AI systems!</p>
+            <p>This configuration provides optimal cost efficiency for your portfolio size.</p>
+        </div>
+        """)
+
+BREAKDOWN = HtmlTemplate("""
+        <div class="simple-breakdown">
+            <h4 style="margin-bottom: 1rem; color: #2c3e50;">Pricing Components</h4>
+{items}
+            <div class="simple-final">
+                <span>Total Investment</span>
+                <strong>{total}</strong>
+            </div>
+        </div>
+        """)
+BREAKDOWN_ITEM = HtmlTemplate("""            <div class="simple-item">
+                <span>{label}</span>
+                <strong>{value}</strong>
+            </div>""")
+
+@dataclass(frozen=True)
+class QuoteCards:
+    """HTML of the price-dependent cards for one selection."""
+    highlight: str
+    stats: str
+    recommendation: str
+    breakdown: str
+
+def _rows(template: HtmlTemplate, rows: Iterable[Tuple[str, str]]) -> Html:
+    return Html("\n".join(template.render(label=label, value=value) for label, value in rows))
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_quote_cards(num_apps: int, risk_quantification: bool, price_book: PriceBook) -> QuoteCards:
+    """Render the cards from the precomputed quote row; shared by every session."""
+    quote = lookup_quote(num_apps, risk_quantification, price_book)
+    tier, price = quote.tier, quote.price
+    total = price_book.format_price(price['total_price'])
+    
+    if risk_quantification:
+        stats = [
+            ("Total Cost per AI System", price_book.format_price(price['total_price'] / num_apps, '.0f')),
+            ("Base Cost per AI System", price_book.format_price(price['subtotal'] / num_apps, '.0f')),
+            ("Risk Premium Total", price_book.format_price(price['risk_premium'])),
+        ]
+    else:
+        stats = [("Cost per AI System", price_book.format_price(price['total_price'] / num_apps, '.0f'))]
+    stats.append(("Tier Range", tier.range_label))
+    
+    recommendation = quote.recommendation
+    if recommendation:
+        recommendation_html = OPTIMIZATION_ALERT.render(
+            reason=recommendation['reason'],
+            current_price=price_book.format_price(recommendation['current_price']),
+            recommended_tier=recommendation['recommended_tier'].name,
+            recommended_price=price_book.format_price(recommendation['recommended_price']),
+            savings=price_book.format_price(recommendation['savings'])
+        )
+    else:
+        recommendation_html = OPTIMAL_BADGE.render(tier=tier.name, num_apps=num_apps)
+    
+    additional_apps = max(0, num_apps - tier.min_apps)
+    items = [
+        (f"Base Tier Price ({tier.name})", tier.base_price_label),
+        (f"Additional AI Systems ({additional_apps} × {tier.price_per_app_label})",
+         price_book.format_price(price['additional_cost'])),
+    ]
+    if risk_quantification:
+        items += [
+            ("Subtotal (Base + Additional)", price_book.format_price(price['subtotal'])),
+            ("Risk Quantification Premium (+30%)", price_book.format_price(price['risk_premium'])),
+        ]
+    
+    return QuoteCards(
+        highlight=HIGHLIGHT.render(num_apps=num_apps, total=total, tier=tier.name,
+                                   risk_line=RISK_LINE if risk_quantification else Html('')),
+        stats=STATS.render(boxes=_rows(STAT_BOX, stats)),
+        recommendation=recommendation_html,
+        breakdown=BREAKDOWN.render(items=_rows(BREAKDOWN_ITEM, items), total=total)
+    )